@@ -0,0 +1,92 @@
+"""
+Import-time budget for the nuclab modules.
+
+Each module is imported in a fresh interpreter, which reports how long the import
+took and which heavy dependencies it pulled in. A module fails the check if it
+loads a forbidden dependency (e.g., ``import nuclab.production`` must never load
+Matplotlib, CURIE or SciPy) or exceeds its time budget.
+
+    python benchmarks/import_budget.py              # exit status 1 on any violation
+    python benchmarks/import_budget.py --scale 2    # relax the time budgets on slow machines
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+HEAVY = ("matplotlib", "curie", "scipy")
+
+# module -> (time budget in s, dependencies it must not load at import)
+BUDGETS = {
+    "nuclab.decay": (0.5, HEAVY),
+    "nuclab.spectra": (0.5, HEAVY),
+    "nuclab.utils": (1.0, HEAVY),
+    "nuclab.production": (1.0, HEAVY),
+    "nuclab.calibration": (1.0, HEAVY),
+    "nuclab.serial": (1.0, HEAVY),
+    "nuclab.cache": (1.0, HEAVY),
+    "nuclab.plotting": (0.5, HEAVY),
+    "nuclab.roi": (1.0, HEAVY),
+    "nuclab.summing": (0.5, HEAVY),
+    "nuclab.efficiency": (0.5, HEAVY),
+    "nuclab.prefetch": (0.5, HEAVY),
+    "nuclab.sinks": (1.0, HEAVY),
+    "nuclab.columnar": (1.0, HEAVY),
+    "nuclab.instrumentation": (1.0, HEAVY),
+}
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "loaded": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns
+    -------
+    dict
+        ``seconds`` taken by the import and the top-level packages ``loaded``.
+    """
+    result = subprocess.run([sys.executable, "-c", _PROBE.format(module=module)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check(budgets: dict = BUDGETS, scale: float = 1.0) -> list[str]:
+    """
+    Measure every module in ``budgets`` and return the violations found.
+    """
+    violations = []
+    for module, (budget, forbidden) in budgets.items():
+        info = measure(module)
+        heavy = sorted(set(forbidden) & set(info["loaded"]))
+        status = "ok"
+        if heavy:
+            violations.append(f"{module} loads {', '.join(heavy)}")
+            status = "FAIL"
+        if info["seconds"] > budget * scale:
+            violations.append(f"{module} took {info['seconds']:.3f} s (budget {budget * scale:.3f} s)")
+            status = "FAIL"
+        print(f"{module:<22} {info['seconds']:7.3f} s  {status}")
+    return violations
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time and dependencies of nuclab modules.")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every time budget by this factor")
+    args = parser.parse_args(argv)
+
+    violations = check(scale=args.scale)
+    for violation in violations:
+        print(f"  - {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Throughput benchmarks for ``Serial`` and ``Yield`` on synthetic inputs.
+
+Run from the repository root (with ``nuclab`` importable)::
+
+    python benchmarks/run_benchmarks.py                       # 10, 100, 1000 spectra + Yield
+    python benchmarks/run_benchmarks.py --sizes 10 100 --workers 8
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+
+Every scenario records wall-clock and CPU time (best and median of ``--repeat``
+runs). Results are written as JSON together with the commit, package versions
+and machine, so runs can be compared across commits with ``--compare``.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+import import_budget
+import synthetic
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def timed(func, repeat: int = 1) -> dict:
+    """Run ``func`` ``repeat`` times and summarise wall-clock and CPU time (s)."""
+    wall, cpu = [], []
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        func()
+        wall.append(time.perf_counter() - w0)
+        cpu.append(time.process_time() - c0)
+    return {"wall_s": min(wall), "wall_median_s": statistics.median(wall), "cpu_s": min(cpu),
+            "repeat": repeat, "status": "ok"}
+
+
+def run_scenario(results: list, name: str, params: dict, func, repeat: int = 1) -> None:
+    """Time one scenario and append its record; failures are recorded, not raised."""
+    try:
+        record = timed(func, repeat)
+    except ImportError as e:
+        record = {"status": f"skipped: {e}"}
+    except Exception as e:
+        record = {"status": f"error: {type(e).__name__}: {e}"}
+    add_record(results, name, params, record)
+
+
+def add_record(results: list, name: str, params: dict, record: dict) -> None:
+    results.append({"scenario": name, "params": params, **record})
+    wall = f"{record['wall_s']:.4f} s" if "wall_s" in record else record["status"]
+    print(f"{name:<40} {json.dumps(params):<40} {wall}", flush=True)
+
+
+def import_scenarios(results: list) -> None:
+    for module in import_budget.BUDGETS:
+        try:
+            # Time of the import itself, in a fresh interpreter, without its start-up
+            info = import_budget.measure(module)
+            record = {"wall_s": info["seconds"], "status": "ok",
+                      "heavy_loaded": sorted(set(import_budget.HEAVY) & set(info["loaded"]))}
+        except Exception as e:
+            record = {"status": f"error: {type(e).__name__}: {e}"}
+        add_record(results, f"import {module}", {}, record)
+
+
+def serial_scenarios(results: list, sizes, workdir: Path, workers: int | None, repeat: int, chn: bool) -> None:
+    from nuclab.serial import Serial
+
+    for n in sizes:
+        directory = workdir / f"spectra-{n}"
+        params = {"n_spectra": n, "workers": workers, "chn": chn}
+        # Peak fitting is too slow to repeat at campaign scale; the later stages are repeated
+        run_scenario(results, "synthetic.make_campaign", params,
+                     lambda: synthetic.make_campaign(directory, n, chn=chn))
+
+        se = Serial(data_directory=str(directory), efficiency_fit_params=synthetic.EFFICIENCY_PARAMS,
+                    detector_eff_uncertianty=0.05, eob_time=synthetic.EOB, gammas=synthetic.GAMMAS,
+                    half_lives=synthetic.line_half_lives(), prefer_chn=chn)
+        run_scenario(results, "Serial.process_spectrum_files", params,
+                     lambda: se.process_spectrum_files(efficiency_func=synthetic.efficiency, calibration_slot=200,
+                                                       workers=workers))
+        if se.peak_data.empty:
+            continue
+        run_scenario(results, "Serial.process_decay_data", params, se.process_decay_data, repeat)
+        run_scenario(results, "Serial.save_peak_data", params,
+                     lambda: se.save_peak_data(str(workdir / f"peak-data-{n}.xlsx")), repeat)
+
+
+def yield_scenarios(results: list, dEs, workdir: Path, repeat: int, n_sweep: int) -> None:
+    from nuclab.production import Yield
+
+    srim_energies, srim_ranges = synthetic.srim_table()
+    xs_dir = workdir / "cross-sections"
+    synthetic.write_cross_sections(xs_dir)
+    half_lives = dict(synthetic.HALF_LIVES)
+
+    def make(dE):
+        return Yield(E0=12.6, srim_energies=srim_energies, srim_ranges=srim_ranges, target_thickness=0.037,
+                     dE=dE, density=3.385, molecular_weight=362.5, projectile_intensity=2.37e13, t_irrad=1800)
+
+    y = make(0.01)
+    run_scenario(results, "Yield.load_reactions_from_csvs", {"library": False},
+                 lambda: y.load_reactions_from_csvs(xs_dir, half_lives, library=False), repeat)
+    y.load_reactions_from_csvs(xs_dir, half_lives)
+    run_scenario(results, "Yield.load_reactions_from_csvs", {"library": True},
+                 lambda: y.load_reactions_from_csvs(xs_dir, half_lives), repeat)
+
+    E0_grid = np.linspace(8.0, 30.0, n_sweep)
+    for dE in dEs:
+        y = make(dE)
+        y.load_reactions_from_csvs(xs_dir, half_lives)
+        run_scenario(results, "Yield.compute_activities_for_multiple_isotopes", {"dE": dE},
+                     y.compute_activities_for_multiple_isotopes, repeat)
+        run_scenario(results, "Yield.sweep_activities", {"dE": dE, "n_E0": n_sweep},
+                     lambda: y.sweep_activities(E0=E0_grid), repeat)
+
+
+def environment() -> dict:
+    """Commit, package versions and machine of this run."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+
+    versions = {}
+    for package in ("numpy", "pandas", "scipy", "curie", "matplotlib"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+
+    return {"commit": commit, "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "packages": versions}
+
+
+def compare(baseline_path: str | Path, report: dict, threshold: float = 1.2) -> int:
+    """
+    Print the wall-time ratio (new / baseline) of every scenario present in both runs.
+
+    Returns
+    -------
+    int
+        Number of scenarios slower than ``threshold`` times the baseline.
+    """
+    baseline = json.loads(Path(baseline_path).read_text())
+    key = lambda r: (r["scenario"], json.dumps(r["params"], sort_keys=True))
+    old = {key(r): r for r in baseline["results"] if r.get("status") == "ok"}
+
+    print(f"\nCompared with {baseline['environment']['commit']} ({baseline_path}):")
+    regressions = 0
+    for r in report["results"]:
+        if r.get("status") != "ok" or key(r) not in old:
+            continue
+        ratio = r["wall_s"] / old[key(r)]["wall_s"]
+        flag = "  <-- slower" if ratio > threshold else ""
+        regressions += ratio > threshold
+        print(f"{r['scenario']:<40} {json.dumps(r['params']):<40} x{ratio:6.2f}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10, 100, 1000],
+                        help="numbers of spectra per Serial campaign (default: 10 100 1000)")
+    parser.add_argument("--dE", type=float, nargs="*", default=[0.1, 0.01, 0.001, 0.0001],
+                        help="Yield slice energy steps in MeV (default: 0.1 0.01 0.001 0.0001)")
+    parser.add_argument("--n-sweep", type=int, default=50, help="beam energies in each Yield sweep (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions of each timed scenario (default: 3)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for peak fitting")
+    parser.add_argument("--chn", action="store_true", help="also write .Chn files and read those instead")
+    parser.add_argument("--workdir", default=None, help="where to write synthetic data (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="JSON results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = {"environment": environment(), "results": []}
+    with tempfile.TemporaryDirectory(prefix="nuclab-bench-") as tmp:
+        workdir = Path(args.workdir or tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        import_scenarios(report["results"])
+        serial_scenarios(report["results"], args.sizes, workdir, args.workers, args.repeat, args.chn)
+        yield_scenarios(report["results"], args.dE, workdir, args.repeat, args.n_sweep)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{report['environment']['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        return 1 if compare(args.compare, report, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
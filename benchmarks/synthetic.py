@@ -0,0 +1,221 @@
+"""
+Deterministic generators of synthetic inputs for the nuclab benchmarks.
+
+Spectra are written in MAESTRO ``.Spe`` (and optionally binary ``.Chn``) format with
+``d1sXXX`` slot names, so they go through exactly the same code paths as real
+serial measurements. Yield inputs (SRIM range table and cross-section CSVs) are
+smooth analytic stand-ins with realistic shapes.
+"""
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Log-polynomial efficiency, same form as the example HPGe calibration
+EFFICIENCY_PARAMS = [-0.306655, -7.80031, 0.739484, -0.0959825, 0.00513815, -0.00121]
+
+GAMMAS = pd.DataFrame({
+    "energy": [344.2785, 586.27, 778.9045, 212.00, 123.07, 1274.436, 540.18, 426.78,
+               105.318, 148.64, 180.08, 262.27, 534.29, 199.19, 1222.44],
+    "intensity": [63.5, 9.21, 5.54, 28.5, 26.0, 10.5, 20.0, 17.3, 25.1, 2.65, 7.5, 5.3, 67.0, 41.0, 31.0],
+    "unc_intensity": [1.7, 0.21, 0.13, 1.9, 4.0, 0.8, 3.0, 1.2, 1.3, 0.14, 0.4, 0.3, 6.0, 5.0, 3.0],
+    "isotope": ["152TB"] * 3 + ["153TB"] + ["154TB"] * 4 + ["155TB"] * 4 + ["156TB"] * 3,
+})
+
+HALF_LIVES = {"152TB": 17.5 * 3600, "153TB": 2.34 * 86400, "154TB": 21.5 * 3600,
+              "155TB": 5.32 * 86400, "156TB": 5.35 * 86400}
+
+EOB = datetime(2025, 2, 21, 8, 0)
+
+
+def efficiency(energy, b1, b2, b3, b4, b5, b6):
+    """Absolute detector efficiency, ``exp(sum b_k x^(2-k))`` with ``x = E / 1000``."""
+    x = np.asarray(energy, dtype=float) / 1000
+    return np.exp(b1 * x + b2 + b3 / x + b4 / x ** 2 + b5 / x ** 3 + b6 / x ** 4)
+
+
+def line_half_lives(gammas: pd.DataFrame = GAMMAS, half_lives: dict[str, float] = HALF_LIVES) -> dict[float, float]:
+    """Map each gamma energy to the half-life of its isotope (the ``Serial`` convention)."""
+    return {float(e): half_lives[i] for e, i in zip(gammas["energy"], gammas["isotope"])}
+
+
+def synthetic_counts(gammas: pd.DataFrame, activities: dict[str, float], live_time: float,
+                     n_channels: int = 16384, engcal=(-0.429139, 0.411474), rng=None) -> np.ndarray:
+    """
+    Draw one HPGe spectrum with Poisson statistics.
+
+    Parameters
+    ----------
+    gammas : pandas.DataFrame
+        Lines to place, with ``energy`` (keV), ``intensity`` (%) and ``isotope``.
+    activities : dict[str, float]
+        Mean activity (Bq) of each isotope during the measurement.
+    live_time : float
+        Live time (s).
+    n_channels : int, optional
+        Number of channels. Default is 16384.
+    engcal : tuple[float, float], optional
+        Linear energy calibration ``E = c0 + c1*ch`` (keV).
+    rng : numpy.random.Generator, optional
+        Random generator; a fixed seed makes spectra reproducible.
+
+    Returns
+    -------
+    numpy.ndarray
+        Counts per channel (int64).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    channels = np.arange(n_channels)
+    energies = engcal[0] + engcal[1] * channels
+
+    # Falling continuum plus Gaussian photopeaks (FWHM grows with sqrt(E))
+    expected = 40.0 * np.exp(-energies / 300.0) * live_time / 3600 + 0.5
+    E_lines = gammas["energy"].to_numpy(float)
+    areas = (gammas["isotope"].map(activities).fillna(0.0).to_numpy(float) * gammas["intensity"].to_numpy(float) / 100
+             * efficiency(E_lines, *EFFICIENCY_PARAMS) * live_time)
+    sigmas = (0.8 + 0.03 * np.sqrt(E_lines)) / 2.3548 / engcal[1]
+    centers = (E_lines - engcal[0]) / engcal[1]
+    for area, mu, sigma in zip(areas, centers, sigmas):
+        lo, hi = int(max(mu - 8 * sigma, 0)), int(min(mu + 8 * sigma + 1, n_channels))
+        expected[lo:hi] += area * np.exp(-0.5 * ((channels[lo:hi] - mu) / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+    return rng.poisson(expected).astype(np.int64)
+
+
+def write_spe(path: str | Path, counts, start_time: datetime, live_time: float, real_time: float,
+              engcal=(-0.429139, 0.411474), spec_id: str = "") -> Path:
+    """Write ``counts`` as a MAESTRO ``.Spe`` text spectrum."""
+    path = Path(path)
+    counts = np.asarray(counts)
+    lines = [
+        "$SPEC_ID:", spec_id or path.stem,
+        "$SPEC_REM:", "DET# 1", "DETDESC# DET 1", "AP# Maestro Version 7.01",
+        "$DATE_MEA:", start_time.strftime("%m/%d/%Y %H:%M:%S"),
+        "$MEAS_TIM:", f"{live_time:.0f} {real_time:.0f}",
+        "$DATA:", f"0 {len(counts) - 1}",
+        *(f"{c:8d}" for c in counts),
+        "$ROI:", "0",
+        "$PRESETS:", "Live Time", f"{live_time:.0f}", "0",
+        "$ENER_FIT:", f"{engcal[0]:f} {engcal[1]:f}",
+        "$MCA_CAL:", "3", f"{engcal[0]:E} {engcal[1]:E} {0:E} keV",
+        "$SHAPE_CAL:", "3", f"{3.416852:E} {5.335161e-4:E} {0:E}",
+    ]
+    path.write_text("\n".join(lines) + "\n", newline="\r\n")
+    return path
+
+
+def write_chn(path: str | Path, counts, start_time: datetime, live_time: float, real_time: float,
+              engcal=(-0.429139, 0.411474)) -> Path:
+    """Write ``counts`` as a MAESTRO binary ``.Chn`` spectrum (see :func:`nuclab.spectra.read_chn`)."""
+    path = Path(path)
+    counts = np.asarray(counts, dtype="<i4")
+    date = f"{start_time:%d}{start_time:%b}".upper() + f"{start_time:%y}" + ("1" if start_time.year >= 2000 else "0")
+    header = struct.pack("<hhh2sii8s4shh", -1, 1, 1, f"{start_time:%S}".encode(),
+                         round(real_time / 0.02), round(live_time / 0.02),
+                         date.encode(), f"{start_time:%H%M}".encode(), 0, len(counts))
+    trailer = bytearray(256 + 2 * 64)
+    struct.pack_into("<h", trailer, 0, -101)
+    struct.pack_into("<3f", trailer, 4, engcal[0], engcal[1], 0.0)
+    struct.pack_into("<3f", trailer, 16, 3.416852, 5.335161e-4, 0.0)
+    path.write_bytes(header + counts.tobytes() + bytes(trailer))
+    return path
+
+
+def make_campaign(directory: str | Path, n_spectra: int, gammas: pd.DataFrame = GAMMAS,
+                  half_lives: dict[str, float] = HALF_LIVES, eob_time: datetime = EOB,
+                  activities: dict[str, float] | None = None, live_time: float = 1800.0,
+                  first_delay: float = 3600.0, slots=(200,), n_channels: int = 16384,
+                  chn: bool = False, seed: int = 0) -> list[Path]:
+    """
+    Write a serial campaign of ``n_spectra`` consecutive measurements.
+
+    Files are named ``bench-d1s<slot>-<NNN>.Spe``; measurements start ``first_delay``
+    seconds after ``eob_time`` and follow each other back to back, cycling over the
+    detector ``slots``. The same ``seed`` always produces byte-identical files.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Output directory (created if needed).
+    n_spectra : int
+        Number of spectra.
+    gammas, half_lives : optional
+        Lines to place and isotope half-lives (s).
+    eob_time : datetime.datetime, optional
+        End of bombardment.
+    activities : dict[str, float], optional
+        EoB activities (Bq) per isotope. Default is 20 kBq each.
+    live_time : float, optional
+        Live time of each spectrum (s).
+    first_delay : float, optional
+        Time from EoB to the first measurement (s).
+    slots : sequence of int, optional
+        Detector slots (distances) to cycle through.
+    n_channels : int, optional
+        Channels per spectrum.
+    chn : bool, optional
+        Also write a ``.Chn`` next to every ``.Spe``.
+    seed : int, optional
+        Seed of the random generator.
+
+    Returns
+    -------
+    list[pathlib.Path]
+        The ``.Spe`` files written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    activities = activities or {isotope: 2e4 for isotope in half_lives}
+    real_time = live_time * 1.02
+
+    files = []
+    for i in range(n_spectra):
+        start = first_delay + i * real_time
+        slot = slots[i % len(slots)]
+        # Mean activity over the measurement, scaled by the inverse-square distance to slot 200
+        mean = {iso: A0 * np.exp(-np.log(2) / half_lives[iso] * start)
+                * -np.expm1(-np.log(2) / half_lives[iso] * live_time) / (np.log(2) / half_lives[iso] * live_time)
+                * (200 / slot) ** 2
+                for iso, A0 in activities.items()}
+        counts = synthetic_counts(gammas, mean, live_time, n_channels=n_channels, rng=rng)
+        start_time = (eob_time + timedelta(seconds=start)).replace(microsecond=0)
+        path = directory / f"bench-d1s{slot}-{i:03d}.Spe"
+        files.append(write_spe(path, counts, start_time, live_time, real_time))
+        if chn:
+            write_chn(path.with_suffix(".Chn"), counts, start_time, live_time, real_time)
+    return files
+
+
+def srim_table(E_max: float = 40.0, n: int = 200) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Synthetic SRIM energy-range table (MeV, cm) for protons in Gd2O3.
+
+    A Bragg-Kleeman power law ``R = a E^1.75``, matched to ~0.037 cm at 12.6 MeV.
+    """
+    energies = np.geomspace(0.01, E_max, n)
+    return energies, 4.3e-4 * energies ** 1.75
+
+
+def write_cross_sections(directory: str | Path, half_lives: dict[str, float] = HALF_LIVES,
+                         n_points: int = 120, seed: int = 0) -> list[Path]:
+    """
+    Write one ``NatGd_P_X_<isotope>.csv`` excitation function per isotope (MeV, mb).
+
+    Each is a smooth threshold-and-peak curve with a random threshold and height.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    energies = np.linspace(2.0, 40.0, n_points)
+    files = []
+    for isotope in half_lives:
+        threshold, peak, height = rng.uniform(3, 9), rng.uniform(10, 25), rng.uniform(20, 600)
+        xs = height * np.clip((energies - threshold) / (peak - threshold), 0, None) ** 2 \
+             * np.exp(-np.clip(energies - peak, 0, None) / 8.0) / (1 + ((energies - peak) / 6.0) ** 2)
+        path = directory / f"NatGd_P_X_{isotope}.csv"
+        pd.DataFrame({"E (Mev)": energies, f"natGd(p,x){isotope} (mbarn)": xs}).to_csv(path, index=False)
+        files.append(path)
+    return files
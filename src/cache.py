@@ -0,0 +1,308 @@
+import hashlib
+import os
+import pickle
+from importlib import metadata
+from pathlib import Path
+
+import pandas as pd
+
+from nuclab.instrumentation import stage
+from nuclab.plotting import spectrum_plot_job
+from nuclab.spectra import load_spectrum
+
+# Bump when the layout of cached entries changes
+CACHE_VERSION = 1
+
+
+class PeakCache:
+    """
+    Content-addressed on-disk cache of raw CURIE peak fits.
+
+    Peak fitting (``ci.Spectrum.fit_peaks``) is the dominant cost of ``Serial`` and
+    ``Calibration``, but it depends only on the spectrum file, the ``gammas`` table
+    and the CURIE fit options. Entries are keyed by a SHA-256 hash of exactly those
+    inputs, so changing efficiency parameters or ``detector_eff_uncertainty`` reuses
+    the cached fits and only the cheap efficiency/activity/EoB columns are recomputed.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Directory holding the cache entries. Created if it does not exist.
+    max_bytes : int, optional
+        Upper bound on the total size of the cache. When exceeded, least recently
+        used entries are evicted. Default is 512 MiB.
+
+    Examples
+    --------
+    >>> cache = PeakCache("outputs/peak-cache")
+    >>> se = Serial(..., peak_cache=cache)
+    >>> se.process_spectrum_files(...)   # fits and stores
+    >>> se.efficiency_fit_params = new_params
+    >>> se.process_spectrum_files(...)   # reuses the stored fits
+    >>> cache.invalidate()               # drop everything
+    """
+
+    suffix = ".peaks.pkl"
+
+    def __init__(self, directory: str | Path, max_bytes: int = 512 * 1024 ** 2):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+
+    def key(self, file_path: str | Path, gammas: pd.DataFrame | None = None, fit_config: dict | None = None) -> str:
+        """
+        Compute the cache key of a spectrum fit.
+
+        Parameters
+        ----------
+        file_path : str or pathlib.Path
+            Spectrum file; its contents (not its name) are hashed.
+        gammas : pandas.DataFrame, optional
+            Gamma lines passed to ``fit_peaks``.
+        fit_config : dict, optional
+            Keyword options passed to ``fit_peaks``.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the fit.
+        """
+        h = hashlib.sha256()
+        try:
+            curie_version = metadata.version("curie")
+        except metadata.PackageNotFoundError:
+            curie_version = "unknown"
+        h.update(f"v{CACHE_VERSION}|curie {curie_version}|".encode())
+
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+        if gammas is not None:
+            g = pd.DataFrame(gammas)
+            h.update(repr(list(g.columns)).encode())
+            h.update(pd.util.hash_pandas_object(g, index=False).to_numpy().tobytes())
+
+        h.update(repr(sorted((fit_config or {}).items())).encode())
+        return h.hexdigest()
+
+
+    def get(self, key: str):
+        """
+        Return the cached entry for ``key``, or None on a miss.
+
+        Unreadable entries are removed and reported as a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[PeakCache] Discarding unreadable entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch the entry so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+
+    def put(self, key: str, entry) -> None:
+        """
+        Store ``entry`` under ``key`` and evict old entries if over ``max_bytes``.
+
+        The write is atomic, so concurrent workers never observe partial entries.
+        """
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._evict()
+
+
+    def invalidate(self, key: str | None = None) -> int:
+        """
+        Remove one entry, or every entry if ``key`` is None.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        paths = [self._path(key)] if key is not None else list(self.directory.glob(f"*{self.suffix}"))
+        removed = 0
+        for path in paths:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all cache entries (bytes)."""
+        return sum(size for _, size, _ in self._entries())
+
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Evicted by another worker in the meantime
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def fit_spectrum_peaks(file_path: str | Path, gammas: pd.DataFrame | None = None, fit_config: dict | None = None,
+                       cache: PeakCache | None = None, plot_path: str | None = None,
+                       plot_jobs: list | None = None, instrument=None, roi=None,
+                       preloaded: dict | None = None):
+    """
+    Fit the peaks of one spectrum, going through ``cache`` when one is given.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Spectrum file readable by :func:`nuclab.spectra.load_spectrum`.
+    gammas : pandas.DataFrame, optional
+        Gamma lines passed to ``fit_peaks``.
+    fit_config : dict, optional
+        Keyword options passed to ``fit_peaks``.
+    cache : PeakCache, optional
+        Cache of previous fits. If None, the spectrum is always fitted.
+    plot_path : str, optional
+        Where to save the CURIE peak-fit plot. Plots are only produced when the
+        spectrum is actually fitted (i.e. on a cache miss).
+    plot_jobs : list, optional
+        If given, the plot is not rendered here; a job from
+        :func:`nuclab.plotting.spectrum_plot_job` is appended instead, to be rendered
+        later with :func:`nuclab.plotting.render_plots`.
+    instrument : nuclab.instrumentation.Instrumentation, optional
+        Records the ``cache_lookup``, ``read_spectrum``, ``fit_peaks``, ``plot`` and
+        ``cache_store`` stages of this file.
+    roi : nuclab.roi.ROIFitter, optional
+        Fit only windows around the lines in ``gammas`` (see :class:`nuclab.roi.ROIFitter`)
+        instead of ``fit_peaks``.
+    preloaded : dict, optional
+        The file already read by :func:`preload_spectrum` (e.g., in a read-ahead
+        thread); its cache key and spectrum are used instead of reading the file again.
+
+    Returns
+    -------
+    peaks : pandas.DataFrame or None
+        Raw CURIE peak table (a copy), or None if no peaks were fitted.
+    start_time : datetime.datetime
+        Start of the measurement.
+    """
+    fit_config = fit_config or {}
+    file = os.path.basename(str(file_path))
+    preloaded = preloaded or {}
+    key = preloaded.get("key")
+    if cache is not None:
+        with stage(instrument, "cache_lookup", file=file):
+            if key is None:
+                key = cache.key(file_path, gammas, _cache_config(fit_config, roi))
+            entry = cache.get(key)
+        if entry is not None:
+            peaks = entry["peaks"]
+            return (peaks.copy() if peaks is not None else None), entry["start_time"]
+
+    sp = preloaded.get("spectrum")
+    if sp is None:
+        with stage(instrument, "read_spectrum", file=file):
+            sp = load_spectrum(file_path)
+    peaks = fit_spectrum(sp, file_path, gammas=gammas, fit_config=fit_config, plot_path=plot_path,
+                         plot_jobs=plot_jobs, instrument=instrument, roi=roi)
+
+    if key is not None:
+        with stage(instrument, "cache_store", file=file):
+            cache.put(key, {"peaks": peaks, "start_time": sp.start_time})
+
+    return (peaks.copy() if peaks is not None else None), sp.start_time
+
+
+def preload_spectrum(file_path: str | Path, gammas: pd.DataFrame | None = None, fit_config: dict | None = None,
+                     cache: PeakCache | None = None, roi=None) -> dict:
+    """
+    Do the file reads of :func:`fit_spectrum_peaks` ahead of time.
+
+    Hashes the file for its cache key (with a ``cache``) and parses the spectrum,
+    unless the cache already holds its fit. Safe to call from a reader thread.
+
+    Returns
+    -------
+    dict
+        ``key`` (None without a cache) and ``spectrum`` (None on a cache hit), to pass
+        to ``fit_spectrum_peaks(preloaded=...)``.
+    """
+    key = cache.key(file_path, gammas, _cache_config(fit_config or {}, roi)) if cache is not None else None
+    cached = key is not None and cache._path(key).exists()
+    return {"key": key, "spectrum": None if cached else load_spectrum(file_path)}
+
+
+def _cache_config(fit_config: dict, roi=None) -> dict:
+    # ROI fits differ from full fits with the same options, so the ROI settings are part of the key
+    return {**fit_config, **roi.config} if roi is not None else fit_config
+
+
+def fit_spectrum(sp, spectrum_path, gammas: pd.DataFrame | None = None, fit_config: dict | None = None,
+                 plot_path: str | None = None, plot_jobs: list | None = None, instrument=None,
+                 roi=None):
+    """
+    Fit the peaks of an already loaded spectrum (no caching).
+
+    Parameters are as in :func:`fit_spectrum_peaks`; ``spectrum_path`` is the file
+    (or list of files, for a summed spectrum) ``sp`` was read from, used to redraw
+    deferred plots.
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        CURIE's peak table (not a copy), or None if no peaks were fitted.
+    """
+    fit_config = fit_config or {}
+    file = os.path.basename(str(spectrum_path[0] if isinstance(spectrum_path, list) else spectrum_path))
+    with stage(instrument, "fit_peaks", file=file):
+        if roi is not None:
+            roi.fit_peaks(sp, gammas=gammas, **fit_config)
+        else:
+            sp.fit_peaks(gammas=gammas, **fit_config)
+    if plot_path is not None:
+        if plot_jobs is not None:
+            plot_jobs.append(spectrum_plot_job(sp, spectrum_path, plot_path))
+        else:
+            with stage(instrument, "plot", file=file):
+                sp.saveas(plot_path)
+
+    peaks = sp._peaks
+    if peaks is not None and len(peaks) == 0:
+        peaks = None
+    return peaks
@@ -1,7 +1,15 @@
 from datetime import datetime
 import os
-from nuclab.utils import *
-import curie as ci
+import copy
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from nuclab.utils import calculate_activity, fit_decay
+from nuclab.cache import PeakCache, fit_spectrum_peaks
+from nuclab.instrumentation import Instrumentation, instrumented, stage
+from nuclab.spectra import detector_slot, list_spectrum_files, resolve_spectrum_path
+from nuclab.roi import ROIFitter
+from nuclab.efficiency import EfficiencyTable
 from pathlib import Path
 
 class Calibration:
@@ -19,7 +27,8 @@ class Calibration:
     Parameters
     ----------
     data_path : str or pathlib.Path
-        Path to a single calibration spectrum file (``.Spe``) to process.
+        Path to a single calibration spectrum file (``.Spe`` or ``.Chn``) to process,
+        or to a directory of them for :meth:`process_spectrum_files`.
     eob_time : datetime.datetime, optional
         End-of-bombardment timestamp for calibration sources.
     gammas : pandas.DataFrame
@@ -32,6 +41,20 @@ class Calibration:
     eff_func : callable, optional
         Parametric detector efficiency function used for fitting and evaluation:
         ``eff_func(energy_keV, *params) -> efficiency``.
+    fit_config : dict, optional
+        Keyword options forwarded to CURIE's ``Spectrum.fit_peaks`` (e.g., ``SNR_min``, ``bg``).
+    peak_cache : PeakCache or str, optional
+        On-disk cache of raw peak fits (or a directory for one). Default is None (no caching).
+    prefer_chn : bool, optional
+        If True (default), read the binary ``.Chn`` saved alongside a ``.Spe`` file when it exists.
+    instrument : Instrumentation or bool, optional
+        Records wall time and CPU time of every stage, and peak memory with
+        ``Instrumentation(memory=True)``. True creates a new ``Instrumentation``
+        (timings only). Default is None (disabled).
+    roi : ROIFitter or bool, optional
+        Fit only windows around the lines in ``gammas``, each with a local linear
+        background, instead of the whole spectrum. True creates a new ``ROIFitter``.
+        Default is False.
 
     Attributes
     ----------
@@ -41,6 +64,19 @@ class Calibration:
         specified in the ``gammas`` DataFrame.
     unc_eff_fit_params : list[float] or None
         1σ standar error (standard deviation uncertainties) in the fitted parameters,`eff_fit_params`.
+    slot_eff_fit_params : dict[int, tuple[list[float], list[float]]]
+        Per-slot efficiency parameters and their 1σ errors, from
+        ``process_calibration_data(per_slot=True)``.
+    eff_fit_covariance : numpy.ndarray or None
+        Full covariance matrix of ``eff_fit_params`` (used by :meth:`efficiency_table`).
+    slot_eff_fit_covariance : dict[int, numpy.ndarray]
+        Covariance matrices of the per-slot fits.
+    reference_slot : int or None
+        Slot to which the combined multi-slot fit refers (pass it to ``Serial`` as
+        ``calibration_slot``).
+    failed_files : dict[str, str]
+        Calibration spectra that could not be processed by
+        :meth:`process_spectrum_files`, with their error messages.
     fractional_unc_eff : float or None
         The average plus one standard deviation of the experimentally measured
         efficiency relative residual absolute values.
@@ -50,7 +86,9 @@ class Calibration:
 
     def __init__(self, data_path: str = None, eob_time: datetime = None, gammas: pd.DataFrame = None,
                  half_lives: dict[float, float] = None, calibration_eob_activities: dict[float, float] = None,
-                 eff_func: callable = None):
+                 eff_func: callable = None, fit_config: dict | None = None,
+                 peak_cache: PeakCache | str | None = None, prefer_chn: bool = True,
+                 instrument: Instrumentation | bool | None = None, roi: ROIFitter | bool = False):
 
         self.data_path = data_path
         self.eob_time = eob_time
@@ -58,19 +96,30 @@ class Calibration:
         self.half_lives = half_lives
         self.calibration_eob_activities = calibration_eob_activities
         self.eff_func = eff_func
+        self.fit_config = fit_config or {}
+        self.peak_cache = PeakCache(peak_cache) if isinstance(peak_cache, (str, Path)) else peak_cache
+        self.prefer_chn = prefer_chn
+        self.instrument = Instrumentation() if instrument is True else (instrument or None)
+        self.roi = ROIFitter() if roi is True else (roi or None)
 
         self.eff_fit_params: list[float] = []
         self.unc_eff_fit_params: list[float] =  []
 
         self.fractional_sigma_detector_eff = None
+        self.slot_eff_fit_params: dict[int, tuple[list[float], list[float]]] = {}
+        self.eff_fit_covariance: np.ndarray | None = None
+        self.slot_eff_fit_covariance: dict[int, np.ndarray] = {}
+        self.reference_slot: int | None = None
 
         self.peak_data = pd.DataFrame()     # accumulated enriched peaks
+        self.failed_files: dict[str, str] = {} # file -> error message
 
 
+    @instrumented("process_spectrum_file")
     def process_spectrum_file(self):
         """
 
-        Analyze a single calibration spectrum (``.Spe``) at the specified data_path and populate
+        Analyze a single calibration spectrum (``.Spe`` or ``.Chn``) at the specified data_path and populate
         per-line detector efficiencies.
 
         Parameters
@@ -85,34 +134,115 @@ class Calibration:
         pandas.DataFrame
             The populated ``peak_data`` DataFrame (also assigned to ``self.peak_data``).
         """
-        # List all .Spe files in the directory
-        file_path = str(self.data_path)
+        peaks, _ = self._process_file(str(self.data_path))
+        if peaks is not None:
+            self.peak_data = peaks
+            return self.peak_data
+        return None
+
+
+    @instrumented("process_spectrum_files")
+    def process_spectrum_files(self, paths=None, workers: int | None = None) -> pd.DataFrame:
+        """
+        Analyze several calibration spectra (sources and/or distances) in one call.
+
+        Each spectrum is processed as in :meth:`process_spectrum_file`, and the
+        per-line efficiencies are concatenated into ``peak_data`` together with the
+        file and its ``detector_slot`` (parsed from ``-d1s<slot>-`` in the name);
+        ``isotope`` names the calibration source of each line.
+
+        Parameters
+        ----------
+        paths : str, pathlib.Path or list, optional
+            A directory of spectra or a list of spectrum files. Defaults to
+            ``data_path`` (a directory or a single file).
+        workers : int, optional
+            Number of worker processes fitting the spectra. If None or 1 (default),
+            files are processed one at a time; with a pool, ``eff_func`` must be
+            picklable (a module- or notebook-level function).
+
+        Returns
+        -------
+        pandas.DataFrame
+            The combined ``peak_data`` (also assigned to ``self.peak_data``).
+
+        Notes
+        -----
+        - Files that raise are reported and skipped; their error messages are stored
+        in ``self.failed_files``.
+        - Rows are in the order of the files, for serial and parallel runs alike.
+        """
+        paths = self.data_path if paths is None else paths
+        if isinstance(paths, (str, Path)) and os.path.isdir(paths):
+            files = [os.path.join(paths, f) for f in list_spectrum_files(paths)]
+        elif isinstance(paths, (str, Path)):
+            files = [str(paths)]
+        else:
+            files = [str(f) for f in paths]
+
+        self.failed_files = {}
+        if workers is not None and workers > 1:
+            worker = copy.copy(self)
+            worker.peak_data = pd.DataFrame()
+            worker.instrument = self.instrument.fork() if self.instrument is not None else None
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(worker._process_file, f) for f in files]
+                outcomes = [(f, future.result) for f, future in zip(files, futures)]
+                frames = self._collect(outcomes, merge_records=True)
+        else:
+            frames = self._collect([(f, lambda f=f: self._process_file(f)) for f in files])
+
+        self.peak_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self.peak_data
+
+
+    def _collect(self, outcomes, merge_records: bool = False) -> list[pd.DataFrame]:
+        """Gather ``(file, get_result)`` outcomes, reporting (not raising) failures."""
+        frames = []
+        for file_path, get_result in outcomes:
+            file = os.path.basename(file_path)
+            try:
+                peaks, records = get_result()
+            except Exception as e:
+                print(f"Failed to process {file}: {e}")
+                self.failed_files[file] = str(e)
+                continue
+            if merge_records and self.instrument is not None:
+                self.instrument.extend(records)
+            if peaks is not None:
+                peaks["detector_slot"] = detector_slot(file)
+                frames.append(peaks)
+        return frames
+
+
+    def _process_file(self, file_path: str):
+        """
+        Fit one calibration spectrum and compute its per-line efficiencies.
+
+        Returns
+        -------
+        peaks : pandas.DataFrame or None
+            Per-line efficiencies, or None if no peaks were fitted.
+        records : list[dict]
+            Stage records measured for the file (empty without instrumentation).
+        """
+        n_records = len(self.instrument.records) if self.instrument is not None else 0
+        peaks = self._fit_efficiencies(file_path)
+        records = self.instrument.records[n_records:] if self.instrument is not None else []
+        return peaks, records
+
+
+    def _fit_efficiencies(self, file_path: str):
+        """Fit ``file_path`` and add its efficiency columns (see :meth:`_process_file`)."""
         file = os.path.basename(file_path)
-        base_filename = os.path.splitext(file)[0]
-            
-        # Extract slot number from filename
-        slot_number = "Unknown"
-        detector_slot = "Unknown"
-        parts = base_filename.split('-')
-        for part in parts:
-            if part.startswith('d1s'):
-                slot_number = part[3:]
-                if slot_number.isdigit():
-                    detector_slot = int(slot_number)
-                break
-            
-        # Load the Spectrum object
-        sp = ci.Spectrum(file_path)
-        #sp.saveas(f'Peak-Fit-Plots/{file}.svg')
+
+        # Fit the peaks (or reuse a cached fit)
+        peaks, start_time = fit_spectrum_peaks(resolve_spectrum_path(file_path, self.prefer_chn), gammas=self.gammas, fit_config=self.fit_config,
+                                               cache=self.peak_cache, instrument=self.instrument, roi=self.roi)
             
         # Compute decay time since end of bombardment
-        decay_time = (sp.start_time - self.eob_time).total_seconds()
-            
-        # Fit the peaks
-        sp.fit_peaks(gammas=self.gammas)
-        #sp.saveas(f'Peak-Fit-Plots/{file}-peak-fit.svg')
+        decay_time = (start_time - self.eob_time).total_seconds()
 
-        peaks = sp.peaks
         if peaks is None or len(peaks) == 0:
             print(f"No peaks found in {file}")
             return None
@@ -120,12 +250,12 @@ class Calibration:
 
             
         # If peaks were successfully fitted, process and save results
-        if peaks is not None:
+        with stage(self.instrument, "efficiency_columns", file=file):
             peaks['file'] = file  # Store filename in the dataset
             peaks['decay time (s)'] = decay_time # Store time since EOB in the datset
             peaks['half-life (s)'] = peaks['energy'].map(self.half_lives)
                 
-            peaks['activity'] = calculate_activity(peaks['energy'].map(self.calibration_eob_activities), sp.peaks['decay time (s)'], sp.peaks['half-life (s)']) * 37000
+            peaks['activity'] = calculate_activity(peaks['energy'].map(self.calibration_eob_activities), peaks['decay time (s)'], peaks['half-life (s)']) * 37000
                 
             # Compute decay constant
             decay_constant = np.log(2) / peaks['half-life (s)']
@@ -147,15 +277,15 @@ class Calibration:
                 # Remove unnecessary columns
             cols_to_remove = ['efficiency', 'unc_efficiency']
             peaks.drop(columns=cols_to_remove, inplace=True)
-            
-            self.peak_data = peaks
                 
                 
             print(f'Finished fitting peaks for {file}')
-            return self.peak_data
+            return peaks
 
 
-    def process_calibration_data(self, initial_guesses=None, plot_directory=None, plot_name="calibration-plot", xlim=None, ylim=None):
+    @instrumented("efficiency_fit")
+    def process_calibration_data(self, initial_guesses=None, plot_directory=None, plot_name="calibration-plot", xlim=None, ylim=None,
+                                 per_slot: bool = False, reference_slot: int | None = None):
         """
         Fit the detector efficiency calibration curve to per-line detector efficiencies
 
@@ -171,6 +301,14 @@ class Calibration:
             X-axis limits for the calibration plot (energy axis).
         ylim : tuple[float, float], optional
             Y-axis limits for the calibration plot (efficiency axis).
+        per_slot : bool, default=False
+            If True, fit the efficiency function separately for each ``detector_slot``
+            in ``peak_data`` (plots are named ``<plot_name>-d1s<slot>``).
+        reference_slot : int, optional
+            For a single fit over several slots: the slot the fit refers to. Efficiencies
+            from other slots are scaled to it with the inverse-square law that ``Serial``
+            applies, ``(slot / reference_slot)**2``. Required when ``peak_data`` holds
+            more than one slot; defaults to the only slot otherwise.
 
         Returns
         -------
@@ -179,7 +317,27 @@ class Calibration:
         unc_params : list[float]
             1σ standard errors of the fitted parameters, derived from the
             covariance matrix of the fit.
+
+        With ``per_slot=True``, a dict mapping each slot to its ``(params, unc_params)``
+        is returned instead (also stored in ``self.slot_eff_fit_params``).
         """
+        if per_slot:
+            slots = self.peak_data["detector_slot"].dropna().unique()
+            full = self.peak_data
+            combined = (self.eff_fit_params, self.unc_eff_fit_params, self.eff_fit_covariance, self.reference_slot)
+            self.slot_eff_fit_params, self.slot_eff_fit_covariance = {}, {}
+            try:
+                for slot in sorted(slots):
+                    self.peak_data = full[full["detector_slot"] == slot]
+                    self.slot_eff_fit_params[int(slot)] = self.process_calibration_data(
+                        initial_guesses, plot_directory, f"{plot_name}-d1s{int(slot)}", xlim, ylim,
+                        reference_slot=int(slot))
+                    self.slot_eff_fit_covariance[int(slot)] = self.eff_fit_covariance
+            finally:
+                # Per-slot fits leave the combined fit (if any) untouched
+                self.peak_data = full
+                self.eff_fit_params, self.unc_eff_fit_params, self.eff_fit_covariance, self.reference_slot = combined
+            return self.slot_eff_fit_params
 
         if plot_directory is not None:
             plot_directory = Path(plot_directory)
@@ -192,17 +350,11 @@ class Calibration:
 
 
 
-        # Read all sheets from the Excel file
-        df = self.peak_data
-
-        # Initialize a list to store results
-        energy_vals = df['energy']
+        self.reference_slot = self._reference_slot(reference_slot)
+        energy_vals, efficicency_vals, unc_efficiency_vals = self._calibration_points()
 
-        efficicency_vals = df['detector efficiency']
-        unc_efficiency_vals = df['uncertainty detector efficiency']
-        
 
-        params, unc_params = fit_decay(t_vals = energy_vals,
+        params, unc_params, covariance = fit_decay(t_vals = energy_vals,
                                     a_vals = efficicency_vals,
                                     decay_function = self.eff_func,
                                     unc_a_vals = unc_efficiency_vals,
@@ -212,9 +364,12 @@ class Calibration:
                                     initial_guess=initial_guesses,
                                     plot_filename=plot_path,
                                     xlim=xlim,
-                                    ylim=ylim)
+                                    ylim=ylim,
+                                    show=False,
+                                    return_covariance=True)
         
         self.eff_fit_params, self.unc_eff_fit_params = params, unc_params
+        self.eff_fit_covariance = covariance
 
         return params, unc_params
     
@@ -238,7 +393,7 @@ class Calibration:
             Estimated fractional efficiency uncertainty. 
         """
 
-        x, y = self.peak_data['energy'], self.peak_data['detector efficiency']
+        x, y, _ = self._calibration_points()
         params = self.eff_fit_params
 
         y_fit = self.eff_func(x, *params)
@@ -252,6 +407,67 @@ class Calibration:
         return self.fractional_sigma_detector_eff
     
 
+    def efficiency_table(self, slot: int | None = None, energy_range: tuple[float, float] = (20.0, 3000.0),
+                         n: int = 4096, systematic: float = 0.0) -> EfficiencyTable:
+        """
+        Export the fitted efficiency curve as a precomputed lookup for ``Serial``.
+
+        Parameters
+        ----------
+        slot : int, optional
+            Use the per-slot fit of this slot (``process_calibration_data(per_slot=True)``).
+            Default is the combined fit, which refers to ``reference_slot``.
+        energy_range : tuple[float, float], optional
+            Lowest and highest energy of the grid (keV). Default is (20, 3000).
+        n : int, optional
+            Number of grid points. Default is 4096.
+        systematic : float, optional
+            Additional fractional uncertainty added in quadrature. Default is 0.
+
+        Returns
+        -------
+        EfficiencyTable
+            Efficiency and its uncertainty from the full covariance matrix of the fit
+            (pass it to ``Serial`` as ``efficiency``).
+        """
+        if slot is not None:
+            if slot not in self.slot_eff_fit_params:
+                raise ValueError(f"No per-slot efficiency fit for slot {slot}; "
+                                 "run process_calibration_data(per_slot=True) first.")
+            params, covariance = self.slot_eff_fit_params[slot][0], self.slot_eff_fit_covariance[slot]
+        else:
+            if self.eff_fit_covariance is None:
+                raise ValueError("No efficiency fit; run process_calibration_data first.")
+            params, covariance, slot = self.eff_fit_params, self.eff_fit_covariance, self.reference_slot
+        return EfficiencyTable(self.eff_func, params, covariance, slot=slot, energy_range=energy_range,
+                               n=n, systematic=systematic)
+
+
+    def _reference_slot(self, reference_slot: int | None) -> int | None:
+        """Slot of the combined fit: ``reference_slot`` or the only slot in ``peak_data``."""
+        if "detector_slot" not in self.peak_data:
+            return reference_slot
+        slots = self.peak_data["detector_slot"].dropna().unique()
+        if reference_slot is None and len(slots) > 1:
+            raise ValueError(f"peak_data holds detector slots {sorted(slots)}; pass reference_slot "
+                             "or use per_slot=True.")
+        if reference_slot is None and len(slots) == 1:
+            return int(slots[0])
+        return reference_slot
+
+
+    def _calibration_points(self):
+        """Energies, efficiencies and uncertainties, scaled to ``reference_slot``."""
+        df = self.peak_data
+        scale = 1.0
+        if self.reference_slot is not None and "detector_slot" in df:
+            # Inverse-square law, as applied by Serial: eff(slot) = eff(ref) * (ref / slot)**2
+            scale = (df["detector_slot"] / self.reference_slot) ** 2
+        return (df['energy'], df['detector efficiency'] * scale,
+                df['uncertainty detector efficiency'] * scale)
+
+
+    @instrumented("write_csv")
     def save_peak_data(self, output_csv: str, index: bool = False) -> None:
         """
         Save the processed peak_data DataFrame to a CSV file.
@@ -0,0 +1,230 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Bump when a schema below changes incompatibly
+SCHEMA_VERSION = 1
+
+# Column kinds: "category" (dictionary-encoded string), "string", "float64", "int64".
+# "columns" are always written, in this order (as null if missing); "optional"
+# columns are typed when present; any other column is appended as it is.
+PEAK_DATA_SCHEMA = {
+    "name": "peak_data",
+    "columns": {
+        "isotope": "category", "energy": "float64", "counts": "float64", "unc_counts": "float64",
+        "intensity": "float64", "unc_intensity": "float64", "start_time": "string",
+        "live_time": "float64", "real_time": "float64", "effcal": "string", "file": "category",
+        "detector_slot": "int64", "decay time (s)": "float64", "half-life (s)": "float64",
+        "detector efficiency": "float64", "activity": "float64", "uncertainty activity": "float64",
+        "eob activity": "float64", "uncertainty eob activity": "float64", "ln(activity)": "float64",
+        "uncertainty ln(activity)": "float64",
+    },
+    "optional": {"uncertainty detector efficiency": "float64", "summed files": "string", "n_summed": "int64"},
+}
+
+DECAY_RESULTS_SCHEMA = {
+    "name": "decay_results",
+    "columns": {
+        "Isotope": "category", "Energy (keV)": "float64", "A0 (fit)": "float64", "Std A0 (fit)": "float64",
+        "Half-life (fit) [s]": "float64", "Std Half-life (fit) [s]": "float64",
+        "Mean A0 (decay-corrected)": "float64", "Std A0 (decay-corrected)": "float64",
+        "Unc Mean A0 (decay-corrected)": "float64", "N points": "int64",
+    },
+    "optional": {},
+}
+
+YIELD_RESULTS_SCHEMA = {
+    "name": "yield_results",
+    "columns": {
+        "Isotope": "category", "Slice": "int64", "Slice Thickness (cm)": "float64",
+        "Areal Density (atoms/cm²)": "float64", "Cross Section": "float64", "Activity (Bq)": "float64",
+    },
+    "optional": {},
+}
+
+_FORMATS = {".parquet": "parquet", ".pq": "parquet", ".feather": "feather", ".arrow": "feather", ".ipc": "feather"}
+
+
+def write_table(df: pd.DataFrame, path: str | Path, schema: dict | None = None, partition_by: str | list[str] | None = None,
+                format: str | None = None, compression: str = "zstd") -> str:
+    """
+    Write ``df`` to a Parquet or Feather (Arrow IPC) file with a stable schema.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table to write.
+    path : str or pathlib.Path
+        Output file, or output directory with ``partition_by``. Parent directories are
+        created if needed.
+    schema : dict, optional
+        One of the ``*_SCHEMA`` definitions of this module. Its columns are written in
+        a fixed order with fixed types (``category`` columns dictionary-encoded), so
+        files from different runs concatenate and load alike. Default is None (types
+        as inferred by pyarrow).
+    partition_by : str or list[str], optional
+        Write a hive-partitioned dataset (e.g., ``path/isotope=152TB/...``) split by
+        these columns, so one isotope can be read without the others.
+    format : {"parquet", "feather"}, optional
+        Default is taken from the suffix of ``path`` (Parquet for directories).
+    compression : str, optional
+        Compression codec of single-file writes. Default is "zstd".
+
+    Returns
+    -------
+    str
+        The path written.
+
+    Notes
+    -----
+    Requires ``pyarrow``. An existing partitioned dataset at ``path`` is replaced
+    partition by partition.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    format = _format(path, format)
+    path = Path(path)
+    table = to_arrow(df, schema)
+
+    if partition_by is not None:
+        path.mkdir(parents=True, exist_ok=True)
+        partition_by = [partition_by] if isinstance(partition_by, str) else list(partition_by)
+        # Partition values become directory names; partition on the decoded strings
+        for name in partition_by:
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type):
+                table = table.set_column(table.schema.get_field_index(name), name, column.cast(column.type.value_type))
+        file_options = None
+        if format == "parquet":
+            file_options = ds.ParquetFileFormat().make_write_options(compression=compression)
+        ds.write_dataset(table, path, format=format, partitioning=partition_by, partitioning_flavor="hive",
+                         file_options=file_options, existing_data_behavior="delete_matching")
+        return str(path)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression=compression)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression=compression)
+    return str(path)
+
+
+def read_table(path: str | Path, schema: dict | None = None, columns: list[str] | None = None,
+               filters: dict[str, list] | None = None, format: str | None = None, categorical: bool = True) -> pd.DataFrame:
+    """
+    Read a file (or partitioned directory) written by :func:`write_table`.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        File, or directory of a partitioned dataset.
+    schema : dict, optional
+        Schema the data was written with; restores its column order and the
+        ``category`` type of partition columns.
+    columns : list[str], optional
+        Read only these columns.
+    filters : dict[str, list], optional
+        Keep only rows whose column takes one of the listed values, e.g.
+        ``{"isotope": ["152TB"]}``. On a partition column, other partitions are not read.
+    format : {"parquet", "feather"}, optional
+        Default is taken from the suffix of ``path`` (or of the files in a directory).
+    categorical : bool, optional
+        If True (default), ``category`` columns are returned as pandas categoricals;
+        otherwise as plain strings.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The table. Partitioned datasets are returned partition by partition, with the
+        rows of each partition in their written order.
+    """
+    import pyarrow.dataset as ds
+
+    format = _format(path, format)
+    dataset = ds.dataset(path, format=format, partitioning="hive" if os.path.isdir(path) else None)
+    expression = None
+    for name, values in (filters or {}).items():
+        condition = ds.field(name).isin(list(values))
+        expression = condition if expression is None else expression & condition
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    if schema is None:
+        return df
+
+    kinds = {**schema["columns"], **schema["optional"]}
+    order = [c for c in kinds if c in df.columns] + [c for c in df.columns if c not in kinds]
+    df = df[order]
+    for name, kind in kinds.items():
+        if kind == "category" and name in df.columns:
+            if categorical and not isinstance(df[name].dtype, pd.CategoricalDtype):
+                df[name] = df[name].astype("category")
+            elif not categorical and isinstance(df[name].dtype, pd.CategoricalDtype):
+                df[name] = df[name].astype(df[name].cat.categories.dtype)
+    return df
+
+
+def to_arrow(df: pd.DataFrame, schema: dict | None = None):
+    """
+    Convert ``df`` to a ``pyarrow.Table`` laid out as ``schema``.
+
+    Schema columns missing from ``df`` are written as nulls; columns that are not
+    part of the schema follow, with inferred types. The schema name and version are
+    stored in the table metadata.
+    """
+    import pyarrow as pa
+
+    if schema is None:
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    kinds = dict(schema["columns"])
+    kinds.update({c: k for c, k in schema["optional"].items() if c in df.columns})
+    names, arrays = [], []
+    for name, kind in kinds.items():
+        s = df[name] if name in df.columns else pd.Series(np.nan, index=df.index)
+        names.append(name)
+        arrays.append(_arrow_array(s, kind))
+    for name in df.columns:
+        if name not in kinds:
+            names.append(name)
+            try:
+                arrays.append(pa.array(df[name], from_pandas=True))
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                arrays.append(_arrow_array(df[name], "string"))
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    return table.replace_schema_metadata({"nuclab.schema": schema["name"], "nuclab.schema_version": str(SCHEMA_VERSION)})
+
+
+def _arrow_array(s: pd.Series, kind: str):
+    import pyarrow as pa
+
+    if kind == "category":
+        cat = s.astype("category")
+        codes = cat.cat.codes.to_numpy(np.int32)
+        categories = [str(c) for c in cat.cat.categories]
+        return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32(), mask=codes < 0),
+                                              pa.array(categories, type=pa.string()))
+    if kind == "string":
+        return pa.array([None if pd.isna(v) else str(v) for v in s], type=pa.string())
+    if kind == "int64":
+        return pa.array(pd.to_numeric(s, errors="coerce").astype("Int64"), type=pa.int64())
+    return pa.array(pd.to_numeric(s, errors="coerce").to_numpy(np.float64), type=pa.float64(), from_pandas=True)
+
+
+def _format(path: str | Path, format: str | None) -> str:
+    if format is None and os.path.isdir(path):
+        # A partitioned dataset: the format of the files in it
+        for _, _, names in os.walk(path):
+            formats = sorted({_FORMATS[Path(n).suffix.lower()] for n in names if Path(n).suffix.lower() in _FORMATS})
+            if formats:
+                format = formats[0]
+                break
+    if format is None:
+        format = _FORMATS.get(Path(path).suffix.lower(), "parquet")
+    if format not in ("parquet", "feather"):
+        raise ValueError(f"Unknown format {format!r}; use 'parquet' or 'feather'.")
+    return format
@@ -0,0 +1,360 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+def exp_decay(t, A0, lam):
+    """
+    Single-component exponential decay ``A(t) = A0 * exp(-lam * t)``.
+    """
+    return A0 * np.exp(-lam * t)
+
+
+def pad_groups(*groups, fill_values=None):
+    """
+    Stack ragged per-group 1-D arrays into padded 2-D arrays.
+
+    Parameters
+    ----------
+    *groups : list of array-like
+        One list per quantity (e.g., times, activities, uncertainties); every list
+        holds one array per group, and arrays of the same group share a length.
+    fill_values : list[float], optional
+        Padding value per quantity. Defaults to 0 for all.
+
+    Returns
+    -------
+    padded : list of numpy.ndarray
+        One ``(n_groups, max_len)`` array per quantity.
+    mask : numpy.ndarray of bool
+        ``(n_groups, max_len)``, True where an entry holds data.
+    """
+    n_groups = len(groups[0])
+    lengths = np.array([len(g) for g in groups[0]], dtype=int)
+    max_len = int(lengths.max()) if n_groups else 0
+    mask = np.arange(max_len)[None, :] < lengths[:, None]
+
+    fill_values = fill_values or [0.0] * len(groups)
+    padded = []
+    for quantity, fill in zip(groups, fill_values):
+        out = np.full((n_groups, max_len), fill, dtype=float)
+        if n_groups:
+            out[mask] = np.concatenate([np.asarray(g, dtype=float) for g in quantity])
+        padded.append(out)
+    return padded, mask
+
+
+def fit_exponential_decays(t_groups, a_groups, sigma_groups, initial_guesses, max_iter: int = 200,
+                           xtol: float = 1e-10, ftol: float = 1e-12):
+    """
+    Fit ``A(t) = A0 * exp(-lam * t)`` to many groups of data at once.
+
+    All groups are stacked into padded ``(n_groups, max_len)`` arrays and solved
+    together with a weighted Levenberg-Marquardt iteration. The Jacobian is analytic
+    and the 2x2 normal equations of every group are solved in closed form, so each
+    iteration is a handful of array expressions regardless of the number of groups.
+    Parameters are internally scaled by the initial ``A0`` and the longest decay time
+    of each group to keep the normal equations well conditioned.
+
+    Parameters
+    ----------
+    t_groups, a_groups, sigma_groups : list of array-like
+        Per-group decay times (s), activities and their 1σ uncertainties.
+    initial_guesses : array-like
+        ``(n_groups, 2)`` initial ``[A0, lam]`` per group.
+    max_iter : int, optional
+        Maximum number of iterations. Default is 200.
+    xtol : float, optional
+        Convergence threshold on the relative parameter step. Default is 1e-10.
+    ftol : float, optional
+        Convergence threshold on the relative chi-square reduction. Default is 1e-12.
+
+    Returns
+    -------
+    params : numpy.ndarray
+        ``(n_groups, 2)`` best-fit ``[A0, lam]``.
+    param_errors : numpy.ndarray
+        ``(n_groups, 2)`` 1σ standard errors (absolute sigma, as ``curve_fit`` with
+        ``absolute_sigma=True``).
+    covariances : numpy.ndarray
+        ``(n_groups, 2, 2)`` parameter covariance matrices.
+    converged : numpy.ndarray of bool
+        ``(n_groups,)``, False for groups that did not converge; their results
+        should not be used.
+    """
+    (T, Y, S), mask = pad_groups(t_groups, a_groups, sigma_groups, fill_values=[0.0, 0.0, 1.0])
+    W = mask.astype(float)
+    p0 = np.asarray(initial_guesses, dtype=float).reshape(-1, 2)
+
+    # Internal scaling: A0 = a_ref * x0, lam = x1 / t_ref
+    a_ref = np.where(np.isfinite(p0[:, 0]) & (p0[:, 0] != 0), np.abs(p0[:, 0]), 1.0)
+    t_ref = np.where(mask, np.abs(T), 0.0).max(axis=1, initial=0.0)
+    t_ref = np.where(t_ref > 0, t_ref, 1.0)
+    Tn = T / t_ref[:, None]
+    x = np.column_stack([p0[:, 0] / a_ref, p0[:, 1] * t_ref])
+
+    def evaluate(x, rows):
+        e = np.exp(-x[:, 1:2] * Tn[rows])
+        f = a_ref[rows, None] * x[:, 0:1] * e
+        r = W[rows] * (Y[rows] - f) / S[rows]
+        return e, r, np.sum(r ** 2, axis=1)
+
+    def normal_equations(x, e, r, rows):
+        J0 = W[rows] * a_ref[rows, None] * e / S[rows]
+        J1 = -Tn[rows] * x[:, 0:1] * J0
+        return (np.sum(J0 ** 2, axis=1), np.sum(J0 * J1, axis=1), np.sum(J1 ** 2, axis=1),
+                np.sum(J0 * r, axis=1), np.sum(J1 * r, axis=1))
+
+    all_rows = np.arange(len(x))
+    mu = np.full(len(x), 1e-3)
+    converged = np.zeros(len(x), dtype=bool)
+
+    with np.errstate(all="ignore"):
+        e, r, chi2 = evaluate(x, all_rows)
+        active = np.isfinite(chi2) & np.all(np.isfinite(x), axis=1)
+
+        for _ in range(max_iter):
+            # Only iterate the groups that are still running
+            rows = np.flatnonzero(active)
+            if rows.size == 0:
+                break
+            xa, ea, ra, chi2a, mua = x[rows], e[rows], r[rows], chi2[rows], mu[rows]
+
+            a, b, c, g0, g1 = normal_equations(xa, ea, ra, rows)
+            a_d, c_d = a * (1.0 + mua), c * (1.0 + mua)
+            det = a_d * c_d - b ** 2
+            dx = np.column_stack([(c_d * g0 - b * g1) / det, (a_d * g1 - b * g0) / det])
+
+            x_try = xa + dx
+            e_try, r_try, chi2_try = evaluate(x_try, rows)
+            accept = np.isfinite(chi2_try) & (chi2_try <= chi2a)
+
+            small_step = np.max(np.abs(dx) / (np.abs(xa) + xtol), axis=1) < xtol
+            small_gain = (chi2a - chi2_try) <= ftol * np.maximum(chi2a, 1e-300)
+            done = accept & (small_step | small_gain | (chi2_try < 1e-300))
+
+            acc = rows[accept]
+            x[acc], e[acc], r[acc], chi2[acc] = x_try[accept], e_try[accept], r_try[accept], chi2_try[accept]
+            mu[rows] = np.where(accept, np.maximum(mua * 0.3, 1e-12), mua * 10.0)
+
+            converged[rows[done]] = True
+            active[rows] = ~done & (mu[rows] < 1e16)
+
+        a, b, c, _, _ = normal_equations(x, e, r, all_rows)
+        det = a * c - b ** 2
+        cov_s = np.stack([np.stack([c, -b], axis=-1), np.stack([-b, a], axis=-1)], axis=-2) / det[:, None, None]
+
+    # Undo the internal scaling
+    scale = np.column_stack([a_ref, 1.0 / t_ref])
+    params = x * scale
+    covariances = cov_s * scale[:, :, None] * scale[:, None, :]
+    param_errors = np.sqrt(np.abs(np.diagonal(covariances, axis1=1, axis2=2)))
+
+    converged &= np.all(np.isfinite(params), axis=1) & np.all(np.isfinite(param_errors), axis=1)
+    return params, param_errors, covariances, converged
+
+
+@lru_cache(maxsize=256)
+def _chain_decomposition(half_lives: tuple, branching: tuple):
+    """
+    Decay matrix of a linear chain and its eigendecomposition, cached per chain.
+
+    Returns ``(lam, M, V, V_inv, degenerate)``; ``degenerate`` is True when two decay
+    constants (nearly) coincide and the eigenvectors cannot be used.
+    """
+    lam = np.log(2) / np.asarray(half_lives, dtype=float)
+    n = lam.size
+
+    # dN/dt = M N: losses on the diagonal, feeding from the previous member below it
+    M = np.diag(-lam)
+    M[np.arange(1, n), np.arange(n - 1)] = np.asarray(branching, dtype=float) * lam[:-1]
+
+    # Eigenvectors of the lower-bidiagonal matrix in closed form (Bateman coefficients)
+    V = np.zeros((n, n))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j in range(n):
+            V[j, j] = 1.0
+            for i in range(j + 1, n):
+                V[i, j] = M[i, i - 1] * V[i - 1, j] / (lam[i] - lam[j])
+
+    degenerate = not np.all(np.isfinite(V)) or np.linalg.cond(V) > 1e8
+    V_inv = np.linalg.inv(V) if not degenerate else None
+
+    for a in (lam, M, V, V_inv):
+        if a is not None:
+            a.setflags(write=False)
+    return lam, M, V, V_inv, degenerate
+
+
+def bateman_activities(chains, initial_activities, times, branching=None):
+    """
+    Activities of the members of linear decay chains on a shared time grid.
+
+    Solves ``dN/dt = M N`` for every chain ``1 -> 2 -> ... -> n``. The
+    eigendecomposition of each chain's decay matrix is cached, so repeated calls with
+    the same chain only cost the evaluation. All non-degenerate chains are evaluated
+    together as a single batched array expression, ``A = λ V diag(V⁻¹ N0) exp(-λ t)``.
+    Chains with (nearly) equal decay constants, where the classic Bateman
+    coefficients divide by zero, fall back to the matrix exponential ``expm(M t)``.
+
+    Parameters
+    ----------
+    chains : list of list[float]
+        Half-lives (s) of the members of each chain, parent first. Use ``numpy.inf``
+        for a stable end member.
+    initial_activities : list of list[float]
+        Activity (Bq) of every member at ``t = 0``, one list per chain.
+    times : float or array-like
+        Times (s) at which to evaluate the activities.
+    branching : list of list[float], optional
+        Branching ratio of each decay into the next member (``n - 1`` values per
+        chain). Defaults to 1.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_chains, max_chain_length, n_times)`` activities (Bq); entries beyond the
+        length of a chain are NaN.
+
+    Examples
+    --------
+    >>> hl_155Dy, hl_155Tb = 9.9 * 3600, 5.32 * 86400
+    >>> A = bateman_activities([[hl_155Dy, hl_155Tb]], [[1e6, 0.0]], np.linspace(0, 7 * 86400, 50))
+    >>> A[0, 1]   # 155Tb ingrowth from 155Dy
+    """
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    n_max = max((len(chain) for chain in chains), default=0)
+    activities = np.full((len(chains), n_max, times.size), np.nan)
+
+    batched, lam_pad, coeff_pad = [], [], []
+    for c, (half_lives, A0) in enumerate(zip(chains, initial_activities)):
+        n = len(half_lives)
+        ratios = branching[c] if branching is not None else [1.0] * (n - 1)
+        lam, M, V, V_inv, degenerate = _chain_decomposition(tuple(float(h) for h in half_lives),
+                                                            tuple(float(b) for b in ratios))
+
+        # Initial number of atoms (stable members start empty)
+        N0 = np.divide(np.asarray(A0, dtype=float), lam, out=np.zeros(n), where=lam > 0)
+
+        if degenerate:
+            from scipy.linalg import expm
+
+            N = expm(M[None, :, :] * times[:, None, None]) @ N0
+            activities[c, :n] = lam[:, None] * N.T
+            continue
+
+        # N_i(t) = sum_j V_ij (V^-1 N0)_j exp(-lam_j t)
+        coeffs = np.zeros((n_max, n_max))
+        coeffs[:n, :n] = V * (V_inv @ N0)[None, :]
+        lam_row = np.zeros(n_max)
+        lam_row[:n] = lam
+        batched.append(c)
+        lam_pad.append(lam_row)
+        coeff_pad.append(coeffs)
+
+    if batched:
+        lam_pad = np.array(lam_pad)
+        N = np.einsum("cij,cjt->cit", np.array(coeff_pad), np.exp(-lam_pad[:, :, None] * times[None, None, :]))
+        for row, c in enumerate(batched):
+            n = len(chains[c])
+            activities[c, :n] = lam_pad[row, :n, None] * N[row, :n]
+
+    return activities
+
+
+def _ingrowth(t, lam, parent_lam):
+    """
+    Daughter activity per unit parent EoB activity, ``λ/(λ-λp) (exp(-λp t) - exp(-λ t))``,
+    and its derivative with respect to ``λ``; the ``λ -> λp`` limit is used when the
+    decay constants (nearly) coincide.
+    """
+    t = np.asarray(t, dtype=float)
+    d = lam - parent_lam
+    e_p, e_d = np.exp(-parent_lam * t), np.exp(-lam * t)
+    if abs(d) > 1e-9 * max(lam, parent_lam):
+        g = lam / d * (e_p - e_d)
+        dg = -parent_lam / d ** 2 * (e_p - e_d) + lam / d * t * e_d
+    else:
+        g = lam * t * e_p
+        dg = e_p * (t - parent_lam * t ** 2 / 2)
+    return g, dg
+
+
+def parent_feeding_decay(t, A0, lam, parent_A0, parent_lam, branching=1.0):
+    """
+    Daughter activity with ingrowth from a decaying parent,
+    ``A(t) = A0 exp(-λ t) + b P λ/(λ-λp) (exp(-λp t) - exp(-λ t))``,
+    where ``A0``/``P`` are the daughter/parent activities at ``t = 0``.
+    """
+    return A0 * np.exp(-lam * np.asarray(t, dtype=float)) + branching * parent_A0 * _ingrowth(t, lam, parent_lam)[0]
+
+
+def fit_parent_feeding(t_groups, a_groups, sigma_groups, parent_lam, lam0, branching=1.0):
+    """
+    Jointly fit all lines of a daughter isotope fed by a decaying parent.
+
+    Each line ``j`` follows :func:`parent_feeding_decay` with its own daughter activity
+    ``A0_j``, while the daughter decay constant ``λ`` and the parent activity ``P`` are
+    shared by every line. The parent decay constant ``λp`` is fixed. The model is linear
+    in ``A0_j`` and ``P``: they are initialized by a weighted linear solve at ``lam0``,
+    then all parameters are refined by Levenberg-Marquardt with the analytic Jacobian,
+    evaluated for all lines at once.
+
+    Parameters
+    ----------
+    t_groups, a_groups, sigma_groups : list of array-like
+        Per-line decay times (s), activities and their 1σ uncertainties.
+    parent_lam : float
+        Decay constant of the parent (1/s).
+    lam0 : float
+        Initial daughter decay constant (1/s).
+    branching : float, optional
+        Fraction of parent decays feeding the daughter. Default is 1.
+
+    Returns
+    -------
+    params : numpy.ndarray
+        ``[A0_1, ..., A0_L, λ, P]``.
+    covariance : numpy.ndarray
+        ``(L + 2, L + 2)`` parameter covariance (absolute sigma).
+    success : bool
+        Whether the solver converged.
+    """
+    from scipy.optimize import least_squares
+
+    n_lines = len(t_groups)
+    line = np.concatenate([np.full(len(t), j) for j, t in enumerate(t_groups)])
+    t = np.concatenate([np.asarray(v, dtype=float) for v in t_groups])
+    a = np.concatenate([np.asarray(v, dtype=float) for v in a_groups])
+    s = np.concatenate([np.asarray(v, dtype=float) for v in sigma_groups])
+    rows = np.arange(t.size)
+
+    def jacobian(x):
+        lam, P = x[n_lines], x[n_lines + 1]
+        e = np.exp(-lam * t)
+        g, dg = _ingrowth(t, lam, parent_lam)
+        J = np.zeros((t.size, n_lines + 2))
+        J[rows, line] = e
+        J[:, n_lines] = -t * x[line] * e + branching * P * dg
+        J[:, n_lines + 1] = branching * g
+        return J / s[:, None]
+
+    def residuals(x):
+        lam, P = x[n_lines], x[n_lines + 1]
+        model = x[line] * np.exp(-lam * t) + branching * P * _ingrowth(t, lam, parent_lam)[0]
+        return (model - a) / s
+
+    # Linear initial guess for the activities at lam0
+    x0 = np.zeros(n_lines + 2)
+    x0[n_lines] = lam0
+    design = jacobian(x0)[:, np.r_[0:n_lines, n_lines + 1]]
+    linear, *_ = np.linalg.lstsq(design, a / s, rcond=None)
+    x0[:n_lines], x0[n_lines + 1] = linear[:n_lines], linear[n_lines]
+
+    fit = least_squares(residuals, x0, jac=jacobian, method="lm", x_scale="jac")
+    J = fit.jac
+    try:
+        covariance = np.linalg.inv(J.T @ J)
+    except np.linalg.LinAlgError:
+        covariance = np.full((n_lines + 2, n_lines + 2), np.nan)
+    return fit.x, covariance, bool(fit.success)
@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+
+def fit_plot_job(t_vals, a_vals, unc_a_vals, fit_function, params, xlabel, ylabel, plot_filename,
+                 xlim=None, ylim=None) -> dict:
+    """
+    Record what is needed to draw a data + fitted-curve plot later.
+
+    Parameters
+    ----------
+    t_vals, a_vals, unc_a_vals : array-like
+        Measured x values, y values and y uncertainties.
+    fit_function : callable
+        Fitted function, called as ``fit_function(x, *params)``. Must be picklable
+        (module-level) to be rendered in a process pool.
+    params : array-like
+        Optimized parameters of ``fit_function``.
+    xlabel, ylabel : str
+        Axis labels.
+    plot_filename : str or pathlib.Path
+        Output image path.
+    xlim, ylim : tuple, optional
+        Axis limits.
+
+    Returns
+    -------
+    dict
+        Plot job for :func:`render_plots`.
+    """
+    return {
+        "kind": "fit",
+        "filename": str(plot_filename),
+        "t": np.asarray(t_vals, dtype=float),
+        "a": np.asarray(a_vals, dtype=float),
+        "unc_a": np.asarray(unc_a_vals, dtype=float),
+        "function": fit_function,
+        "params": list(params),
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "xlim": xlim,
+        "ylim": ylim,
+    }
+
+
+def spectrum_plot_job(sp, spectrum_path, plot_filename) -> dict:
+    """
+    Record what is needed to redraw a CURIE peak-fit plot later.
+
+    Only the fit results are kept; the counts are re-read from ``spectrum_path``
+    when the plot is rendered, so queued jobs stay small.
+
+    Parameters
+    ----------
+    sp : curie.Spectrum
+        Spectrum on which ``fit_peaks`` has been called.
+    spectrum_path : str, pathlib.Path or list
+        File the spectrum was read from, or the files summed into it.
+    plot_filename : str or pathlib.Path
+        Output image path (e.g., ``.svg`` or ``.png``).
+
+    Returns
+    -------
+    dict
+        Plot job for :func:`render_plots`.
+    """
+    return {
+        "kind": "spectrum",
+        "filename": str(plot_filename),
+        "spectrum_path": [str(p) for p in spectrum_path] if isinstance(spectrum_path, list) else str(spectrum_path),
+        "fit_config": dict(sp.fit_config),
+        "fits": sp._fits,
+        "failed_fits": sp._failed_fits,
+        "peaks": sp._peaks,
+    }
+
+
+def draw_fit(ax, t_vals, a_vals, unc_a_vals, fit_function, params, xlabel, ylabel, xlim=None, ylim=None):
+    """
+    Draw measured data with error bars and a fitted curve on ``ax``.
+    """
+    # Generate time values for plotting the fitted curve
+    t_fit = np.linspace(1, max(t_vals), 200)  # 200 evenly spaced time points
+    y_fit = fit_function(t_fit, *params)  # Compute fitted decay values
+
+    ax.scatter(t_vals, a_vals, color="dodgerblue")
+    ax.errorbar(t_vals, a_vals, yerr=unc_a_vals, label="Experimental", fmt="none", color="dodgerblue", alpha=0.8, ecolor="dodgerblue")
+    ax.plot(t_fit, y_fit, label="Polynomial Fit", color="navy", linestyle="--", linewidth=2)
+
+    # Formatting
+    ax.set_xlabel(xlabel, fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+
+def render_plot(job: dict) -> str:
+    """
+    Render a single plot job to its file.
+
+    Fit plots are drawn on a standalone Agg ``Figure`` (no pyplot state, nothing
+    left open); spectrum plots are redrawn by CURIE through pyplot, and any figure
+    it leaves open is closed.
+
+    Returns
+    -------
+    str
+        The written filename.
+    """
+    Path(job["filename"]).parent.mkdir(parents=True, exist_ok=True)
+
+    if job["kind"] == "fit":
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8, 5), dpi=120)
+        draw_fit(fig.add_subplot(), job["t"], job["a"], job["unc_a"], job["function"], job["params"],
+                 job["xlabel"], job["ylabel"], xlim=job["xlim"], ylim=job["ylim"])
+        fig.savefig(job["filename"], bbox_inches="tight", dpi=150)
+
+    elif job["kind"] == "spectrum":
+        import matplotlib.pyplot as plt
+        from nuclab.spectra import load_spectrum
+        from nuclab.summing import sum_spectra
+
+        if isinstance(job["spectrum_path"], list):
+            sp = sum_spectra([load_spectrum(p) for p in job["spectrum_path"]])
+        else:
+            sp = load_spectrum(job["spectrum_path"])
+        sp.fit_config = job["fit_config"]
+        sp._fits, sp._failed_fits, sp._peaks = job["fits"], job["failed_fits"], job["peaks"]
+
+        # CURIE draws through pyplot; make sure nothing stays open if drawing fails
+        open_figures = set(plt.get_fignums())
+        try:
+            sp.plot(saveas=job["filename"], show=False)
+        finally:
+            for num in set(plt.get_fignums()) - open_figures:
+                plt.close(num)
+
+    else:
+        raise ValueError(f"Unknown plot job kind '{job['kind']}'.")
+
+    return job["filename"]
+
+
+def _use_agg():
+    # Process-pool initializer: render headless
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+
+
+def render_plots(jobs: list[dict], workers: int | None = None) -> list[str]:
+    """
+    Render queued plot jobs, optionally across a process pool.
+
+    Parameters
+    ----------
+    jobs : list[dict]
+        Jobs from :func:`fit_plot_job` / :func:`spectrum_plot_job`.
+    workers : int, optional
+        Number of worker processes. If None or 1 (default), jobs are rendered in
+        the current process. Worker processes use the Agg backend.
+
+    Returns
+    -------
+    list[str]
+        Filenames that were written. Jobs that fail are reported and skipped.
+    """
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+            futures = [pool.submit(render_plot, job) for job in jobs]
+            return _collect_rendered(zip(jobs, (future.result for future in futures)))
+
+    return _collect_rendered((job, partial(render_plot, job)) for job in jobs)
+
+
+def _collect_rendered(outcomes):
+    written = []
+    for job, get_filename in outcomes:
+        try:
+            written.append(get_filename())
+        except Exception as e:
+            print(f"Failed to render {job['filename']}: {e}")
+    return written
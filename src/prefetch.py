@@ -0,0 +1,66 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+
+class ReadAhead:
+    """
+    Read (and parse) the next spectra in background threads while the current one is fitted.
+
+    On network shares or slow USB disks, reading each spectrum stalls the fit that
+    needs it. With read-ahead, up to ``depth`` upcoming files are read by a small
+    thread pool so they are ready when their turn comes. The queue is bounded: a new
+    read is only started once the consumer is done with the previous spectrum (asks
+    for the next one), so at most ``depth`` parsed spectra, including the one being
+    fitted, are held in memory however long the series is.
+
+    Parameters
+    ----------
+    depth : int, optional
+        Number of spectra held at a time: the one being fitted and ``depth - 1`` read
+        ahead of it. Default is 4.
+    threads : int, optional
+        Number of reader threads. Default is 2.
+
+    Notes
+    -----
+    Reads run in threads of the calling process; with a process pool the parsed
+    spectra are handed to the workers, which then do not touch the disk.
+    """
+
+    def __init__(self, depth: int = 4, threads: int = 2):
+        self.depth = depth
+        self.threads = threads
+
+
+    def map(self, load, items):
+        """
+        Start ``load(item)`` ahead of time for the next ``depth`` items.
+
+        Parameters
+        ----------
+        load : callable
+            Reads one item (e.g., a filename) and returns what was read. Exceptions are
+            raised by the future, in the consumer.
+        items : iterable
+            Items to read, in order.
+
+        Yields
+        ------
+        tuple[item, concurrent.futures.Future]
+            Each item with the future of its read, in order. If the consumer stops
+            early, reads that have not started are cancelled.
+        """
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="nuclab-read") as pool:
+            pending = deque((item, pool.submit(load, item)) for item in islice(items, max(self.depth, 1)))
+            try:
+                while pending:
+                    item, future = pending.popleft()
+                    yield item, future
+                    # The consumer is done with ``item``: only now start the next read
+                    for nxt in islice(items, 1):
+                        pending.append((nxt, pool.submit(load, nxt)))
+            finally:
+                for _, future in pending:
+                    future.cancel()
@@ -1,8 +1,19 @@
-from nuclab.utils import *
+import numpy as np
+import pandas as pd
+from nuclab.utils import beam_history_saturation
+from nuclab.decay import bateman_activities
+from nuclab.instrumentation import Instrumentation, instrumented, stage
+from nuclab.columnar import YIELD_RESULTS_SCHEMA, read_table, write_table
 from pathlib import Path
 from typing import Mapping, Iterable, Optional
+import hashlib
+import json
+import os
 import re
 
+# Bump when the layout of the compiled cross-section library changes
+REACTION_LIBRARY_VERSION = 1
+
 class Yield:
     '''
     Performs theoretical end-of-bombardment (EoB) activity yield calculations for accelerator based production of solid targets.
@@ -25,6 +36,16 @@ class Yield:
         Rate of particles incident on the target (particles/second).
     t_irrd: float
         The length of the irradiation time (s)
+    beam_times, beam_intensities : list[float], optional
+        Logged beam history - sample times from the start of irradiation (s) and the
+        projectile intensity (particles/second) held until the next sample. When given,
+        EoB activities integrate this history (beam trips, ramps) instead of a constant
+        `projectile_intensity`; the bombardment ends at `t_irrad` if set.
+    instrument : Instrumentation or bool, optional
+        Records wall time and CPU time of every stage (slicing, cross-section
+        interpolation, activities, Excel writing, ...), and peak memory with
+        `Instrumentation(memory=True)`. True creates a new `Instrumentation`
+        (timings only). Default is None (disabled).
     
     Attributes
     ----------
@@ -32,12 +53,18 @@ class Yield:
         Mapping from isotope to its reaction data. Populate this attribute
         using `log_reactions_from_csvs`, which constructs the dictionary from
         cross-section (xs) data files.
+    sweep_results: pandas.Series or None
+        Total activities over a parameter grid, from `sweep_activities`.
+    mc_results: dict or None
+        Monte Carlo summary and correlations, from `monte_carlo_activities`.
         
     '''
 
     def __init__(self, E0: float = None, srim_energies: list = None, srim_ranges: float = None, target_thickness: float = None,
                  dE: float = None, density: float = None, molecular_weight: float = None,
-                   projectile_intensity: float = None, t_irrad: float = None, reactions: dict[str, dict] | None = None):
+                   projectile_intensity: float = None, t_irrad: float = None, reactions: dict[str, dict] | None = None,
+                 beam_times: list = None, beam_intensities: list = None,
+                 instrument: Instrumentation | bool | None = None):
 
         self.E0 = E0
         self.srim_energies = srim_energies
@@ -49,9 +76,14 @@ class Yield:
         self.projectile_intensity = projectile_intensity
         self.t_irrad = t_irrad
         self.reactions = reactions or {}
+        self.beam_times = beam_times
+        self.beam_intensities = beam_intensities
+        self.instrument = Instrumentation() if instrument is True else (instrument or None)
 
 
         self.results: dict[str, dict] = {}
+        self.sweep_results: pd.Series | None = None
+        self.mc_results: dict | None = None
 
 
     def break_target_into_slices(self):
@@ -59,47 +91,65 @@ class Yield:
         Decompose the target into thin slices based on energy loss.
 
 
-        The funciton iterativley divides the target into slices defined by dE.
-        Each slice has a physical thickness (cm) corresponding to an energy 
-        loss of dE MeV, enabling energy-depth mapping across the entire 
-        target thickness.
+        The target is divided into slices defined by dE. Each slice has a
+        physical thickness (cm) corresponding to an energy loss of dE MeV,
+        enabling energy-depth mapping across the entire target thickness.
+
+        All slices are computed at once: the energy grid ``E0, E0-dE, ...`` is
+        built in one shot, the projected ranges of every grid energy come from a
+        single interpolation of the SRIM table, and the grid is cut where the
+        cumulative thickness reaches the target thickness (the last slice is
+        clipped). The grid and running thickness are accumulated step by step,
+        so the slices are identical to stepping through the target one dE at a time.
 
         Returns:
-            slices : list[float]
+            slices : numpy.ndarray
                 Thickness of each slice (cm)
-            energies: list[float]
+            energies: numpy.ndarray
                 Proton energy (MeV) at the entrance of each slice
         """
-        current_energy = self.E0
-        remaining_thickness = self.target_thickness
-        slices = []
-        energies = []
-
-        while current_energy > 0 and remaining_thickness > 0:
-            # Interpolate to find the projected range at the current energy
-            range_at_current_energy = linear_interpolation(self.srim_energies, self.srim_ranges, current_energy, mode='y')
-
-            # Determine the next energy step
-            next_energy = max(current_energy - self.dE, 0)
-
-            # Interpolate to find the projected range at the next energy
-            range_at_next_energy = linear_interpolation(self.srim_energies, self.srim_ranges, next_energy, mode='y')
+        slices, energies = self._energy_slices(self.E0)
+        thickness = self.target_thickness
+        if not thickness > 0:
+            return np.empty(0), np.empty(0)
+
+        # Remaining thickness in front of each slice; stop once the target is traversed
+        remaining = np.subtract.accumulate(np.concatenate(([thickness], slices)))
+        exhausted = remaining[1:] <= 0
+        if exhausted.any():
+            n_slices = int(np.argmax(exhausted)) + 1
+            slices, energies = slices[:n_slices].copy(), energies[:n_slices]
+            slices[-1] = min(slices[-1], remaining[n_slices - 1])
 
-            # Compute the required slice thickness
-            slice_thickness = range_at_current_energy - range_at_next_energy
-
-            if slice_thickness <= 0:
-                break  # Stop if we get a non-physical thickness
-
-            # Ensure we do not exceed the target thickness
-            if slice_thickness > remaining_thickness:
-                slice_thickness = remaining_thickness
+        return slices, energies
 
-            slices.append(slice_thickness)
-            energies.append(current_energy)
 
-            remaining_thickness -= slice_thickness
-            current_energy = next_energy  # Move to the next energy step
+    def _energy_slices(self, E0):
+        """
+        Slice thicknesses (cm) and entrance energies (MeV) for a beam of energy ``E0``
+        losing dE per slice until it stops, ignoring the target thickness.
+        """
+        dE = self.dE
+        if not (E0 > 0 and dE > 0):
+            return np.empty(0), np.empty(0)
+
+        # Energy grid E0, E0-dE, ... down to (and including) the first value <= 0
+        n_steps = int(np.ceil(E0 / dE)) + 2
+        grid = np.subtract.accumulate(np.concatenate(([E0], np.full(n_steps, dE, dtype=float))))
+        n_slices = int(np.argmax(grid <= 0))
+        energies = grid[:n_slices]
+        next_energies = np.maximum(grid[1:n_slices + 1], 0)
+
+        # Projected ranges at every slice boundary in one pass
+        srim_energies = np.asarray(self.srim_energies, dtype=float)
+        srim_ranges = np.asarray(self.srim_ranges, dtype=float)
+        slices = np.interp(energies, srim_energies, srim_ranges) - np.interp(next_energies, srim_energies, srim_ranges)
+
+        # Stop before the first non-physical thickness
+        non_physical = slices <= 0
+        if non_physical.any():
+            n_slices = int(np.argmax(non_physical))
+            slices, energies = slices[:n_slices], energies[:n_slices]
 
         return slices, energies
 
@@ -111,8 +161,16 @@ class Yield:
         Computes the areal density for each slice of the decomposed target.
 
         Parameters
+        ----------
+        slice_thicknesses : array-like
+            Thickness of each slice (cm).
+
+        Returns
+        -------
+        numpy.ndarray
+            Atomic areal density of each slice (atoms/cm²).
         """
-        areal_densities = [(self.density * t) / self.molecular_weight * 6.022 * 10 ** 23 * 2 for t in slice_thicknesses]
+        areal_densities = (self.density * np.asarray(slice_thicknesses, dtype=float)) / self.molecular_weight * 6.022 * 10 ** 23 * 2
         return areal_densities
 
     def interpolate_cross_sections(self, slice_energies, energy_vals, cross_section_vals):
@@ -121,18 +179,40 @@ class Yield:
 
         Parameters
         ----------
-        slice_thicknesses : list[float]
-            Thickness of each slice (cm).
+        slice_energies : array-like
+            Entrance energy of each slice (MeV).
+        energy_vals, cross_section_vals : array-like
+            Tabulated energies (MeV) and cross-sections (cm²) of the reaction.
+
+        Returns
+        -------
+        numpy.ndarray
+            Cross-section at each slice energy (cm²).
+        """
+        return np.interp(slice_energies, np.asarray(energy_vals, dtype=float), np.asarray(cross_section_vals, dtype=float))
+
+    def cross_section_matrix(self, slice_energies):
+        """
+        Interpolate the cross-sections of every isotope in ``self.reactions`` at the slice energies.
+
+        Parameters
+        ----------
+        slice_energies : array-like
+            Entrance energy of each slice (MeV).
 
         Returns
         -------
-        list[float]
-            Areal density of each slice (g/cm²).
+        isotopes : list[str]
+            Row labels, in the order of ``self.reactions``.
+        numpy.ndarray
+            ``(n_isotopes, n_slices)`` cross-sections (cm²).
         """
-        interpolated_cross_sections = [
-            linear_interpolation(energy_vals, cross_section_vals, E, mode='y') for E in slice_energies
-        ]
-        return interpolated_cross_sections
+        isotopes = list(self.reactions)
+        sigma = np.empty((len(isotopes), len(slice_energies)))
+        for row, isotope in enumerate(isotopes):
+            data = self.reactions[isotope]
+            sigma[row] = self.interpolate_cross_sections(slice_energies, data["cross_section_energy_vals"], data["cross_section_vals"])
+        return isotopes, sigma
 
     def calculate_slice_activities(self, N_list, sigma_list, I, half_life, t):
         """
@@ -140,31 +220,69 @@ class Yield:
 
         Parameters
         ----------
-        N_list : list[float]
+        N_list : array-like
             Atomic areal densities of each slice (atoms/cm²).
-        sigma_list : list[float]
-            Reaction cross-sections for each slice (cm²).
+        sigma_list : array-like
+            Reaction cross-sections for each slice (cm²), or an
+            ``(n_isotopes, n_slices)`` matrix from ``cross_section_matrix``.
         I : float
             Projectile intensity (particles/s).
-        half_life : float
-            Half-life of the product nuclide (s).
+        half_life : float or array-like
+            Half-life of the product nuclide (s), or one per matrix row.
         t : float
             Irradiation duration (s).
 
         Returns
         -------
-        list[float]
-            Activity produced in each slice (Bq).
+        numpy.ndarray
+            Activity produced in each slice (Bq), with the shape of ``sigma_list``.
         """
         # Convert half-life to decay constant
-        lambda_ = np.log(2) / half_life
+        lambda_ = np.log(2) / np.asarray(half_life, dtype=float)
+        sigma = np.asarray(sigma_list, dtype=float)
+        saturation = 1 - np.exp(-lambda_ * t)
+        if sigma.ndim == 2:
+            saturation = np.reshape(saturation, (-1, 1))
 
-        # Compute activity for each slice
-        activities = [N * sigma * I * (1 - np.exp(-lambda_ * t)) for N, sigma in zip(N_list, sigma_list)]
+        # Activity of every slice (and isotope) at once
+        activities = np.asarray(N_list, dtype=float) * sigma * I * saturation
 
         return activities
     
 
+    def calculate_slice_activities_from_history(self, N_list, sigma_list, half_life):
+        """
+        Calculate the EoB activity produced in each slice for the logged beam history
+
+        Uses ``beam_times``/``beam_intensities`` through ``beam_history_saturation``,
+        a single decay-weighted pass over the samples for all isotopes at once.
+
+        Parameters
+        ----------
+        N_list : array-like
+            Atomic areal densities of each slice (atoms/cm²).
+        sigma_list : array-like
+            Reaction cross-sections for each slice (cm²), or an
+            ``(n_isotopes, n_slices)`` matrix from ``cross_section_matrix``.
+        half_life : float or array-like
+            Half-life of the product nuclide (s), or one per matrix row.
+
+        Returns
+        -------
+        numpy.ndarray
+            Activity produced in each slice (Bq), with the shape of ``sigma_list``.
+        """
+        sigma = np.asarray(sigma_list, dtype=float)
+        saturation = beam_history_saturation(self.beam_times, self.beam_intensities, half_life, t_end=self.t_irrad)
+        if sigma.ndim == 2:
+            saturation = saturation[:, None]
+        else:
+            saturation = saturation[0]
+
+        return np.asarray(N_list, dtype=float) * sigma * saturation
+    
+
+    @instrumented("load_reactions")
     def load_reactions_from_csvs(
         self,
         directory: str | Path,
@@ -175,6 +293,7 @@ class Yield:
         xs_units: str = "mb",
         dropna: bool = True,
         encoding: Optional[str] = None,
+        library: str | Path | bool = True,
     ) -> dict[str, dict]:
         """
         Populate self.reactions from CSV files in `directory`.
@@ -197,13 +316,22 @@ class Yield:
             xs_units: Units of cross section in the CSVs: "b", "mb", "ub", "nb", or "pb".
             dropna: Whether to drop rows with NaNs in selected columns.
             encoding: Optional file encoding for pandas.
+            library: Compiled cross-section library (``.npz``). True (default) uses
+                ``<directory>/.reactions-library.npz``; False disables it.
 
         Returns:
             The constructed reactions dict and also sets self.reactions.
 
         Notes:
-            Cross sections are converted to m^2 using:
-              1 barn = 1e-28 m^2
+            Cross sections are converted to cm^2 using:
+              1 barn = 1e-24 cm^2
+
+            The parsed CSVs are compiled into a single library file holding every
+            energy grid and cross-section (already in cm^2), the isotope names and
+            half-lives. Later calls load the library instead of parsing the CSVs;
+            the ``reactions`` arrays are views into its flat arrays. The library is
+            rebuilt when a CSV is added or removed, when a CSV's contents change
+            (checked by size/mtime, then SHA-256), or when any other argument changes.
         """
         directory = Path(directory)
         if not directory.is_dir():
@@ -223,8 +351,24 @@ class Yield:
         if xs_units_lc not in unit_map:
             raise ValueError(f"Unsupported xs_units='{xs_units}'. Use one of {list(unit_map.keys())}.")
 
+        files: list[Path] = list(directory.glob(filename_glob))
+
+        if library is True:
+            library = directory / ".reactions-library.npz"
+        library = Path(library) if library else None
+        settings = {
+            "filename_glob": filename_glob, "energy_col": energy_col, "xs_col": xs_col,
+            "xs_units": xs_units, "dropna": dropna, "encoding": encoding,
+            "isotope_half_lives": {k: float(v) for k, v in sorted(isotope_half_lives.items())},
+        }
+
+        if library is not None:
+            reactions = self._read_reaction_library(library, files, settings)
+            if reactions is not None:
+                self.reactions = reactions
+                return reactions
+
         reactions: dict[str, dict] = {}
-        files: Iterable[Path] = directory.glob(filename_glob)
 
         # Helper to extract isotope name from filename
         def infer_isotope_name(p: Path) -> str:
@@ -270,19 +414,100 @@ class Yield:
                 continue
 
             reactions[isotope] = {
-                "cross_section_energy_vals": data["E"].astype(float).tolist(),
-                "cross_section_vals": data["XS_m2"].astype(float).tolist(),
+                "cross_section_energy_vals": data["E"].to_numpy(dtype=float),
+                "cross_section_vals": data["XS_m2"].to_numpy(dtype=float),
                 "half_life": float(isotope_half_lives[isotope]),
             }
 
         if not reactions:
             raise ValueError(f"No reactions could be loaded from {directory} with pattern '{filename_glob}'.")
 
+        if library is not None:
+            try:
+                self._write_reaction_library(library, reactions, files, settings)
+            except OSError as e:
+                print(f"[load_reactions_from_csvs] Could not write library {library}: {e}")
+
         self.reactions = reactions
         return reactions
 
 
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+
+    def _write_reaction_library(self, path: Path, reactions: dict[str, dict], files: list[Path], settings: dict) -> None:
+        """
+        Compile ``reactions`` into a single uncompressed ``.npz``: flat energy and
+        cross-section arrays with per-isotope offsets, plus a manifest of the source files.
+        """
+        isotopes = list(reactions)
+        lengths = [len(reactions[iso]["cross_section_energy_vals"]) for iso in isotopes]
+        manifest = {
+            "version": REACTION_LIBRARY_VERSION,
+            "settings": settings,
+            "files": {p.name: [p.stat().st_size, p.stat().st_mtime_ns, self._file_digest(p)] for p in files},
+        }
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                manifest=np.array(json.dumps(manifest)),
+                isotopes=np.array(isotopes, dtype=str),
+                half_lives=np.array([reactions[iso]["half_life"] for iso in isotopes], dtype=float),
+                offsets=np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+                energies=np.concatenate([np.asarray(reactions[iso]["cross_section_energy_vals"], dtype=float) for iso in isotopes]),
+                cross_sections=np.concatenate([np.asarray(reactions[iso]["cross_section_vals"], dtype=float) for iso in isotopes]),
+            )
+        os.replace(tmp, path)
+
+
+    def _read_reaction_library(self, path: Path, files: list[Path], settings: dict) -> dict[str, dict] | None:
+        """
+        Load a compiled library, or return None if it is missing or out of date.
+        """
+        if not path.is_file():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as lib:
+                manifest = json.loads(str(lib["manifest"]))
+                if manifest.get("version") != REACTION_LIBRARY_VERSION or manifest.get("settings") != json.loads(json.dumps(settings)):
+                    return None
+
+                sources = manifest["files"]
+                if set(sources) != {p.name for p in files}:
+                    return None
+                for p in files:
+                    size, mtime_ns, digest = sources[p.name]
+                    stat = p.stat()
+                    if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns) and self._file_digest(p) != digest:
+                        return None
+
+                isotopes, half_lives, offsets = lib["isotopes"], lib["half_lives"], lib["offsets"]
+                energies, cross_sections = lib["energies"], lib["cross_sections"]
+        except Exception as e:
+            print(f"[load_reactions_from_csvs] Ignoring unreadable library {path.name}: {e}")
+            return None
+
+        # Views into the flat library arrays (no copies)
+        return {
+            str(iso): {
+                "cross_section_energy_vals": energies[start:stop],
+                "cross_section_vals": cross_sections[start:stop],
+                "half_life": float(half_life),
+            }
+            for iso, half_life, start, stop in zip(isotopes, half_lives, offsets[:-1], offsets[1:])
+        }
+
+
 
+    @instrumented("compute_activities")
     def compute_activities_for_multiple_isotopes(self):
         """
         Compute activities for multiple isotopes produced in a target.
@@ -297,55 +522,348 @@ class Yield:
         Total activity for each isotope is calculated as the sum of the contrubutions 
         from all slices in the target material.
 
+        The cross-sections of all isotopes are interpolated into a single
+        (isotopes x slices) matrix with `cross_section_matrix`, so the slice activities
+        of every isotope come from one array expression. If a beam history
+        (`beam_times`, `beam_intensities`) is set, it replaces the constant
+        `projectile_intensity` over `t_irrad`.
+
         Returns
         -------
         dict[str, dict]
             Mapping from isotope name to its computed data, including:
-                - "slice_thicknesses" : list[float]
+                - "slice_thicknesses" : numpy.ndarray
                     Thickness of each slice (cm).
-                - "areal_densities" : list[float]
+                - "areal_densities" : numpy.ndarray
                     Atomic areal density of each slice (atoms/cm²).
-                - "cross_sections" : list[float]
+                - "cross_sections" : numpy.ndarray
                     Interpolated cross-sections for each slice (cm²).
-                - "activities" : list[float]
+                - "activities" : numpy.ndarray
                     Activity produced in each slice (Bq).
                 - "total_activity" : float
                     Sum of slice activities (Bq).
         """
         # Step 1: Break target into slices and get energies per slice
-        slices, slice_energies = self.break_target_into_slices()
-
-        # Compute atomic areal density for each slice using the TARGET material
-        N_list = self.compute_areal_density(slices)
-
-        # Store results for each isotope
-        results = {}
+        with stage(self.instrument, "slicing"):
+            slices, slice_energies = self.break_target_into_slices()
 
-        for isotope, data in self.reactions.items():
-            cross_section_energy_vals = data['cross_section_energy_vals']
-            cross_section_vals = data['cross_section_vals']
-            half_life = data['half_life']
+            # Compute atomic areal density for each slice using the TARGET material
+            N_list = self.compute_areal_density(slices)
 
-            # Step 2: Interpolate cross-section values for slice energies
-            sigma_list = self.interpolate_cross_sections(slice_energies, cross_section_energy_vals, cross_section_vals)
+        # Step 2: Interpolate cross-section values of all isotopes (isotopes x slices)
+        with stage(self.instrument, "cross_sections"):
+            isotopes, sigma = self.cross_section_matrix(slice_energies)
+        half_lives = [self.reactions[isotope]['half_life'] for isotope in isotopes]
 
-            # Step 3: Compute activity for each slice
-            activities = self.calculate_slice_activities(N_list, sigma_list, self.projectile_intensity, half_life, self.t_irrad)
+        # Step 3: Compute activity for each slice of every isotope
+        with stage(self.instrument, "slice_activities"):
+            if self.beam_intensities is not None:
+                activities = self.calculate_slice_activities_from_history(N_list, sigma, half_lives)
+            else:
+                activities = self.calculate_slice_activities(N_list, sigma, self.projectile_intensity, half_lives, self.t_irrad)
+            totals = activities.sum(axis=1)  # Sum across slices
 
-            # Store results for this isotope
+        # Store results for each isotope
+        results = {}
+        for row, isotope in enumerate(isotopes):
             results[isotope] = {
                 "slice_thicknesses": slices,
                 "areal_densities": N_list,
-                "cross_sections": sigma_list,
-                "activities": activities,
-                "total_activity": sum(activities)  # Sum across slices
+                "cross_sections": sigma[row],
+                "activities": activities[row],
+                "total_activity": float(totals[row]),
             }
 
-            self.results = results
-
+        self.results = results
         return results
+
+
+    @instrumented("sweep")
+    def sweep_activities(self, E0=None, target_thickness=None, projectile_intensity=None, t_irrad=None) -> pd.Series:
+        """
+        Compute total EoB activities of every isotope over a grid of irradiation parameters.
+
+        Each parameter accepts a scalar or an array of values; parameters left as None
+        use the corresponding attribute of the instance. The result covers the full
+        product of all values, evaluated with array broadcasting:
+
+        - The target is sliced once per beam energy. Thinner targets reuse the slices
+          of the thickest one, cut at their own thickness (the last slice clipped).
+        - Cross-sections are interpolated once per beam energy for all isotopes.
+        - Beam current and irradiation time only scale the per-isotope slice sums,
+          ``I * (1 - exp(-λ t))``, so they add no slicing or interpolation work.
+
+        The sweep assumes a constant beam; ``beam_times``/``beam_intensities`` are not used.
+
+        Parameters
+        ----------
+        E0 : float or array-like, optional
+            Incident ion energies (MeV).
+        target_thickness : float or array-like, optional
+            Target thicknesses (cm).
+        projectile_intensity : float or array-like, optional
+            Beam intensities (particles/s).
+        t_irrad : float or array-like, optional
+            Irradiation times (s).
+
+        Returns
+        -------
+        pandas.Series
+            Total activity (Bq), indexed by the product of
+            ``["isotope", "E0", "target_thickness", "projectile_intensity", "t_irrad"]``
+            in input order, so ``result.to_numpy().reshape(n_isotopes, len(E0), ...)``
+            gives the N-dimensional array. Also stored in ``self.sweep_results``.
+            A single point matches ``compute_activities_for_multiple_isotopes``.
+
+        Raises
+        ------
+        ValueError
+            If ``self.reactions`` is empty.
+        """
+        if not self.reactions:
+            raise ValueError("self.reactions is empty. Run load_reactions_from_csvs() first.")
+
+        def axis(values, default):
+            return np.atleast_1d(np.asarray(default if values is None else values, dtype=float))
+
+        E0s = axis(E0, self.E0)
+        thicknesses = axis(target_thickness, self.target_thickness)
+        intensities = axis(projectile_intensity, self.projectile_intensity)
+        t_irrads = axis(t_irrad, self.t_irrad)
+
+        isotopes = list(self.reactions)
+        decay_constants = np.array([np.log(2) / self.reactions[iso]["half_life"] for iso in isotopes])
+
+        # Per-isotope sum of N * sigma over the slices, for every (E0, thickness)
+        slice_sums = np.zeros((len(isotopes), len(E0s), len(thicknesses)))
+        depths_requested = np.clip(thicknesses, 0, None)
+        for i, energy in enumerate(E0s):
+            slices, energies = self._energy_slices(energy)
+            if slices.size == 0:
+                continue
+
+            _, sigma = self.cross_section_matrix(energies)
+            per_slice = sigma * self.compute_areal_density(slices)
+            slice_sums[:, i, :] = self._slice_sums_to_depths(per_slice, slices, depths_requested)
+
+        saturation = 1 - np.exp(-decay_constants[:, None] * t_irrads[None, :])
+        activities = (slice_sums[:, :, :, None, None]
+                      * intensities[None, None, None, :, None]
+                      * saturation[:, None, None, None, :])
+
+        index = pd.MultiIndex.from_product([isotopes, E0s, thicknesses, intensities, t_irrads],
+                                           names=["isotope", "E0", "target_thickness", "projectile_intensity", "t_irrad"])
+        self.sweep_results = pd.Series(activities.ravel(), index=index, name="total_activity")
+        return self.sweep_results
+
+
+    @instrumented("activities_after_eob")
+    def activities_after_eob(self, times, chains: Iterable[Iterable[str]] = (), branching: Mapping[tuple, float] | None = None) -> pd.DataFrame:
+        """
+        Activities of the produced isotopes after end of bombardment, including ingrowth.
+
+        Total EoB activities from ``compute_activities_for_multiple_isotopes`` are decayed
+        with ``nuclab.decay.bateman_activities``. Isotopes listed in ``chains`` feed each
+        other (e.g., ``[["155Dy", "155Tb"]]``); all other isotopes decay on their own.
+        An isotope appearing in several chains starts with its EoB activity in the first
+        one only, and its activities from all chains are summed.
+
+        Parameters
+        ----------
+        times : float or array-like
+            Times after EoB (s).
+        chains : iterable of list[str], optional
+            Decay chains as isotope names, parent first. Every member needs a
+            ``half_life`` in ``self.reactions``.
+        branching : dict[tuple[str, str], float], optional
+            Branching ratio per ``(parent, daughter)`` link. Defaults to 1.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Activities (Bq), indexed by time after EoB (s), one column per isotope.
+
+        Raises
+        ------
+        ValueError
+            If ``self.results`` is empty.
+        KeyError
+            If a chain member has no half-life in ``self.reactions``.
+        """
+        if not self.results:
+            raise ValueError("self.results is empty. Run compute_activities_for_multiple_isotopes() first.")
+
+        branching = branching or {}
+        chains = [list(chain) for chain in chains]
+        in_chain = {isotope for chain in chains for isotope in chain}
+        chains += [[isotope] for isotope in self.results if isotope not in in_chain]
+
+        # Each isotope starts with its EoB activity in the first chain it appears in
+        seeded = set()
+        initial = []
+        for chain in chains:
+            A0 = []
+            for isotope in chain:
+                A0.append(self.results[isotope]["total_activity"] if isotope in self.results and isotope not in seeded else 0.0)
+                seeded.add(isotope)
+            initial.append(A0)
+
+        half_lives = [[self.reactions[isotope]["half_life"] for isotope in chain] for chain in chains]
+        ratios = [[branching.get((p, d), 1.0) for p, d in zip(chain[:-1], chain[1:])] for chain in chains]
+        activities = bateman_activities(half_lives, initial, times, branching=ratios)
+
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        out = pd.DataFrame(0.0, index=pd.Index(times, name="time after EoB (s)"), columns=list(dict.fromkeys(
+            isotope for chain in chains for isotope in chain)))
+        for c, chain in enumerate(chains):
+            for i, isotope in enumerate(chain):
+                out[isotope] += activities[c, i]
+        return out
+
+
+    @staticmethod
+    def _slice_sums_to_depths(per_slice, slices, depths):
+        """
+        Sum ``per_slice`` (isotopes x slices) over the slices in front of each depth (cm).
+
+        Slices are cut at each depth, the one containing it contributing the fraction
+        inside; the result is ``(n_isotopes, len(depths))``.
+        """
+        # Sums over the first j slices and the depth in front of slice j
+        cumulative = np.concatenate([np.zeros((per_slice.shape[0], 1)), np.cumsum(per_slice, axis=1)], axis=1)
+        depth = np.concatenate(([0.0], np.cumsum(slices)))
+
+        # Slice in which each depth ends, and the fraction of it inside the target
+        m = np.searchsorted(depth[1:], depths, side="left")
+        inside = m < slices.size
+        last = np.minimum(m, slices.size - 1)
+        fraction = np.where(inside, np.clip((depths - depth[last]) / slices[last], 0, 1), 0.0)
+
+        return cumulative[:, np.minimum(m, slices.size)] + per_slice[:, last] * fraction
+
+
+    @instrumented("monte_carlo")
+    def monte_carlo_activities(self, n_samples: int = 10000, cross_section_unc: float | Mapping[str, float] = 0.0,
+                               range_unc: float = 0.0, density_unc: float = 0.0, intensity_unc: float = 0.0,
+                               thickness_unc: float = 0.0, percentiles: Iterable[float] = (2.5, 50, 97.5),
+                               chunk_size: int = 10000, seed: int | None = None, return_samples: bool = False) -> dict:
+        """
+        Propagate input uncertainties to the total EoB activities by Monte Carlo.
+
+        Every sample scales the inputs by independent normal factors ``1 + u * z`` (clipped
+        at zero), where ``u`` is the fractional 1σ uncertainty of that input:
+
+        - cross-sections, one normalization per isotope;
+        - SRIM projected ranges (all slice thicknesses scale together);
+        - target density, beam intensity (or the whole beam history) and target thickness.
+
+        The target is sliced and the cross-section matrix built once. Because a range
+        scale ``r`` turns a thickness ``T`` into ``r * S(T / r)`` of the nominal
+        cumulative slice sums ``S``, each chunk of samples is evaluated exactly as
+        ``(samples x isotopes)`` array operations with no per-sample re-slicing.
+        Samples are generated and evaluated ``chunk_size`` at a time to bound memory.
+
+        Parameters
+        ----------
+        n_samples : int, optional
+            Number of Monte Carlo samples. Default is 10 000.
+        cross_section_unc : float or dict[str, float], optional
+            Fractional cross-section uncertainty, for all isotopes or per isotope
+            (missing isotopes get 0).
+        range_unc, density_unc, intensity_unc, thickness_unc : float, optional
+            Fractional uncertainties of the SRIM ranges, target density, beam intensity
+            and target thickness. Default 0.
+        percentiles : iterable of float, optional
+            Percentiles (0-100) reported per isotope. Default (2.5, 50, 97.5).
+        chunk_size : int, optional
+            Samples evaluated per chunk. Default is 10 000.
+        seed : int, optional
+            Seed for ``numpy.random.default_rng``, for reproducible samples.
+        return_samples : bool, optional
+            If True, also return the ``(n_samples, n_isotopes)`` sampled activities.
+
+        Returns
+        -------
+        dict
+            With keys:
+                - "summary" : pandas.DataFrame, per isotope the nominal, mean, standard
+                  deviation and requested percentiles of the total activity (Bq).
+                - "correlation" : pandas.DataFrame, isotope x isotope correlation matrix.
+                - "samples" : numpy.ndarray, only if ``return_samples`` is True.
+            Also stored in ``self.mc_results``.
+
+        Raises
+        ------
+        ValueError
+            If ``self.reactions`` is empty.
+        """
+        if not self.reactions:
+            raise ValueError("self.reactions is empty. Run load_reactions_from_csvs() first.")
+
+        slices, energies = self._energy_slices(self.E0)
+        isotopes, sigma = self.cross_section_matrix(energies)
+        half_lives = np.array([self.reactions[isotope]["half_life"] for isotope in isotopes])
+        per_slice = sigma * self.compute_areal_density(slices)
+
+        # Nominal beam term per isotope: I * (1 - exp(-λ t)), or the logged history
+        if self.beam_intensities is not None:
+            saturation = beam_history_saturation(self.beam_times, self.beam_intensities, half_lives, t_end=self.t_irrad)
+        else:
+            saturation = self.projectile_intensity * (1 - np.exp(-np.log(2) / half_lives * self.t_irrad))
+
+        if isinstance(cross_section_unc, Mapping):
+            xs_unc = np.array([float(cross_section_unc.get(isotope, 0.0)) for isotope in isotopes])
+        else:
+            xs_unc = np.full(len(isotopes), float(cross_section_unc))
+
+        def slice_sums(depths):
+            if slices.size == 0:
+                return np.zeros((len(isotopes), len(depths)))
+            return self._slice_sums_to_depths(per_slice, slices, depths)
+
+        nominal = slice_sums(np.array([max(self.target_thickness, 0.0)]))[:, 0] * saturation
+
+        rng = np.random.default_rng(seed)
+        samples = np.empty((n_samples, len(isotopes)))
+        for start in range(0, n_samples, chunk_size):
+            n = min(chunk_size, n_samples - start)
+            xs_scale = np.clip(1 + xs_unc * rng.standard_normal((n, len(isotopes))), 0, None)
+            range_scale, density_scale, intensity_scale, thickness_scale = (
+                np.clip(1 + u * rng.standard_normal(n), 0, None)
+                for u in (range_unc, density_unc, intensity_unc, thickness_unc)
+            )
+
+            # Depth in nominal-range units reached by each sampled target
+            with np.errstate(divide="ignore", invalid="ignore"):
+                depths = np.clip(self.target_thickness * thickness_scale / range_scale, 0, None)
+            depths = np.nan_to_num(depths, nan=0.0, posinf=np.inf)
+
+            samples[start:start + n] = (xs_scale
+                                        * (range_scale * density_scale * intensity_scale)[:, None]
+                                        * slice_sums(depths).T
+                                        * saturation[None, :])
+
+        percentiles = list(percentiles)
+        summary = pd.DataFrame({
+            "Isotope": isotopes,
+            "Nominal Activity (Bq)": nominal,
+            "Mean Activity (Bq)": samples.mean(axis=0),
+            "Std Activity (Bq)": samples.std(axis=0, ddof=1) if n_samples > 1 else np.nan,
+        })
+        for q, values in zip(percentiles, np.percentile(samples, percentiles, axis=0)):
+            summary[f"P{q:g} Activity (Bq)"] = values
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.corrcoef(samples, rowvar=False) if n_samples > 1 else np.full((len(isotopes),) * 2, np.nan)
+        correlation = pd.DataFrame(np.atleast_2d(correlation), index=isotopes, columns=isotopes)
+
+        self.mc_results = {"summary": summary, "correlation": correlation}
+        if return_samples:
+            self.mc_results["samples"] = samples
+        return self.mc_results
     
 
+    @instrumented("write_excel")
     def save_results_to_excel(self, filepath: str | Path = "isotope_results.xlsx", include_summary: bool = True) -> str:
         """
         Save computed isotope yields to an Excel workbook.
@@ -430,6 +948,88 @@ class Yield:
                 )
 
         return str(out.resolve())
+
+
+    def results_frame(self) -> pd.DataFrame:
+        """
+        Return ``self.results`` as one long table, one row per (isotope, slice).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Columns of ``nuclab.columnar.YIELD_RESULTS_SCHEMA``: ``Isotope``, ``Slice``,
+            ``Slice Thickness (cm)``, ``Areal Density (atoms/cm²)``, ``Cross Section`` and
+            ``Activity (Bq)``.
+        """
+        if not self.results:
+            raise ValueError("self.results is empty. Run compute_activities_for_multiple_isotopes() first.")
+
+        frames = []
+        for isotope, data in self.results.items():
+            n = len(data["activities"])
+            frames.append(pd.DataFrame({
+                "Isotope": isotope,
+                "Slice": np.arange(n),
+                "Slice Thickness (cm)": np.asarray(data["slice_thicknesses"], dtype=float),
+                "Areal Density (atoms/cm²)": np.asarray(data["areal_densities"], dtype=float),
+                "Cross Section": np.asarray(data["cross_sections"], dtype=float),
+                "Activity (Bq)": np.asarray(data["activities"], dtype=float),
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+
+    @instrumented("write_table")
+    def export_results(self, path: str | Path = "isotope_results.parquet", partition_by: str | None = None,
+                       format: str | None = None) -> str:
+        """
+        Save ``self.results`` as Parquet or Feather (see :meth:`results_frame`).
+
+        Parameters
+        ----------
+        path : str or Path, optional
+            Output ``.parquet`` or ``.feather`` file, or a directory with ``partition_by``.
+        partition_by : str, optional
+            E.g. ``"Isotope"`` for one partition per isotope.
+        format : {"parquet", "feather"}, optional
+            Default is taken from the suffix of ``path``.
+
+        Returns
+        -------
+        str
+            The path written.
+
+        Notes
+        -----
+        Requires ``pyarrow``. :meth:`save_results_to_excel` remains available for an
+        Excel view of the same data.
+        """
+        return write_table(self.results_frame(), path, YIELD_RESULTS_SCHEMA, partition_by=partition_by, format=format)
+
+
+    @instrumented("read_table")
+    def load_results(self, path: str | Path) -> dict[str, dict]:
+        """
+        Load results saved by :meth:`export_results` back into ``self.results``.
+
+        Returns
+        -------
+        dict[str, dict]
+            The same layout as :meth:`compute_activities_for_multiple_isotopes`
+            (including ``total_activity``).
+        """
+        df = read_table(path, YIELD_RESULTS_SCHEMA, categorical=False)
+        results = {}
+        for isotope, g in df.sort_values("Slice", kind="stable").groupby("Isotope", sort=False):
+            activities = g["Activity (Bq)"].to_numpy(float)
+            results[isotope] = {
+                "slice_thicknesses": g["Slice Thickness (cm)"].to_numpy(float),
+                "areal_densities": g["Areal Density (atoms/cm²)"].to_numpy(float),
+                "cross_sections": g["Cross Section"].to_numpy(float),
+                "activities": activities,
+                "total_activity": float(activities.sum()),
+            }
+        self.results = results
+        return results
     
 
     
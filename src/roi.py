@@ -0,0 +1,294 @@
+import datetime as dtm
+
+import numpy as np
+import pandas as pd
+
+
+class ROIFitter:
+    """
+    Fit only fixed windows (regions of interest) around the requested gamma lines.
+
+    CURIE's ``Spectrum.fit_peaks`` starts every fit with work over the whole
+    spectrum (SNIP background, a forward fit of all lines) and evaluates the
+    efficiency calibration and its uncertainty for every multiplet. In ROI mode each
+    requested line gets a window of ``width`` peak widths (sigma, from the
+    resolution calibration) either side of its centroid, overlapping windows are
+    merged into multiplets, and every multiplet is fitted with a local linear
+    background and CURIE's own peak shape. The cost per spectrum then grows with the
+    number of lines rather than the number of channels.
+
+    The peak table has the same columns as ``fit_peaks`` (``counts``,
+    ``unc_counts``, ``chi2``, ...), and the fits are left on the spectrum in CURIE's
+    layout (with ``bg="linear"``), so ``sp.plot()`` and ``sp.saveas()`` draw them.
+    ROI mode is not equivalent to the full fit: it can report different counts and
+    a different set of lines (see Notes).
+
+    Parameters
+    ----------
+    width : float, optional
+        Half-width of each window in peak widths (sigma). Default is the
+        ``pk_width`` of the fit configuration (7.5 in CURIE).
+    edge : int, optional
+        Number of channels at each end of a window used for the initial estimate of
+        the local background. Default is 3.
+    min_significance : float, optional
+        Significance (in standard deviations) of the net counts a line must also
+        show in the spectrum to be fitted. Default is 2.
+
+    Notes
+    -----
+    Only the lines in ``gammas`` are fitted (``sp.isotopes`` is ignored). As in
+    ``fit_peaks``, a line is kept if the peak height predicted for it exceeds
+    ``SNR_min`` times the Poisson noise of the background under it. The prediction
+    is a local version of CURIE's forward fit: one scale per isotope, fitted to the
+    net heights measured in the windows, times efficiency × intensity / width. A
+    line must in addition be seen in the spectrum: its net counts within ±2 peak
+    widths must exceed ``min_significance`` standard deviations. Lines that are
+    predicted but absent (e.g., 154Tb 426.78 keV in the example data, which
+    ``fit_peaks`` reports within 1.5σ of zero) are not fitted, and neither is a
+    feature that is seen but not predicted (e.g., a background line at 778.9 keV in
+    the 2-hour example series, which does not decay like 152Tb). Weak lines near the
+    thresholds may therefore be fitted in some spectra of a series and not in
+    others, and the decay groups can differ from those of the full fit. Dropped
+    lines are logged like in ``fit_peaks`` (each at DEBUG, a summary at INFO, and a
+    WARNING for an isotope with no line left).
+
+    The ``bg`` option of the fit configuration is replaced by a linear background;
+    the other options (``R``, ``alpha``, ``step``, ``skew_fit``, ``step_fit``,
+    ``mu_bound``, ``sig_bound``, ``multi_max``, ...) apply as usual. Peaks that are
+    not in ``gammas`` but fall inside a window are not modelled and bias the local
+    background; in crowded regions (e.g., X-rays, unresolved calibration doublets)
+    list them in ``gammas`` or use the full fit.
+
+    On the example data the fitted counts of the lines both fits report agree within
+    about 2σ, except 152Tb 344.28 keV in the late 2-hour spectra (up to 3σ lower,
+    with chi2/dof ≈ 10 in both fits) and 155Tb 262.27 keV in the 5/10-minute series
+    and the first 2-hour spectra. At 262.27 keV the peak is ~27 times what 155Tb's
+    other lines predict: the full fit's amplitude stops at CURIE's upper bound (10×
+    the prediction, chi2/dof ≈ 250), while the ROI fit follows the data (chi2/dof ≈
+    1.3) with 2.7 times the counts. Most of that peak is probably another line, so
+    neither count should be taken as 155Tb. Check lines with a large chi2 in either
+    fit, or far above their prediction, against the data.
+
+    The fits use CURIE's peak model and its helpers on ``Spectrum`` (``_multiplet``,
+    ``_chi2``, ``_counts``, ``cb._map_channel_f``). With a CURIE that lacks them,
+    ``fit_peaks`` prints a message and falls back to ``sp.fit_peaks``.
+    """
+
+    def __init__(self, width: float | None = None, edge: int = 3, min_significance: float = 2.0):
+        self.width = width
+        self.edge = edge
+        self.min_significance = min_significance
+
+
+    @property
+    def config(self) -> dict:
+        """Options that change the fitted peaks (part of the peak cache key)."""
+        return {"roi_width": self.width, "roi_edge": self.edge, "roi_min_significance": self.min_significance}
+
+
+    def windows(self, sp, gammas: pd.DataFrame) -> list[pd.DataFrame]:
+        """
+        Build the merged fit windows of ``sp`` for the lines in ``gammas``.
+
+        Returns
+        -------
+        list[pandas.DataFrame]
+            One frame per multiplet, sorted by energy, with the gamma columns plus
+            ``idx``/``idxf`` (centroid channel), ``sig`` (width in channels), ``l``/``h``
+            (window), ``bg0``/``bg1`` (initial linear background), ``A`` (initial
+            peak height) and ``SNR`` (predicted). Lines outside the spectrum, below
+            ``SNR_min`` or below ``min_significance`` are dropped (and logged as by
+            CURIE).
+        """
+        cfg = sp.fit_config
+        width = cfg["pk_width"] if self.width is None else self.width
+        hist = np.asarray(sp.hist, dtype=float)
+        L = len(hist)
+
+        df = pd.DataFrame(gammas, copy=True).sort_values("energy").reset_index(drop=True)
+        df["intensity"] *= 1E-2
+        df["unc_intensity"] *= 1E-2
+        df["idxf"] = np.atleast_1d(sp.cb._map_channel_f(df["energy"].to_numpy(float)))
+        df["idx"] = np.rint(df["idxf"]).astype(np.int32)
+        df["sig"] = np.atleast_1d(sp.cb.res(df["idx"].to_numpy()))
+        df["l"] = (df["idx"] - width * df["sig"]).astype(np.int32)
+        df["h"] = (df["idx"] + width * df["sig"]).astype(np.int32)
+        if getattr(sp, "_fit_stats", None) is not None:
+            sp._fit_stats["candidates"] = df["isotope"].value_counts().to_dict()
+        df = _log_dropped(sp, df, (df["l"] > 0) & (df["h"] < L), "edge",
+                          lambda rw: "dropped {0} {1:.1f} keV: fit window [{2}..{3}] extends past spectrum edge "
+                                     "({4} channels)".format(rw["isotope"], rw["energy"], rw["l"], rw["h"], L))
+        if df.empty:
+            return []
+
+        # Local linear background through the mean counts at both ends of each line's window
+        lo = np.array([hist[l:l + self.edge].mean() for l in df["l"]])
+        hi = np.array([hist[h - self.edge:h].mean() for h in df["h"]])
+        x_lo, x_hi = df["l"] + 0.5 * (self.edge - 1), df["h"] - 0.5 * (self.edge + 1)
+        df["bg1"] = (hi - lo) / (x_hi - x_lo)
+        df["bg0"] = lo - df["bg1"] * x_lo
+
+        # Background under each centroid from the outer ends of its group of overlapping
+        # windows, since the ends of a line's own window can sit on a neighbouring peak
+        bg = np.zeros(len(df))
+        for group in _overlapping(df["l"].to_numpy(), df["h"].to_numpy()):
+            first, last = group[0], group[-1]
+            slope = (hi[last] - lo[first]) / (x_hi.iloc[last] - x_lo.iloc[first])
+            bg[group] = lo[first] + slope * (df["idx"].iloc[group] - x_lo.iloc[first])
+        bg = np.maximum(bg, 0.0)
+
+        # Net height at the centroid (averaged over +/- 1 channel)
+        top = np.array([hist[i - 1:i + 2].mean() for i in df["idx"]])
+        height = top - bg
+        df["A"] = np.maximum(height, 1.0)
+
+        # Height predicted from the isotope's lines, as CURIE's forward fit: B * eff * I / sig
+        norm = np.atleast_1d(sp.cb.eff(df["energy"].to_numpy(float))) * (df["intensity"] / df["sig"]).to_numpy()
+        predicted = np.zeros(len(df))
+        for _, rows in df.groupby("isotope", sort=False).indices.items():
+            scale = np.dot(norm[rows], height[rows]) / max(np.dot(norm[rows], norm[rows]), 1e-300)
+            predicted[rows] = max(scale, 0.0) * norm[rows]
+        df["SNR"] = predicted / np.sqrt(np.maximum(bg, 1.0))
+
+        # Significance of the net counts within +/- 2 peak widths (linear background)
+        cum = np.concatenate([[0.0], np.cumsum(hist)])
+        half = np.maximum(np.rint(2.0 * df["sig"].to_numpy()), 1).astype(int)
+        lo_c, hi_c = df["idx"].to_numpy() - half, df["idx"].to_numpy() + half + 1
+        gross = cum[hi_c] - cum[lo_c]
+        df["significance"] = (gross - (2 * half + 1) * bg) / np.sqrt(np.maximum(gross, 1.0))
+        df = _log_dropped(sp, df, df["SNR"] > cfg["SNR_min"], "snr",
+                          lambda rw: "dropped {0} {1:.1f} keV: SNR {2:.1f} < SNR_min {3}".format(
+                              rw["isotope"], rw["energy"], rw["SNR"], cfg["SNR_min"]))
+        df = _log_dropped(sp, df, df["significance"] > self.min_significance, "snr",
+                          lambda rw: "dropped {0} {1:.1f} keV: net counts {2:.1f} sigma < {3} (predicted SNR {4:.1f})".format(
+                              rw["isotope"], rw["energy"], rw["significance"], self.min_significance, rw["SNR"]))
+        df = df.drop(columns="significance")
+        if df.empty:
+            return []
+
+        return [df.loc[m] for m in _overlapping(df["l"].to_numpy(), df["h"].to_numpy(), cfg["multi_max"])]
+
+
+    def fit_peaks(self, sp, gammas: pd.DataFrame | None = None, **fit_config):
+        """
+        Fit the peaks of ``sp`` in ROI mode, like ``sp.fit_peaks(gammas, **fit_config)``.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            The fitted peak table (also left on ``sp``), or None if no peak was fitted.
+        """
+        if not _has_curie_internals(sp):
+            print(f"[ROI] {sp.filename}: this CURIE version lacks the peak model ROI mode uses; "
+                  "fitting the whole spectrum")
+            return sp.fit_peaks(gammas=gammas, **fit_config)
+
+        sp.fit_config = {**fit_config, "bg": "linear"}
+        sp._fit_stats = {"candidates": {}, "drops": {"snr": [], "edge": [], "intensity": [], "identical": []}}
+        multiplets = [self._fit_multiplet(sp, multi) for multi in (self.windows(sp, gammas) if gammas is not None else [])]
+        fits = [p for p in multiplets if "fit" in p]
+        failed = [p for p in multiplets if "fit" not in p]
+
+        sp._fits, sp._failed_fits = fits, failed
+        sp._peaks = self._peak_table(sp, fits) if fits else None
+        # Diagnostics and the fit summary (with dropped lines) as logged by fit_peaks
+        if hasattr(sp, "_diagnose_multiplets") and hasattr(sp, "_log_fit_summary"):
+            sp._diagnose_multiplets([(p, p["df"]) for p in multiplets])
+            sp._log_fit_summary([p["df"] for p in failed], gammas)
+        return sp._peaks
+
+
+    def _fit_multiplet(self, sp, multi: pd.DataFrame) -> dict:
+        from scipy.optimize import curve_fit
+
+        cfg = sp.fit_config
+        hist = np.asarray(sp.hist, dtype=float)
+        l, h = int(multi["l"].min()), int(multi["h"].max())
+        first, last = multi.iloc[0], multi.iloc[-1]
+
+        # Linear background from the outer ends of the merged window
+        y_l, y_h = first["bg0"] + first["bg1"] * l, last["bg0"] + last["bg1"] * h
+        bg1 = (y_h - y_l) / (h - l)
+        p = {"l": l, "h": h, "p0": [y_l - bg1 * l, bg1], "bounds": [[-np.inf, -np.inf], [np.inf, np.inf]],
+             "n_dropped": 0, "warnings": [], "istp": multi["isotope"].to_list(), "df": multi}
+
+        bA, bm, bs = 10.0 * cfg["A_bound"], 1.5 * cfg["mu_bound"], cfg["sig_bound"]
+        peak_max = max(hist[l:h].max(), 1.0)
+        for _, rw in multi.iterrows():
+            p["p0"] += [rw["A"], rw["idxf"], rw["sig"]]
+            p["bounds"][0] += [0.0, rw["idxf"] - bm * rw["sig"], rw["sig"] / (1.0 + bs)]
+            p["bounds"][1] += [bA * peak_max, rw["idxf"] + bm * rw["sig"], rw["sig"] * (1 + 0.5 * bs)]
+            if cfg["skew_fit"]:
+                p["p0"] += [cfg["R"], cfg["alpha"]]
+                p["bounds"][0] += [0.0, 0.5]
+                p["bounds"][1] += [1.0, max(2.5, cfg["alpha"])]
+            if cfg["step_fit"]:
+                p["p0"] += [cfg["step"]]
+                p["bounds"][0] += [0.0]
+                p["bounds"][1] += [0.1]
+
+        chan = np.arange(l, h)
+        try:
+            with np.errstate(all="ignore"):
+                fit, unc = curve_fit(sp._multiplet, chan, hist[l:h], p0=p["p0"], bounds=p["bounds"],
+                                     sigma=np.sqrt(hist[l:h] + 0.1), absolute_sigma=True)
+            chi2, dof = sp._chi2(fit, l, h)
+        except (ValueError, RuntimeError, np.linalg.LinAlgError) as e:
+            p["fail_msg"] = (f"peak fit failed for {', '.join(map(str, p['istp']))} "
+                             f"({', '.join(f'{E:.1f}' for E in multi['energy'])} keV): {e}")
+            print(f"[ROI] {sp.filename}: {p['fail_msg']}")
+            return p
+
+        # As CURIE: inflate the covariance by chi2/dof when it exceeds 1, never deflate
+        if np.isfinite(chi2) and chi2 > 1.0:
+            unc = unc * chi2
+        p.update(fit=fit, unc=unc, chi2=chi2, dof=dof)
+        return p
+
+
+    def _peak_table(self, sp, fits: list[dict]) -> pd.DataFrame:
+        """CURIE's peak table for ``fits``, evaluating the efficiency once per spectrum."""
+        counts = [sp._counts(p["fit"], p["unc"]) for p in fits]
+        f = pd.concat([p["df"] for p in fits], ignore_index=True)
+        N = np.concatenate([c[0] for c in counts])
+        unc_N = np.concatenate([c[1] for c in counts])
+        chi2 = np.concatenate([np.full(len(p["df"]), p["chi2"]) for p in fits])
+
+        energy = f["energy"].to_numpy(float)
+        eff, unc_eff = np.atleast_1d(sp.cb.eff(energy)), np.atleast_1d(sp.cb.unc_eff(energy))
+        D = N / (f["intensity"] * eff * (sp.live_time / sp.real_time))
+        unc_D = D * np.sqrt((unc_N / N) ** 2 + (unc_eff / eff) ** 2 + (f["unc_intensity"] / f["intensity"]) ** 2)
+
+        return pd.DataFrame({"filename": sp.filename, "isotope": f["isotope"], "energy": f["energy"],
+                             "counts": N, "unc_counts": unc_N, "intensity": f["intensity"],
+                             "unc_intensity": f["unc_intensity"], "efficiency": eff, "unc_efficiency": unc_eff,
+                             "decays": D, "unc_decays": unc_D, "decay_rate": D / sp.real_time,
+                             "unc_decay_rate": unc_D / sp.real_time, "chi2": chi2,
+                             "start_time": dtm.datetime.strftime(sp.start_time, "%m/%d/%Y %H:%M:%S"),
+                             "live_time": sp.live_time, "real_time": sp.real_time,
+                             "effcal": ",".join("{:.9g}".format(p) for p in sp.cb.effcal)})
+
+
+def _overlapping(l: np.ndarray, h: np.ndarray, max_size: int | None = None) -> list[list[int]]:
+    """Group consecutive windows ``[l, h)`` (sorted by centroid) that overlap, at most ``max_size`` per group."""
+    groups = [[0]]
+    for n in range(1, len(l)):
+        if l[n] < h[groups[-1][-1]] and (max_size is None or len(groups[-1]) < max_size):
+            groups[-1].append(n)
+        else:
+            groups.append([n])
+    return groups
+
+
+def _has_curie_internals(sp) -> bool:
+    """True if ``sp`` has the CURIE helpers ROI mode fits with."""
+    return (all(hasattr(sp, name) for name in ("_multiplet", "_chi2", "_counts"))
+            and hasattr(sp.cb, "_map_channel_f"))
+
+
+def _log_dropped(sp, df: pd.DataFrame, keep, key: str, msg) -> pd.DataFrame:
+    """Drop the rows of ``df`` not in ``keep``, logging each as CURIE's ``fit_peaks`` does."""
+    if hasattr(sp, "_log_dropped"):
+        return sp._log_dropped(df, keep, key, msg)
+    return df[keep].reset_index(drop=True)
@@ -1,19 +1,26 @@
 import os
-
-import curie as ci
-from nuclab.utils import fit_decay
+import copy
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from nuclab.decay import exp_decay, fit_exponential_decays, fit_parent_feeding, parent_feeding_decay
+from nuclab.cache import PeakCache, fit_spectrum, fit_spectrum_peaks, preload_spectrum
+from nuclab.instrumentation import Instrumentation, instrumented, stage
+from nuclab.spectra import detector_slot, list_spectrum_files, load_spectrum, resolve_spectrum_path
+from nuclab.plotting import fit_plot_job, render_plots
+from nuclab.sinks import MemorySink
+from nuclab.roi import ROIFitter
+from nuclab.summing import AdaptiveSumming, effective_decay_time, sum_spectra
+from nuclab.efficiency import EfficiencyTable
+from nuclab.prefetch import ReadAhead
+from nuclab.columnar import DECAY_RESULTS_SCHEMA, PEAK_DATA_SCHEMA, read_table, write_table
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from typing import Callable, Optional, Dict
-
-from pathlib import Path
-
 from pathlib import Path
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
 class Serial:
@@ -30,8 +37,8 @@ class Serial:
     Parameters
     ----------
     data_directory : str
-        Path to the directory containing `.Spe` spectrum files. Files must follow
-        the expected naming convention.
+        Path to the directory containing `.Spe` (and/or `.Chn`) spectrum files. Files
+        must follow the expected naming convention.
     efficiency_fit_params : list
         Parameters passed to the efficiency function used during spectrum analysis, 
         e.g., coefficients of an empirical efficiency curve.
@@ -44,6 +51,47 @@ class Serial:
         ``["energy", "intensity", "unc_intensity", "isotope"]`` with energies in keV.
     half_lives : dict of float to float
         Mapping from gamma energy (keV) to half-life (s) for all entries in the `gamma` DataFrame.
+    fit_config : dict, optional
+        Keyword options forwarded to CURIE's ``Spectrum.fit_peaks`` (e.g., ``SNR_min``, ``bg``).
+    peak_cache : PeakCache or str, optional
+        On-disk cache of raw peak fits (or a directory for one). On a cache hit only the
+        efficiency, activity and EoB columns are recomputed. Default is None (no caching).
+    prefer_chn : bool, optional
+        If True (default), read the binary `.Chn` saved alongside a `.Spe` file when it
+        exists; it is smaller and is read without text parsing.
+    parent_feeding : dict[str, dict], optional
+        Daughter isotopes to fit with the parent-feeding decay model in
+        ``process_decay_data``, e.g. ``{"155Tb": {"parent": "155Dy", "half_life": 9.9 * 3600,
+        "branching": 1.0}}`` (``half_life`` of the parent in s; ``branching`` defaults to 1).
+    instrument : Instrumentation or bool, optional
+        Records wall time and CPU time of every stage (per file where it applies), and
+        peak memory with ``Instrumentation(memory=True)``. True creates a new
+        ``Instrumentation`` (timings only). Default is None (disabled).
+    roi : ROIFitter or bool, optional
+        Fit only windows around the lines in ``gammas``, each with a local linear
+        background, instead of the whole spectrum (see ``ROIFitter``). True creates a
+        new ``ROIFitter``. Default is False.
+    summing : AdaptiveSumming or bool, optional
+        Sum consecutive low-count spectra channel by channel until the monitored
+        lines reach a target net count or uncertainty, and fit only the sums (see
+        ``AdaptiveSumming``). Rows of a summed spectrum carry the first file's name,
+        the total live time and a per-line effective decay time, plus the
+        ``summed files`` and ``n_summed`` columns. Summed spectra are not cached.
+        True creates a new ``AdaptiveSumming``. Default is None (every spectrum is
+        fitted on its own).
+    efficiency : EfficiencyTable, optional
+        Precomputed efficiency curve (``Calibration.efficiency_table()``). When given,
+        it replaces ``efficiency_func``/``efficiency_fit_params``, and each line's
+        efficiency uncertainty comes from the covariance of the calibration fit at
+        its energy instead of ``detector_eff_uncertainty``; it is reported in the
+        ``uncertainty detector efficiency`` column. The table's slot is used as the
+        calibration slot when it has one. Default is None.
+    read_ahead : ReadAhead or bool, optional
+        Read and parse the next spectra in background threads while the current one
+        is fitted, holding at most ``read_ahead.depth`` of them, the current one
+        included (see ``ReadAhead``). With ``workers``, the parsed spectra are sent to
+        the pool and those in flight count against ``prefetch`` instead. True creates a
+        new ``ReadAhead``. Default is False (each file is read when it is fitted).
 
     Attributes
     ----------
@@ -51,10 +99,29 @@ class Serial:
         Fitted peak data from processed spectra w/ metadata.
     decay_results : pandas.DataFrame
         Per-(isotope, energy) summary of results.
+    failed_files : dict[str, str]
+        Mapping from filename to error message for spectra that could not be
+        processed in the last call to ``process_spectrum_files``.
+    plot_jobs : list[dict]
+        Plots recorded with ``defer_plots=True`` that have not been rendered yet
+        (see :meth:`render_plots`).
+    instrument : Instrumentation or None
+        Stage timings, if enabled (``instrument.report()`` / ``instrument.summary()``).
+    roi : ROIFitter or None
+        ROI-mode peak fitter, if enabled.
+    summing : AdaptiveSumming or None
+        Adaptive summing of low-count spectra, if enabled.
+    read_ahead : ReadAhead or None
+        Background read-ahead of spectrum files, if enabled.
     """
 
     def __init__(self, data_directory: str = None, efficiency_fit_params: list = None, detector_eff_uncertianty: float = None,
-                 eob_time: datetime =None, gammas: pd.DataFrame = None, half_lives: dict[float, float] = None):
+                 eob_time: datetime =None, gammas: pd.DataFrame = None, half_lives: dict[float, float] = None,
+                 fit_config: dict | None = None, peak_cache: PeakCache | str | None = None,
+                 prefer_chn: bool = True, parent_feeding: dict[str, dict] | None = None,
+                 instrument: Instrumentation | bool | None = None,
+                 roi: ROIFitter | bool = False, summing: AdaptiveSumming | bool | None = None,
+                 efficiency: EfficiencyTable | None = None, read_ahead: ReadAhead | bool = False):
         
         self.data_directory = data_directory
         self.efficiency_fit_params = efficiency_fit_params
@@ -62,16 +129,32 @@ class Serial:
         self.eob_time = eob_time
         self.gammas = gammas
         self.half_lives = half_lives or {}
+        self.fit_config = fit_config or {}
+        self.peak_cache = PeakCache(peak_cache) if isinstance(peak_cache, (str, Path)) else peak_cache
+        self.prefer_chn = prefer_chn
+        self.parent_feeding = parent_feeding or {}
+        self.instrument = Instrumentation() if instrument is True else (instrument or None)
+        self.roi = ROIFitter() if roi is True else (roi or None)
+        self.summing = AdaptiveSumming() if summing is True else (summing or None)
+        self.efficiency = efficiency
+        self.read_ahead = ReadAhead() if read_ahead is True else (read_ahead or None)
         self.peak_data = pd.DataFrame()     # accumulated enriched peaks
         self.decay_results = pd.DataFrame() # per-(isotope,energy) summary
+        self.failed_files: dict[str, str] = {} # file -> error message
+        self._fitted_files: dict[str, tuple] = {} # file -> (size, mtime) already fitted
+        self.plot_jobs: list[dict] = []     # deferred plots, drawn by render_plots()
     
 
     
-    def process_spectrum_files(self, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None):
+    @instrumented("process_spectrum_files")
+    def process_spectrum_files(self, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                               workers: int | None = None, defer_plots: bool = False, plot_workers: int | None = None,
+                               sink=None):
         """
         Process all `.Spe` spectrum files in the data directory.
 
-        This method iterates over all `.Spe` files located in ``data_directory``,
+        This method iterates over all `.Spe` files located in ``data_directory``
+        (plus any `.Chn` files without a `.Spe` counterpart),
         performs peak fitting using the CURIE `Spectrum` class, and calculates start of
         measurement activities and uncertainties. The processed peaks are mapped to metadata
         (e.g., detector slot, decay time, half-lives) concatenated across the measurments,
@@ -84,130 +167,571 @@ class Serial:
             fit parameters. It should accept an array of energies and parameters 
             (e.g., `efficiency_func(energy, *params)`) and return an array of efficiencies.
             If None, detector efficiency is left as NaN and activities are not calculated.
+            Not needed (and ignored) when the instance has an ``efficiency`` table.
         calibration_slot: int
             Distance from the face of the detector (cm) the calibration sources were placed
             when determining the efficiency fit parameters.
         plot_dir : str, optional
             Directory where peak-fit plots can be saved. 
-            Will be created if it does not exist. Default is None.
+            Will be created if it does not exist. Default is None. Plots are only
+            rendered for spectra that are actually fitted (not for ``peak_cache`` hits).
+        workers : int, optional
+            Number of worker processes used to fit the spectra. If None or 1 (default),
+            files are processed one at a time in the current process. Values greater
+            than 1 fan the per-file work out across a process pool; ``efficiency_func``
+            must then be picklable (a module- or notebook-level function).
+        defer_plots : bool, optional
+            If True, peak-fit plots are only recorded in ``self.plot_jobs`` and drawn
+            later by :meth:`render_plots` (or never). If False (default), they are
+            rendered after all spectra have been fitted.
+        plot_workers : int, optional
+            Number of worker processes used to render the plots. Defaults to ``workers``.
+        sink : optional
+            Where the per-file peak frames are written as they finish, e.g.
+            ``nuclab.sinks.ParquetSink`` or ``CSVSink`` for archives too large for
+            memory. The sink is closed at the end. If None (default), a ``MemorySink``
+            is used and its frames become ``self.peak_data``; with any other sink
+            ``self.peak_data`` is left empty.
 
         Notes
         -----
+        - This is a thin wrapper over :meth:`iter_peaks`.
         - Files without fitted peaks are skipped with a printed message.
-        - If `efficiency_func` or `self.efficiency_fit_params` is missing, 
-        detector efficiency and activity calculations are skipped.
+        - Files that raise during processing are reported and skipped; the error message
+        is stored per filename in ``self.failed_files``.
+        - Per-file results are gathered in sorted filename order, so ``self.peak_data``
+        is identical for serial and parallel runs.
+        - If `efficiency_func` or `self.efficiency_fit_params` is missing (and there is
+        no `self.efficiency` table), detector efficiency and activity calculations are skipped.
         - Internal CURIE columns (e.g., ``decays``, ``chi2``) are dropped before returning.
-        - The method does not perform any CSV/XLSX I/O; results are stored in memory.
+        - Without a ``sink``, the method does not perform any CSV/XLSX I/O; results are stored in memory.
         """
+        files = list_spectrum_files(self.data_directory)
+
+        self.failed_files = {}
+        self._fitted_files = {file: self._file_signature(file) for file in files}
+
+        memory = sink is None
+        sink = MemorySink() if memory else sink
+        try:
+            for _, peaks in self.iter_peaks(efficiency_func, calibration_slot, plot_dir, workers, files=files):
+                sink.write(peaks)
+        finally:
+            sink.close()
+
+        self.peak_data = sink.frame if memory else pd.DataFrame()
+
+        if not defer_plots:
+            self.render_plots(workers=plot_workers if plot_workers is not None else workers)
+
+
+    def iter_spectra(self, files: list[str] | None = None):
+        """
+        Yield the spectra of ``data_directory`` one at a time, unfitted.
+
+        Parameters
+        ----------
+        files : list[str], optional
+            Filenames to read. Defaults to every spectrum in ``data_directory``.
+
+        Yields
+        ------
+        tuple[str, curie.Spectrum]
+            Filename and its spectrum (read from the `.Chn` sibling when ``prefer_chn``).
+            Unreadable files are reported, recorded in ``self.failed_files`` and skipped.
+            With ``read_ahead``, the next files are read while the consumer works.
+        """
+        files = list_spectrum_files(self.data_directory) if files is None else files
+        read = lambda file: load_spectrum(resolve_spectrum_path(os.path.join(self.data_directory, file), self.prefer_chn))
+        if self.read_ahead is not None:
+            reads = ((file, future.result) for file, future in self.read_ahead.map(read, files))
+        else:
+            reads = ((file, partial(read, file)) for file in files)
+        for file, get_spectrum in reads:
+            try:
+                sp = get_spectrum()
+            except Exception as e:
+                print(f"Failed to read {file}: {e}")
+                self.failed_files[file] = str(e)
+                continue
+            yield file, sp
+
+
+    def iter_peaks(self, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                   workers: int | None = None, files: list[str] | None = None, prefetch: int | None = None):
+        """
+        Fit the spectra one file at a time, yielding each processed peak frame as it finishes.
+
+        Nothing is accumulated on the instance, so arbitrarily long archives can be
+        streamed (e.g., into a ``nuclab.sinks`` sink) with constant memory.
+
+        Parameters
+        ----------
+        efficiency_func, calibration_slot, plot_dir, workers
+            As in :meth:`process_spectrum_files`.
+        files : list[str], optional
+            Filenames to fit. Defaults to every spectrum in ``data_directory``.
+        prefetch : int, optional
+            With ``workers``, how many files may be fitted ahead of the consumer.
+            Default is ``2 * workers``.
+
+        Yields
+        ------
+        tuple[str, pandas.DataFrame]
+            Filename and its enriched peak frame, in filename order. Files that fail or
+            have no peaks are skipped (failures are recorded in ``self.failed_files``).
+
+        Notes
+        -----
+        - Peak-fit plots are queued in ``self.plot_jobs``; call :meth:`render_plots`
+        to draw them.
+        """
+        if plot_dir is not None:
+            Path(plot_dir).mkdir(parents=True, exist_ok=True)
+        if files is None:
+            files = list_spectrum_files(self.data_directory)
+        yield from self._iter_fits(files, efficiency_func, calibration_slot, plot_dir, workers, prefetch)
+
+
+    def process_new_spectrum_files(self, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                                   workers: int | None = None, update_decay: bool = False,
+                                   plot_directory: str | None = None, settle_time: float = 5.0,
+                                   defer_plots: bool = False, plot_workers: int | None = None) -> list[str]:
+        """
+        Fit only the `.Spe` files that are new or changed since the last call.
+
+        Each fitted file is tracked by its name, size and modification time. On every
+        call the data directory is rescanned, and only files whose signature is new
+        (or has changed) are fitted and appended to ``self.peak_data``. Rows from a
+        previous fit of a changed file are replaced. Optionally, the decay analysis is
+        refreshed for the affected (isotope, energy) groups only.
+
+        Parameters
+        ----------
+        efficiency_func, calibration_slot, plot_dir, workers, defer_plots, plot_workers
+            As in :meth:`process_spectrum_files`; ``defer_plots`` and ``plot_workers``
+            also apply to the decay plots.
+        update_decay : bool, optional
+            If True, re-run :meth:`process_decay_data` for the (isotope, energy) groups
+            touched by the new files. Default is False.
+        plot_directory : str, optional
+            Passed to :meth:`process_decay_data` when ``update_decay`` is True.
+        settle_time : float, optional
+            Files modified less than this many seconds ago are assumed to still be
+            written by MAESTRO and are left for the next call. Default is 5 s.
+
+        Returns
+        -------
+        list[str]
+            Filenames fitted in this call, in sorted order.
 
+        Notes
+        -----
+        - Files that fail to process are recorded in ``self.failed_files`` and are
+        only retried once their size or modification time changes.
+        - Calling :meth:`process_spectrum_files` resets the tracked file signatures.
+        """
+        if plot_dir is not None:
+            Path(plot_dir).mkdir(parents=True, exist_ok=True)
+
+        now = time.time()
+        pending = {}
+        for file in list_spectrum_files(self.data_directory):
+            signature = self._file_signature(file)
+            if self._fitted_files.get(file) == signature or now - signature[1] < settle_time:
+                continue
+            pending[file] = signature
 
-        Path(plot_dir).mkdir(parents=True, exist_ok=True)
+        if not pending:
+            return []
 
-        rows = []
-        files = sorted([f for f in os.listdir(self.data_directory) if f.endswith(".Spe")])
+        files = list(pending)
         for file in files:
-            file_path = os.path.join(self.data_directory, file)
-            base_filename = os.path.splitext(file)[0]
-
-            # Parse detector slot if present in name (e.g., '...-d1s12-...')
-            detector_slot = None
-            for part in base_filename.split("-"):
-                if part.startswith("d1s") and part[3:].isdigit():
-                    detector_slot = int(part[3:])
+            self.failed_files.pop(file, None)
+        rows = self._fit_files(files, efficiency_func, calibration_slot, plot_dir, workers)
+        self._fitted_files.update(pending)
+
+        # Replace rows of re-fitted files, then append the new rows
+        if not self.peak_data.empty and "file" in self.peak_data.columns:
+            refitted = self.peak_data["file"].isin(files)
+            if "summed files" in self.peak_data.columns:
+                refitted |= self.peak_data["summed files"].str.split(";").map(lambda summed: bool(set(summed) & set(files)))
+            self.peak_data = self.peak_data[~refitted]
+        if rows:
+            self.peak_data = pd.concat([self.peak_data, *rows], ignore_index=True)
+
+        if update_decay and rows:
+            new_peaks = pd.concat(rows, ignore_index=True)
+            groups = list(new_peaks[["isotope", "energy"]].drop_duplicates().itertuples(index=False, name=None))
+            self.process_decay_data(plot_directory=plot_directory, groups=groups, defer_plots=True)
+
+        if not defer_plots:
+            self.render_plots(workers=plot_workers if plot_workers is not None else workers)
+
+        return files
+
+
+    def watch(self, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+              workers: int | None = None, update_decay: bool = True, plot_directory: str | None = None,
+              poll_interval: float = 60.0, timeout: float | None = None, expected_files: int | None = None,
+              settle_time: float = 5.0, defer_plots: bool = False, plot_workers: int | None = None):
+        """
+        Poll the data directory and incrementally fit spectra as they are written.
+
+        Intended for live MAESTRO ``LOOP`` jobs, where a new ``-NNN.Spe`` file lands
+        every few minutes to hours. Each poll calls :meth:`process_new_spectrum_files`,
+        so the cost of a refresh scales with the number of new files rather than the
+        size of the campaign.
+
+        Parameters
+        ----------
+        efficiency_func, calibration_slot, plot_dir, workers, update_decay, plot_directory, settle_time,
+        defer_plots, plot_workers
+            As in :meth:`process_new_spectrum_files`.
+        poll_interval : float, optional
+            Seconds to wait between directory scans. Default is 60 s.
+        timeout : float, optional
+            Stop watching after this many seconds. If None (default), watch until
+            ``expected_files`` have been fitted or the loop is interrupted.
+        expected_files : int, optional
+            Stop once this many files have been fitted (e.g., 40 for a ``LOOP 40`` job).
+
+        Notes
+        -----
+        - Interrupting the loop (e.g., ``KeyboardInterrupt`` in a notebook) stops
+        watching; everything fitted so far is kept in ``self.peak_data``.
+        """
+        start = time.time()
+        try:
+            while True:
+                new_files = self.process_new_spectrum_files(efficiency_func=efficiency_func,
+                                                            calibration_slot=calibration_slot,
+                                                            plot_dir=plot_dir, workers=workers,
+                                                            update_decay=update_decay,
+                                                            plot_directory=plot_directory,
+                                                            settle_time=settle_time,
+                                                            defer_plots=defer_plots,
+                                                            plot_workers=plot_workers)
+                if new_files:
+                    print(f"Fitted {len(new_files)} new file(s); {len(self._fitted_files)} tracked in total")
+
+                if expected_files is not None and len(self._fitted_files) >= expected_files:
+                    break
+                if timeout is not None and time.time() - start + poll_interval > timeout:
                     break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
 
-            sp = ci.Spectrum(file_path)
 
-            # seconds since EOB
-            decay_time = (sp.start_time - self.eob_time).total_seconds()
+    def _file_signature(self, file: str) -> tuple:
+        """Return the ``(size, mtime)`` signature of ``file`` in ``data_directory``."""
+        stat = os.stat(os.path.join(self.data_directory, file))
+        return stat.st_size, stat.st_mtime
 
-            # Fit peaks
-            sp.fit_peaks(gammas=self.gammas)
-            
-            if plot_dir is not None:
-                sp.saveas(f"{plot_dir}/{file}-peak-fit.svg")
 
-            peaks = sp._peaks
-            if peaks is None or len(peaks) == 0:
-                print(f"No peaks found in {file}")
-                continue
+    def _fit_files(self, files, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                   workers: int | None = None):
+        """
+        Fit ``files`` serially or across a process pool.
+
+        Returns
+        -------
+        list[pandas.DataFrame]
+            Successfully processed peak frames, in the order of ``files``.
+        """
+        return [peaks for _, peaks in self._iter_fits(files, efficiency_func, calibration_slot, plot_dir, workers)]
 
-            # Work on a COPY, then append
-            peaks = peaks.copy()
 
-            # Add metadata/enriched columns (don’t touch self.peak_data inside loop)
-            peaks["file"] = file
-            peaks["detector_slot"] = detector_slot
-            peaks["decay time (s)"] = decay_time
-            peaks["half-life (s)"] = peaks["energy"].map(self.half_lives)
+    def _iter_fits(self, files, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                   workers: int | None = None, prefetch: int | None = None):
+        """
+        Fit ``files`` serially or across a process pool, yielding ``(file, peaks)`` in order.
+
+        With a pool, at most ``prefetch`` files (default ``2 * workers``) are in flight
+        or waiting to be consumed, so memory stays bounded however many files there are.
+        With ``summing``, each group of summed files is fitted (and yielded) once,
+        under its first filename. With ``read_ahead``, the next files are read in
+        background threads while earlier ones are fitted.
+        """
+        if self.summing is not None:
+            units = self._summing_groups(files)
+        elif self.read_ahead is not None:
+            units = ((file, None, partial(self._wait_read, file, future))
+                     for file, future in self.read_ahead.map(self._preload, files))
+        else:
+            units = ((file, None, None) for file in files)
+        if workers is not None and workers > 1:
+            # Ship a lightweight copy to the workers (no accumulated results)
+            worker = copy.copy(self)
+            worker.peak_data = pd.DataFrame()
+            worker.decay_results = pd.DataFrame()
+            # Workers time into their own recorder; the records are merged back here
+            worker.instrument = self.instrument.fork() if self.instrument is not None else None
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                def submit(file, members, loaded):
+                    try:
+                        preloaded = loaded() if loaded is not None else None
+                    except Exception as e:
+                        # Unreadable: report it in order, like a failure in a worker
+                        future = Future()
+                        future.set_exception(e)
+                        return file, future
+                    return file, pool.submit(worker._process_file, file, efficiency_func, calibration_slot,
+                                             plot_dir, members, preloaded)
+                pending = deque(submit(*unit) for unit in islice(units, prefetch or 2 * workers))
+                try:
+                    while pending:
+                        file, future = pending.popleft()
+                        peaks = self._collect_peaks(file, future.result, merge_records=True)
+                        for unit in islice(units, 1):
+                            pending.append(submit(*unit))
+                        if peaks is not None:
+                            yield file, peaks
+                finally:
+                    # Stopped early: do not fit files nobody will consume
+                    for _, future in pending:
+                        future.cancel()
+            return
+
+        for file, members, loaded in units:
+            get_peaks = lambda: self._process_file(file, efficiency_func, calibration_slot, plot_dir, members,
+                                                   loaded() if loaded is not None else None)
+            peaks = self._collect_peaks(file, get_peaks)
+            if peaks is not None:
+                yield file, peaks
+
+
+    def _summing_groups(self, files):
+        """
+        Group ``files`` with ``self.summing``, yielding ``(file, members, loaded)`` per fit.
 
-            # efficiency
-            if efficiency_func is not None and self.efficiency_fit_params is not None:
-                peaks["detector efficiency"] = efficiency_func(peaks["energy"], *self.efficiency_fit_params) * (calibration_slot / peaks['detector_slot'])**2
+        ``members`` lists the files summed under ``file`` (their first), or is None
+        for a spectrum fitted on its own. ``loaded`` returns the spectra already read
+        for grouping, so they are not read again for the fit.
+        """
+        energies = self.gammas["energy"].to_list() if self.gammas is not None else []
+        spectra = {}
+        def remember(reads):
+            for file, sp in reads:
+                spectra[file] = sp
+                yield file, sp
+
+        for group in self.summing.groups(remember(self.iter_spectra(files)), energies, key=detector_slot):
+            group_spectra = [spectra.pop(file) for file in group]
+            if len(group) > 1:
+                yield group[0], group, partial(dict, spectra=group_spectra)
             else:
-                # If not provided, keep NaN and avoid activity calc later for those rows
-                peaks["detector efficiency"] = np.nan
-
-            # Activity (only where we have what we need)
-            need_cols = ["counts", "intensity", "live_time", "half-life (s)", "detector efficiency"]
-            ok = peaks[need_cols].notna().all(axis=1)
-            if ok.any():
-                lam = np.log(2) / peaks.loc[ok, "half-life (s)"]
-                denom = (1.0 - np.exp(-lam * peaks.loc[ok, "live_time"]))
-                peaks.loc[ok, "activity"] = (
-                    peaks.loc[ok, "counts"] * lam
-                    / peaks.loc[ok, "detector efficiency"]
-                    / peaks.loc[ok, "intensity"]
-                    / denom
-                )
+                # Only the spectrum is known; the cache key is computed when fitting
+                yield group[0], None, partial(dict, spectrum=group_spectra[0])
 
-                # Uncertainty on activity (propagation as in your formula)
-                # Be sure these exist; if not, fill with NaN
-                for c in ["unc_counts", "unc_intensity"]:
-                    if c not in peaks.columns:
-                        peaks[c] = np.nan
-
-                term_counts = (lam * peaks.loc[ok, "unc_counts"]
-                               / peaks.loc[ok, "detector efficiency"]
-                               / peaks.loc[ok, "intensity"]
-                               / denom) ** 2
-                term_intensity = (peaks.loc[ok, "counts"] * lam * peaks.loc[ok, "unc_intensity"]
-                                  / peaks.loc[ok, "detector efficiency"]
-                                  / (peaks.loc[ok, "intensity"] ** 2)
-                                  / denom) ** 2
-                term_cal = (peaks.loc[ok, "counts"] * lam * self.detector_eff_uncertainty
-                            / peaks.loc[ok, "detector efficiency"]
-                            / peaks.loc[ok, "intensity"]
-                            / denom) ** 2
-                peaks.loc[ok, "uncertainty activity"] = np.sqrt(term_counts + term_intensity + term_cal)
-
-                # EOB activity
-                peaks.loc[ok, "eob activity"] = peaks.loc[ok, "activity"] * np.exp(
-                    lam * peaks.loc[ok, "decay time (s)"]
-                )
-                peaks.loc[ok, "uncertainty eob activity"] = np.exp(
-                    lam * peaks.loc[ok, "decay time (s)"]
-                ) * peaks.loc[ok, "uncertainty activity"]
-
-                # Log columns if you’ll use linearized fit later
-                with np.errstate(divide="ignore", invalid="ignore"):
-                    peaks.loc[ok, "ln(activity)"] = np.log(peaks.loc[ok, "activity"])
-                    peaks.loc[ok, "uncertainty ln(activity)"] = (
-                        peaks.loc[ok, "uncertainty activity"] / peaks.loc[ok, "activity"]
-                    )
 
-            # Drop CURIE internals you don’t want to keep (if present)
-            drop_cols = ["efficiency", "unc_efficiency", "decays", "unc_decays",
-                         "decay_rate", "unc_decay_rate", "filename", "chi2"]
-            peaks = peaks.drop(columns=[c for c in drop_cols if c in peaks.columns], errors="ignore")
+    def _preload(self, file: str) -> dict:
+        """Read ``file`` ahead of its fit (runs in a read-ahead thread)."""
+        file_path = resolve_spectrum_path(os.path.join(self.data_directory, file), self.prefer_chn)
+        return preload_spectrum(file_path, gammas=self.gammas, fit_config=self.fit_config,
+                                cache=self.peak_cache, roi=self.roi)
+
+
+    def _wait_read(self, file: str, future) -> dict:
+        """Result of a read-ahead; the time spent waiting for it is the ``read_wait`` stage."""
+        with stage(self.instrument, "read_wait", file=file):
+            return future.result()
+
+
+    def _collect_peaks(self, file: str, get_peaks, merge_records: bool = False):
+        """
+        Gather the outcome of one file, reporting (not raising) its failure.
+
+        Parameters
+        ----------
+        file : str
+            Spectrum filename.
+        get_peaks : callable
+            Returns the processed peak DataFrame (or None), the plot jobs and the stage
+            records for ``file``, or raises on failure. Plot jobs are appended to
+            ``self.plot_jobs`` and failures recorded in ``self.failed_files``.
+        merge_records : bool, optional
+            If True, the stage records were measured in worker processes and are added
+            to ``self.instrument``.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            Processed peak frame, or None if the file failed or had no peaks.
+        """
+        try:
+            peaks, plot_jobs, records = get_peaks()
+        except Exception as e:
+            print(f"Failed to process {file}: {e}")
+            self.failed_files[file] = str(e)
+            return None
+
+        self.plot_jobs.extend(plot_jobs)
+        if merge_records and self.instrument is not None:
+            self.instrument.extend(records)
+        return peaks
 
-            rows.append(peaks)
-            print(f"Finished fitting peaks for {file}")
 
-        self.peak_data = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+    def _process_file(self, file: str, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                      members: list[str] | None = None, preloaded: dict | None = None):
+        """
+        Fit a single spectrum file from ``data_directory`` and compute its activity columns.
+
+        When ``prefer_chn`` is set and a `.Chn` sibling exists, the binary file is read.
 
+        Parameters are as in :meth:`process_spectrum_files`; ``members`` lists the
+        files to sum and fit as one spectrum under ``file`` (see ``summing``), and
+        ``preloaded`` holds what was already read of them (see :meth:`_preload`).
 
-    def process_decay_data(self, plot_directory: str | None = None):
+        Returns
+        -------
+        peaks : pandas.DataFrame or None
+            Enriched peak data for ``file``, or None if no peaks were fitted.
+        plot_jobs : list[dict]
+            Peak-fit plot recorded for ``file`` (empty without ``plot_dir`` or on a cache hit).
+        records : list[dict]
+            Stage records measured for ``file`` (empty without instrumentation).
+        """
+        n_records = len(self.instrument.records) if self.instrument is not None else 0
+        with stage(self.instrument, "process_file", file=file):
+            peaks, plot_jobs = self._fit_and_enrich(file, efficiency_func, calibration_slot, plot_dir, members,
+                                                    preloaded)
+        records = self.instrument.records[n_records:] if self.instrument is not None else []
+        return peaks, plot_jobs, records
+
+
+    def _fit_and_enrich(self, file: str, efficiency_func=None, calibration_slot: int = None, plot_dir: str | None = None,
+                        members: list[str] | None = None, preloaded: dict | None = None):
+        """Fit ``file`` and add its metadata and activity columns (see :meth:`_process_file`)."""
+        file_path = os.path.join(self.data_directory, file)
+        slot = detector_slot(file)
+
+        # Fit peaks (or reuse a cached fit); returns a copy of CURIE's peak table
+        plot_path = f"{plot_dir}/{file}-peak-fit.svg" if plot_dir is not None else None
+        plot_jobs = []
+        if members is None:
+            peaks, start_time = fit_spectrum_peaks(resolve_spectrum_path(file_path, self.prefer_chn), gammas=self.gammas, fit_config=self.fit_config,
+                                                   cache=self.peak_cache, plot_path=plot_path, plot_jobs=plot_jobs,
+                                                   instrument=self.instrument, roi=self.roi, preloaded=preloaded)
+        else:
+            with stage(self.instrument, "read_spectrum", file=file):
+                paths = [resolve_spectrum_path(os.path.join(self.data_directory, m), self.prefer_chn) for m in members]
+                spectra = (preloaded or {}).get("spectra") or [load_spectrum(path) for path in paths]
+                sp = sum_spectra(spectra)
+            peaks = fit_spectrum(sp, paths, gammas=self.gammas, fit_config=self.fit_config, plot_path=plot_path,
+                                 plot_jobs=plot_jobs, instrument=self.instrument, roi=self.roi)
+            peaks = peaks.copy() if peaks is not None else None
+            start_time = sp.start_time
+
+        # seconds since EOB
+        decay_time = (start_time - self.eob_time).total_seconds()
+
+        if peaks is None:
+            print(f"No peaks found in {file}")
+            return None, plot_jobs
+
+        if members is not None:
+            # Per line: the time at which the summed counts measure the activity
+            decay_time = pd.Series(effective_decay_time([(s.start_time - self.eob_time).total_seconds() for s in spectra],
+                                                        [s.live_time for s in spectra],
+                                                        peaks["energy"].map(self.half_lives)), index=peaks.index)
+
+        with stage(self.instrument, "activity_columns", file=file):
+            peaks = self._activity_columns(peaks, file, slot, decay_time, efficiency_func, calibration_slot)
+            if self.summing is not None:
+                peaks["summed files"] = ";".join(members or [file])
+                peaks["n_summed"] = len(members or [file])
+
+        print(f"Finished fitting peaks for {file}")
+        return peaks, plot_jobs
+
+
+    def _activity_columns(self, peaks: pd.DataFrame, file: str, detector_slot, decay_time: float,
+                          efficiency_func=None, calibration_slot: int = None) -> pd.DataFrame:
+        """Add the metadata, efficiency and activity columns of one file's peaks."""
+        # Add metadata/enriched columns (don’t touch self.peak_data inside loop)
+        peaks["file"] = file
+        peaks["detector_slot"] = detector_slot
+        peaks["decay time (s)"] = decay_time
+        peaks["half-life (s)"] = peaks["energy"].map(self.half_lives)
+
+        # efficiency
+        eff_uncertainty = self.detector_eff_uncertainty
+        if self.efficiency is not None:
+            eff, unc_eff = self.efficiency.lookup(peaks["energy"].to_numpy(float))
+            ref_slot = self.efficiency.slot if self.efficiency.slot is not None else calibration_slot
+            scale = (ref_slot / peaks["detector_slot"])**2 if ref_slot is not None else 1.0
+            peaks["detector efficiency"] = eff * scale
+            peaks["uncertainty detector efficiency"] = unc_eff * scale
+            eff_uncertainty = peaks["uncertainty detector efficiency"] / peaks["detector efficiency"]
+        elif efficiency_func is not None and self.efficiency_fit_params is not None:
+            peaks["detector efficiency"] = efficiency_func(peaks["energy"], *self.efficiency_fit_params) * (calibration_slot / peaks['detector_slot'])**2
+        else:
+            # If not provided, keep NaN and avoid activity calc later for those rows
+            peaks["detector efficiency"] = np.nan
+
+        # Activity (only where we have what we need)
+        need_cols = ["counts", "intensity", "live_time", "half-life (s)", "detector efficiency"]
+        ok = peaks[need_cols].notna().all(axis=1)
+        if ok.any():
+            lam = np.log(2) / peaks.loc[ok, "half-life (s)"]
+            denom = (1.0 - np.exp(-lam * peaks.loc[ok, "live_time"]))
+            peaks.loc[ok, "activity"] = (
+                peaks.loc[ok, "counts"] * lam
+                / peaks.loc[ok, "detector efficiency"]
+                / peaks.loc[ok, "intensity"]
+                / denom
+            )
+
+            # Uncertainty on activity (propagation as in your formula)
+            # Be sure these exist; if not, fill with NaN
+            for c in ["unc_counts", "unc_intensity"]:
+                if c not in peaks.columns:
+                    peaks[c] = np.nan
+
+            term_counts = (lam * peaks.loc[ok, "unc_counts"]
+                           / peaks.loc[ok, "detector efficiency"]
+                           / peaks.loc[ok, "intensity"]
+                           / denom) ** 2
+            term_intensity = (peaks.loc[ok, "counts"] * lam * peaks.loc[ok, "unc_intensity"]
+                              / peaks.loc[ok, "detector efficiency"]
+                              / (peaks.loc[ok, "intensity"] ** 2)
+                              / denom) ** 2
+            if isinstance(eff_uncertainty, pd.Series):
+                eff_uncertainty = eff_uncertainty.loc[ok]
+            term_cal = (peaks.loc[ok, "counts"] * lam * eff_uncertainty
+                        / peaks.loc[ok, "detector efficiency"]
+                        / peaks.loc[ok, "intensity"]
+                        / denom) ** 2
+            peaks.loc[ok, "uncertainty activity"] = np.sqrt(term_counts + term_intensity + term_cal)
+
+            # EOB activity
+            peaks.loc[ok, "eob activity"] = peaks.loc[ok, "activity"] * np.exp(
+                lam * peaks.loc[ok, "decay time (s)"]
+            )
+            peaks.loc[ok, "uncertainty eob activity"] = np.exp(
+                lam * peaks.loc[ok, "decay time (s)"]
+            ) * peaks.loc[ok, "uncertainty activity"]
+
+            # Log columns if you’ll use linearized fit later
+            with np.errstate(divide="ignore", invalid="ignore"):
+                peaks.loc[ok, "ln(activity)"] = np.log(peaks.loc[ok, "activity"])
+                peaks.loc[ok, "uncertainty ln(activity)"] = (
+                    peaks.loc[ok, "uncertainty activity"] / peaks.loc[ok, "activity"]
+                )
+
+        # Drop CURIE internals you don’t want to keep (if present)
+        drop_cols = ["efficiency", "unc_efficiency", "decays", "unc_decays",
+                     "decay_rate", "unc_decay_rate", "filename", "chi2"]
+        peaks = peaks.drop(columns=[c for c in drop_cols if c in peaks.columns], errors="ignore")
+        return peaks
+
+
+    @instrumented("decay_fit")
+    def process_decay_data(self, plot_directory: str | None = None, groups: list[tuple] | None = None,
+                           defer_plots: bool = False, plot_workers: int | None = None,
+                           parent_feeding: dict[str, dict] | None = None):
         """
         Perform decay analysis on peak data grouped by (isotope, energy).
 
@@ -238,7 +762,20 @@ class Serial:
             Path to a directory where activity-time fit plots will be saved for each
             (isotope, energy) group. If None (default), no plots are saved. If
             provided, the directory is created if it does not exist.
-
+        groups : list of tuple, optional
+            ``(isotope, energy)`` pairs to (re)fit. If given, only these groups are
+            fitted and their rows in ``self.decay_results`` are replaced; results for
+            all other groups are kept. If None (default), every group is fitted.
+        defer_plots : bool, optional
+            If True, plots are only recorded in ``self.plot_jobs`` and drawn later by
+            :meth:`render_plots`. If False (default), they are rendered after the fits.
+        plot_workers : int, optional
+            Number of worker processes used to render the plots. Default is None
+            (render in the current process).
+        parent_feeding : dict[str, dict], optional
+            Fit model selection: daughter isotopes listed here are fit with ingrowth
+            from a decaying parent (see the class parameter of the same name). Defaults
+            to ``self.parent_feeding``; all other isotopes use the single exponential.
 
         Raises
         ------
@@ -251,8 +788,17 @@ class Serial:
         Notes
         -----
         * Only groups with at least two finite activity points are fit.
-        * Nonlinear fits use either a helper ``fit_decay`` function (if available)
-        or fall back to SciPy's ``curve_fit``.
+        * Parent-feeding isotopes are fit with
+        ``A(t) = A0 exp(-λ t) + b P λ/(λ-λp) (exp(-λp t) - exp(-λ t))``: one joint
+        solve per isotope (``nuclab.decay.fit_parent_feeding``), with ``A0`` per line and
+        the daughter ``λ`` and parent EoB activity ``P`` shared by all of its lines.
+        ``decay_results`` then gains ``"Fit model"``, ``"Parent A0 (fit)"`` and
+        ``"Std Parent A0 (fit)"`` columns. If the joint fit fails or does not
+        converge, the isotope's lines keep the single-exponential fit and are
+        reported with ``"Fit model"`` ``"exponential"``.
+        * All groups are fit together by the batched weighted Levenberg-Marquardt
+        solver ``nuclab.decay.fit_exponential_decays``. SciPy's ``curve_fit`` is only
+        used as a fallback for groups that fail to converge.
         * Half-life is computed from λ using: ``t½ = ln(2)/λ``.
         * Natural log columns (``ln(activity)``, ``uncertainty ln(activity)``) are
         created if missing for possible linear diagnostics.
@@ -281,22 +827,31 @@ class Serial:
                 self.peak_data["uncertainty activity"] / self.peak_data["activity"]
             )
 
-        results = []
-        grouped = (self.peak_data
+        parent_feeding = self.parent_feeding if parent_feeding is None else parent_feeding
+
+        peak_data = self.peak_data
+        if groups is not None:
+            # Lines of a parent-feeding isotope are only fit together
+            fed = {isotope for isotope, _ in groups if isotope in parent_feeding}
+            groups = list(groups) + list(peak_data.loc[peak_data["isotope"].isin(fed), ["isotope", "energy"]]
+                                         .drop_duplicates().itertuples(index=False, name=None))
+            keys = pd.MultiIndex.from_frame(peak_data[["isotope", "energy"]])
+            peak_data = peak_data[keys.isin(groups)]
+
+        grouped = (peak_data
                 .sort_values(["isotope", "energy", "decay time (s)"])
                 .groupby(["isotope", "energy"], dropna=False))
 
-        # Nonlinear decay model (A-space)
-        def exp_decay(t, A0, lam):
-            return A0 * np.exp(-lam * t)
-
+        # Collect the fittable groups and their initial guesses
+        keys, frames, n_points = [], [], []
+        t_groups, a_groups, s_groups, p0 = [], [], [], []
         for (isotope, energy), df in grouped:
             # Keep rows with finite values
             mask_A = (
                 df[["decay time (s)", "activity", "uncertainty activity"]].notna().all(axis=1) &
                 (df["activity"] > 0) & (df["uncertainty activity"] > 0)
             )
-            gA = df.loc[mask_A].copy()
+            gA = df.loc[mask_A]
 
             if len(gA) < 2:
                 continue
@@ -314,31 +869,73 @@ class Serial:
                 lam0 = max(-(np.log(aA[-1]) - np.log(aA[0])) / max(tA[-1] - tA[0], 1.0), 1e-8)
             A0_guess = aA[0] * np.exp(lam0 * tA[0])
 
-            # --- Nonlinear fit on A(t) ---
+            keys.append((isotope, energy))
+            frames.append(df)
+            n_points.append(len(gA))
+            t_groups.append(tA)
+            a_groups.append(aA)
+            s_groups.append(sA)
+            p0.append([max(A0_guess, np.nanmax(aA)), lam0])
+
+        # --- Nonlinear fit on A(t), all groups at once ---
+        if keys:
+            params, std_params, _, converged = fit_exponential_decays(t_groups, a_groups, s_groups, p0)
+        else:
+            params = std_params = np.empty((0, 2))
+            converged = np.empty(0, dtype=bool)
+
+        # --- Parent-feeding isotopes: one joint fit over all lines of each ---
+        feeding = {}  # group index -> (A0, lam, std A0, std lam, P, std P, plot params)
+        for isotope, config in parent_feeding.items():
+            idx = [i for i, key in enumerate(keys) if key[0] == isotope]
+            if not idx:
+                continue
+            parent_lam = np.log(2) / config["half_life"]
+            branching = config.get("branching", 1.0)
+            lam0 = np.median([p0[i][1] for i in idx])
             try:
-                # if you have a helper fit_decay that returns (params, std_params), use it:
-                params, std_params = fit_decay(
-                    t_vals=tA,
-                    a_vals=aA,
-                    decay_function=exp_decay,
-                    unc_a_vals=sA,
-                    xlabel="Decay Time (s)",
-                    ylabel="Measured Activity (Bq)",
-                    plot_label=f"{isotope} @ {energy} keV",
-                    initial_guess=[max(A0_guess, np.nanmax(aA)), lam0],
-                    plot_filename=(f"{plot_directory}/{str(isotope).replace('/', '_')}_{energy:.3f}_activity-time.png"
-                                if plot_directory else None)
-                )
-                A0_fit, lam_fit = params
-                std_A0, std_lam = std_params
-            except Exception:
-                # fall back to curve_fit if fit_decay is not available
+                x, cov, ok = fit_parent_feeding([t_groups[i] for i in idx], [a_groups[i] for i in idx],
+                                                [s_groups[i] for i in idx], parent_lam, lam0, branching=branching)
+            except (RuntimeError, ValueError, np.linalg.LinAlgError) as e:
+                # Its lines keep their exponential fits from the batched solve
+                print(f"Parent-feeding fit failed for {isotope}: {e}; using the exponential fit")
+                continue
+            if not ok:
+                print(f"Parent-feeding fit did not converge for {isotope}; using the exponential fit")
+                continue
+            std = np.sqrt(np.abs(np.diag(cov)))
+            L = len(idx)
+            for j, i in enumerate(idx):
+                feeding[i] = (x[j], x[L], std[j], std[L], x[L + 1], std[L + 1],
+                              [x[j], x[L], x[L + 1], parent_lam, branching])
+
+        results = []
+        for i, ((isotope, energy), df) in enumerate(zip(keys, frames)):
+            A0_fit, lam_fit = params[i]
+            std_A0, std_lam = std_params[i]
+            model, plot_function, plot_params = "exponential", exp_decay, None
+
+            if i in feeding:
+                A0_fit, lam_fit, std_A0, std_lam, parent_A0, std_parent_A0, plot_params = feeding[i]
+                model, plot_function = "parent feeding", parent_feeding_decay
+            elif not converged[i]:
+                # Explicit fallback for groups the batched solver could not converge
                 from scipy.optimize import curve_fit
-                popt, pcov = curve_fit(exp_decay, tA, aA, p0=[max(A0_guess, np.nanmax(aA)), lam0],
-                                    sigma=sA, absolute_sigma=True, maxfev=10000)
-                A0_fit, lam_fit = popt
-                perr = np.sqrt(np.diag(pcov)) if pcov is not None else [np.nan, np.nan]
-                std_A0, std_lam = perr
+
+                try:
+                    popt, pcov = curve_fit(exp_decay, t_groups[i], a_groups[i], p0=p0[i],
+                                           sigma=s_groups[i], absolute_sigma=True, maxfev=10000)
+                    A0_fit, lam_fit = popt
+                    std_A0, std_lam = np.sqrt(np.diag(pcov))
+                except (RuntimeError, ValueError) as e:
+                    print(f"Decay fit failed for {isotope} @ {energy} keV: {e}")
+                    A0_fit = lam_fit = std_A0 = std_lam = np.nan
+
+            if plot_directory:
+                self.plot_jobs.append(fit_plot_job(
+                    t_groups[i], a_groups[i], s_groups[i], plot_function, plot_params or [A0_fit, lam_fit],
+                    xlabel="Decay Time (s)", ylabel="Measured Activity (Bq)",
+                    plot_filename=f"{plot_directory}/{str(isotope).replace('/', '_')}_{energy:.3f}_activity-time.png"))
 
             # Derived half-life from nonlinear fit
             if np.isfinite(lam_fit) and lam_fit > 0:
@@ -360,7 +957,7 @@ class Serial:
             else:
                 mean_A0 = std_A0_vals = sigma_mean_A0 = np.nan
 
-            results.append({
+            row = {
                 "Isotope": isotope,
                 "Energy (keV)": energy,
                 # Nonlinear (A-space) fit outputs:
@@ -379,12 +976,58 @@ class Serial:
                 "Mean A0 (decay-corrected)": mean_A0,
                 "Std A0 (decay-corrected)": std_A0_vals,
                 "Unc Mean A0 (decay-corrected)": sigma_mean_A0,
-                "N points": int(len(gA)),
-            })
+                "N points": int(n_points[i]),
+            }
+            if parent_feeding:
+                row["Fit model"] = model
+                row["Parent A0 (fit)"] = parent_A0 if i in feeding else np.nan
+                row["Std Parent A0 (fit)"] = std_parent_A0 if i in feeding else np.nan
+            results.append(row)
+
+        decay_results = pd.DataFrame(results)
+        if groups is not None and not self.decay_results.empty:
+            # Keep previously fitted groups that were not refreshed
+            keys = pd.MultiIndex.from_frame(self.decay_results[["Isotope", "Energy (keV)"]])
+            kept = self.decay_results[~keys.isin(list(groups))]
+            decay_results = pd.concat([kept, decay_results], ignore_index=True)
+
+        if decay_results.empty:
+            # No group with two or more points (e.g., everything summed into one spectrum)
+            print("No (isotope, energy) group has at least two activity points; no decay fits.")
+            self.decay_results = decay_results
+        else:
+            self.decay_results = decay_results.sort_values(
+                by=["Isotope", "Energy (keV)"], kind="mergesort"
+            )
+
+        if not defer_plots:
+            self.render_plots(workers=plot_workers)
 
-        self.decay_results = pd.DataFrame(results).sort_values(
-            by=["Isotope", "Energy (keV)"], kind="mergesort"
-        )
+
+    @instrumented("render_plots")
+    def render_plots(self, workers: int | None = None) -> list[str]:
+        """
+        Render the plots queued in ``self.plot_jobs`` and clear the queue.
+
+        Fits only record the data needed to draw their plots; drawing happens here,
+        headless (Agg), optionally across a process pool. Call this after running
+        with ``defer_plots=True``, or simply clear ``self.plot_jobs`` to skip them.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of worker processes. If None or 1 (default), plots are rendered in
+            the current process.
+
+        Returns
+        -------
+        list[str]
+            Paths of the plots that were written.
+        """
+        jobs, self.plot_jobs = self.plot_jobs, []
+        if not jobs:
+            return []
+        return render_plots(jobs, workers=workers)
 
 
 
@@ -434,6 +1077,7 @@ class Serial:
             yield key, df.copy()
 
 
+    @instrumented("write_excel")
     def save_peak_data(
         self,
         filepath: str,
@@ -486,9 +1130,8 @@ class Serial:
         # Ensure parent directory exists
         Path(os.path.dirname(os.path.abspath(filepath)) or ".").mkdir(parents=True, exist_ok=True)
 
-        # Group by (isotope, energy) and ensure stable ordering
-        df = self.peak_data.copy()
-        df = df.sort_values(["isotope", "energy", sort_key])
+        # Group by (isotope, energy) and ensure stable ordering (sort_values returns a new frame)
+        df = self.peak_data.sort_values(["isotope", "energy", sort_key])
 
         # Helper: sanitize and dedupe sheet names
         def sanitize_sheet_name(name: str) -> str:
@@ -509,8 +1152,8 @@ class Serial:
 
         # Build list of groups
         groups = []
-        for (iso, e), g in df.groupby(["isotope", "energy"], dropna=False):
-            groups.append((iso, e, g.copy()))
+        for (iso, e), g in df.groupby(["isotope", "energy"], dropna=False, observed=True):
+            groups.append((iso, e, g))
 
         if not groups:
             raise ValueError("No (isotope, energy) groups found in peak_data.")
@@ -565,6 +1208,7 @@ class Serial:
         return filepath
     
 
+    @instrumented("write_excel")
     def save_decay_data(self, filepath: str = "decay_results.xlsx") -> str:
         """
         Save the decay analysis results to a single-sheet Excel file.
@@ -602,3 +1246,91 @@ class Serial:
 
         print(f"💾 Results saved to: {out_path.resolve()}")
         return str(out_path.resolve())
+
+
+    @instrumented("write_table")
+    def export_peak_data(self, path: str, partition_by: str | list[str] | None = None, format: str | None = None,
+                         compression: str = "zstd") -> str:
+        """
+        Save ``peak_data`` as Parquet or Feather with a stable schema.
+
+        Much faster and smaller than :meth:`save_peak_data` for large archives; the
+        Excel workbook can still be generated from the loaded data when needed.
+
+        Parameters
+        ----------
+        path : str
+            Output ``.parquet`` or ``.feather`` file, or a directory with ``partition_by``.
+        partition_by : str or list[str], optional
+            Split the data into a hive-partitioned dataset, e.g. ``"isotope"``.
+        format : {"parquet", "feather"}, optional
+            Default is taken from the suffix of ``path``.
+        compression : str, optional
+            Compression codec. Default is "zstd".
+
+        Returns
+        -------
+        str
+            The path written.
+
+        Notes
+        -----
+        - Columns follow ``nuclab.columnar.PEAK_DATA_SCHEMA``; ``isotope`` and ``file`` are
+        stored dictionary-encoded (categorical).
+        - Requires ``pyarrow``.
+        """
+        if getattr(self, "peak_data", None) is None or self.peak_data.empty:
+            raise ValueError("No peak data available. Run process_spectrum_files() first.")
+        return write_table(self.peak_data, path, PEAK_DATA_SCHEMA, partition_by=partition_by, format=format,
+                           compression=compression)
+
+
+    @instrumented("read_table")
+    def load_peak_data(self, path: str, isotopes: list[str] | None = None) -> pd.DataFrame:
+        """
+        Load ``peak_data`` saved by :meth:`export_peak_data` (or a ``ParquetSink``).
+
+        Parameters
+        ----------
+        path : str
+            File or partitioned directory.
+        isotopes : list[str], optional
+            Keep only these isotopes. With a dataset partitioned by isotope, only their
+            partitions are read.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The loaded data, also assigned to ``self.peak_data`` (``isotope`` and ``file``
+            as plain strings, as produced by :meth:`process_spectrum_files`), ready for
+            :meth:`process_decay_data`.
+        """
+        filters = {"isotope": isotopes} if isotopes is not None else None
+        self.peak_data = read_table(path, PEAK_DATA_SCHEMA, filters=filters, categorical=False)
+        return self.peak_data
+
+
+    @instrumented("write_table")
+    def export_decay_data(self, path: str = "decay_results.parquet", format: str | None = None) -> str:
+        """
+        Save ``decay_results`` as Parquet or Feather (schema
+        ``nuclab.columnar.DECAY_RESULTS_SCHEMA``; extra model columns are appended).
+
+        Returns
+        -------
+        str
+            The path written.
+        """
+        if getattr(self, "decay_results", None) is None or self.decay_results.empty:
+            raise ValueError("No decay results available. Run process_decay_data() first.")
+        return write_table(self.decay_results, path, DECAY_RESULTS_SCHEMA, format=format)
+
+
+    @instrumented("read_table")
+    def load_decay_data(self, path: str) -> pd.DataFrame:
+        """
+        Load ``decay_results`` saved by :meth:`export_decay_data` (also assigned to
+        ``self.decay_results``, e.g. to write them with :meth:`save_decay_data`).
+        """
+        self.decay_results = read_table(path, DECAY_RESULTS_SCHEMA, categorical=False)
+        return self.decay_results
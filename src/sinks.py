@@ -0,0 +1,141 @@
+from pathlib import Path
+
+import pandas as pd
+
+from nuclab.columnar import PEAK_DATA_SCHEMA, to_arrow
+
+
+class MemorySink:
+    """
+    Collect streamed peak frames in memory.
+
+    This is what ``Serial.process_spectrum_files`` uses by default; ``frame``
+    concatenates everything written so far.
+    """
+
+    def __init__(self):
+        self.frames: list[pd.DataFrame] = []
+
+    def write(self, peaks: pd.DataFrame) -> None:
+        self.frames.append(peaks)
+
+    def close(self) -> None:
+        pass
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """All written frames, concatenated (an empty DataFrame if none)."""
+        return pd.concat(self.frames, ignore_index=True) if self.frames else pd.DataFrame()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CSVSink:
+    """
+    Append streamed peak frames to a single CSV file.
+
+    The header is written with the first frame, whose columns fix the layout of the
+    file; later frames are aligned to them (missing columns are left empty, extra
+    columns are dropped with a message).
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Output CSV file. Parent directories are created if needed.
+    append : bool, optional
+        If True, add to an existing file (its header is reused). If False (default),
+        the file is overwritten.
+    """
+
+    def __init__(self, path: str | Path, append: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.columns = None
+        if append and self.path.exists() and self.path.stat().st_size > 0:
+            self.columns = list(pd.read_csv(self.path, nrows=0).columns)
+        elif self.path.exists():
+            self.path.unlink()
+
+    def write(self, peaks: pd.DataFrame) -> None:
+        header = self.columns is None
+        if header:
+            self.columns = list(peaks.columns)
+        extra = [c for c in peaks.columns if c not in self.columns]
+        if extra:
+            print(f"[CSVSink] Dropping columns not in {self.path.name}: {extra}")
+        peaks.reindex(columns=self.columns).to_csv(self.path, mode="a", header=header, index=False)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetSink:
+    """
+    Append streamed peak frames to a Parquet file, one row group per frame.
+
+    The file is laid out as ``schema``; columns outside it are taken from the first
+    frame. Later frames are cast to that layout: missing columns are left null,
+    extra columns are dropped with a message. Requires ``pyarrow``.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Output Parquet file (overwritten). Parent directories are created if needed.
+    compression : str, optional
+        Parquet compression codec. Default is "zstd".
+    schema : dict or None, optional
+        A ``nuclab.columnar`` schema. Default is ``PEAK_DATA_SCHEMA``, the stable
+        layout of ``Serial.export_peak_data`` (readable with ``Serial.load_peak_data``),
+        which always has the activity columns even if the first file has none.
+        None infers the columns and types from the first frame.
+    """
+
+    def __init__(self, path: str | Path, compression: str = "zstd", schema: dict | None = PEAK_DATA_SCHEMA):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.table_schema = schema
+        self.schema = None
+        self._writer = None
+
+    def write(self, peaks: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            table = to_arrow(peaks, self.table_schema)
+            self.schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+            self._writer.write_table(table)
+            return
+
+        extra = [c for c in peaks.columns if c not in self.schema.names]
+        if extra:
+            print(f"[ParquetSink] Dropping columns not in {self.path.name}: {extra}")
+        if self.table_schema is not None:
+            table = to_arrow(peaks.reindex(columns=self.schema.names), self.table_schema).cast(self.schema)
+        else:
+            table = pa.Table.from_pandas(peaks.reindex(columns=self.schema.names), schema=self.schema,
+                                         preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
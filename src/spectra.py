@@ -0,0 +1,186 @@
+import os
+import re
+import struct
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# Fixed 32-byte ORTEC .Chn header:
+# type (-1), MCA number, segment, start seconds (ASCII), real time and live time
+# (20 ms ticks), start date (DDMMMYY*, '*' = '1' for 20xx), start time (HHMM),
+# channel offset, number of channels
+_CHN_HEADER = struct.Struct("<hhh2sii8s4shh")
+_CHN_TICK = 0.02
+_CHN_EXTENSIONS = (".Chn", ".CHN", ".chn")
+_MONTHS = {"JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+           "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12}
+
+
+def read_chn(file_path: str | Path, mmap: bool = True) -> dict:
+    """
+    Read an ORTEC MAESTRO binary ``.Chn`` spectrum.
+
+    The counts are not parsed: they are viewed directly as little-endian 32-bit
+    integers, either through a read-only memory map or a single buffered read.
+    Timing information is decoded from the fixed 32-byte header and the energy
+    and shape calibrations from the trailer.
+
+    Parameters
+    ----------
+    file_path : str or pathlib.Path
+        Path to the ``.Chn`` file.
+    mmap : bool, optional
+        If True (default), memory-map the file so ``counts`` is a zero-copy view.
+        If False, the file is read into memory with a single call.
+
+    Returns
+    -------
+    dict
+        With keys:
+            - "counts" : numpy.ndarray of int32, counts per channel.
+            - "start_time" : datetime.datetime, start of the acquisition.
+            - "live_time" : float, live time (s).
+            - "real_time" : float, real time (s).
+            - "channel_offset" : int, first channel number.
+            - "energy_calibration" : list[float], ``E = c0 + c1*ch + c2*ch²`` (keV).
+            - "shape_calibration" : list[float], FWHM calibration coefficients.
+            - "detector_description", "sample_description" : str.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a ``.Chn`` spectrum (bad header tag or truncated data).
+    """
+    file_path = Path(file_path)
+    raw = np.memmap(file_path, dtype=np.uint8, mode="r") if mmap else np.fromfile(file_path, dtype=np.uint8)
+
+    if raw.size < _CHN_HEADER.size:
+        raise ValueError(f"{file_path.name} is too short to be a .Chn file.")
+    (tag, _mca, _segment, start_sec, real_ticks, live_ticks,
+     start_date, start_hhmm, channel_offset, n_channels) = _CHN_HEADER.unpack(raw[:_CHN_HEADER.size].tobytes())
+    if tag != -1:
+        raise ValueError(f"{file_path.name} is not a .Chn file (header tag {tag}).")
+
+    data_end = _CHN_HEADER.size + 4 * n_channels
+    if raw.size < data_end:
+        raise ValueError(f"{file_path.name} is truncated: expected {n_channels} channels.")
+    counts = raw[_CHN_HEADER.size:data_end].view("<i4")
+
+    date = start_date.decode("ascii")
+    year = (2000 if date[7] == "1" else 1900) + int(date[5:7])
+    hhmm = start_hhmm.decode("ascii")
+    start_time = datetime(year, _MONTHS[date[2:5].upper()], int(date[:2]),
+                          int(hhmm[:2]), int(hhmm[2:]), int(start_sec.decode("ascii")))
+
+    spectrum = {
+        "counts": counts,
+        "start_time": start_time,
+        "live_time": live_ticks * _CHN_TICK,
+        "real_time": real_ticks * _CHN_TICK,
+        "channel_offset": int(channel_offset),
+        "energy_calibration": [],
+        "shape_calibration": [],
+        "detector_description": "",
+        "sample_description": "",
+    }
+
+    # Trailer: tag (-101/-102), reserved, energy cal (3 x f4), shape cal (3 x f4),
+    # 228 reserved bytes, then two length-prefixed 63-byte descriptions
+    trailer = raw[data_end:].tobytes()
+    if len(trailer) >= 28 and struct.unpack_from("<h", trailer)[0] in (-101, -102):
+        spectrum["energy_calibration"] = [float(c) for c in struct.unpack_from("<3f", trailer, 4)]
+        spectrum["shape_calibration"] = [float(c) for c in struct.unpack_from("<3f", trailer, 16)]
+        offset = 256
+        for key in ("detector_description", "sample_description"):
+            if len(trailer) <= offset:
+                break
+            length = min(trailer[offset], 63)
+            spectrum[key] = trailer[offset + 1:offset + 1 + length].decode("ascii", errors="replace")
+            offset += 64
+
+    return spectrum
+
+
+def chn_sibling(file_path: str | Path) -> Path | None:
+    """
+    Return the ``.Chn`` file saved alongside ``file_path``, if one exists.
+
+    MAESTRO ``SAVE`` commands write the same acquisition as both ``.Chn`` and
+    ``.Spe``; the extension case is not fixed (``.Chn`` / ``.CHN``).
+    """
+    file_path = Path(file_path)
+    if file_path.suffix in _CHN_EXTENSIONS:
+        return file_path
+    for ext in _CHN_EXTENSIONS:
+        candidate = file_path.with_suffix(ext)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def resolve_spectrum_path(file_path: str | Path, prefer_chn: bool = True) -> Path:
+    """
+    Pick the file to read for a spectrum: the binary ``.Chn`` sibling when it exists
+    and ``prefer_chn`` is True, otherwise ``file_path`` itself.
+    """
+    if prefer_chn:
+        chn = chn_sibling(file_path)
+        if chn is not None:
+            return chn
+    return Path(file_path)
+
+
+def detector_slot(filename: str | Path) -> int | None:
+    """
+    Detector slot (source distance) encoded in a spectrum filename as ``-d1s<slot>-``
+    (or ``_d1s<slot>``, as in calibration spectrum names).
+
+    Returns
+    -------
+    int or None
+        The slot, or None if the name carries none.
+    """
+    for part in re.split(r"[-_]", os.path.splitext(os.path.basename(str(filename)))[0]):
+        if part.startswith("d1s") and part[3:].isdigit():
+            return int(part[3:])
+    return None
+
+
+def list_spectrum_files(directory: str | Path) -> list[str]:
+    """
+    List the spectra in ``directory``, one name per acquisition.
+
+    ``.Spe`` names are listed as before; a ``.Chn`` file is only listed when it has
+    no ``.Spe`` counterpart, so acquisitions saved in both formats appear once.
+
+    Returns
+    -------
+    list[str]
+        Sorted filenames.
+    """
+    names = os.listdir(directory)
+    spe = [f for f in names if f.endswith(".Spe")]
+    spe_stems = {os.path.splitext(f)[0] for f in spe}
+    chn_only = [f for f in names
+                if os.path.splitext(f)[1] in _CHN_EXTENSIONS and os.path.splitext(f)[0] not in spe_stems]
+    return sorted(spe + chn_only)
+
+
+def load_spectrum(file_path: str | Path):
+    """
+    Build a CURIE ``Spectrum`` for ``file_path``.
+
+    Every format, ``.Chn`` included, is read by CURIE; pick the file with
+    :func:`resolve_spectrum_path` to use the binary sibling of a ``.Spe``.
+    :func:`read_chn` remains available as a standalone reader that does not need
+    CURIE.
+
+    Returns
+    -------
+    curie.Spectrum
+        Spectrum ready for ``fit_peaks``.
+    """
+    import curie as ci
+
+    return ci.Spectrum(str(file_path))
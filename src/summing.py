@@ -0,0 +1,205 @@
+import numpy as np
+
+
+class AdaptiveSumming:
+    """
+    Sum consecutive low-count spectra of a serial series before fitting them.
+
+    Late spectra of a decay series (weak lines, several half-lives after EoB) give
+    failed or very uncertain fits, yet each costs a full ``fit_peaks``. With adaptive
+    summing, consecutive spectra are added channel by channel until every monitored
+    line reaches ``min_counts`` net counts (or a relative uncertainty of at most
+    ``max_rel_unc``), and only the summed spectrum is fitted. Early, strong spectra
+    reach the target on their own and are fitted individually as before.
+
+    The net counts of each line are estimated without fitting, from the counts
+    within ``width`` peak widths of the centroid minus the side bands on both
+    sides. Only lines detected in the (summed) spectrum, with net counts above
+    ``min_significance`` standard deviations, are held to the target: a line that
+    is absent, or whose side-band estimate is negative (e.g., next to a stronger
+    line), could never reach it and would force every spectrum into a sum.
+
+    Parameters
+    ----------
+    min_counts : float, optional
+        Net counts every monitored line must reach. Default is 100.
+    max_rel_unc : float, optional
+        Alternatively, the relative uncertainty of the net counts (e.g., 0.1) that is
+        good enough for a line. Default is None (only ``min_counts`` is used).
+    energies : list[float], optional
+        Gamma energies (keV) to monitor, e.g. only the weak 156Tb lines. Default is
+        every line in ``gammas``.
+    max_spectra : int, optional
+        Largest number of spectra summed into one. Default is 4.
+    width : float, optional
+        Half-width of the peak region in peak widths (sigma). Default is 2.
+    min_significance : float, optional
+        Net counts, in standard deviations, above which a line counts as detected
+        and must meet the target. Default is 3.
+
+    Notes
+    -----
+    Only consecutive spectra with the same detector slot and number of channels
+    are summed. Channels are added as they are, so the energy calibration of the
+    first spectrum is used for the sum.
+    """
+
+    def __init__(self, min_counts: float | None = 100.0, max_rel_unc: float | None = None,
+                 energies: list[float] | None = None, max_spectra: int = 4, width: float = 2.0,
+                 min_significance: float = 3.0):
+        self.min_counts = min_counts
+        self.max_rel_unc = max_rel_unc
+        self.energies = energies
+        self.max_spectra = max_spectra
+        self.width = width
+        self.min_significance = min_significance
+
+
+    def net_counts(self, sp, energies) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Estimate the net counts of the lines at ``energies`` in spectrum ``sp``.
+
+        Returns
+        -------
+        net : numpy.ndarray
+            Net counts per line (NaN where the line or its side bands fall outside
+            the spectrum).
+        var : numpy.ndarray
+            Poisson variance of ``net``.
+        """
+        hist = np.asarray(sp.hist, dtype=float)
+        cum = np.concatenate([[0.0], np.cumsum(hist)])
+        L = len(hist)
+
+        idx = np.rint(np.atleast_1d(sp.cb._map_channel_f(np.asarray(energies, dtype=float)))).astype(int)
+        half = np.maximum(np.rint(self.width * np.atleast_1d(sp.cb.res(idx))), 1).astype(int)
+        l, h = idx - half, idx + half + 1
+        valid = (l - half >= 0) & (h + half <= L)
+        l, h = np.where(valid, l, half), np.where(valid, h, half + 1)
+
+        # Peak region [l, h) and side bands of ``half`` channels on either side
+        gross = cum[h] - cum[l]
+        sides = (cum[l] - cum[l - half]) + (cum[h + half] - cum[h])
+        scale = (h - l) / (2.0 * half)
+        net = np.where(valid, gross - scale * sides, np.nan)
+        var = np.where(valid, gross + scale ** 2 * sides, np.nan)
+        return net, var
+
+
+    def enough(self, net: np.ndarray, var: np.ndarray) -> bool:
+        """
+        True if every detected monitored line meets the target.
+
+        Lines without an estimate or below ``min_significance`` are not held to the
+        target. If no line is detected, more spectra are needed.
+        """
+        with np.errstate(invalid="ignore"):
+            detected = net > self.min_significance * np.sqrt(var)
+        ok = np.zeros(len(net), dtype=bool)
+        if self.min_counts is not None:
+            ok |= net >= self.min_counts
+        if self.max_rel_unc is not None:
+            ok |= np.sqrt(var) <= self.max_rel_unc * net
+        return bool(np.any(detected) and np.all(ok | ~detected))
+
+
+    def groups(self, spectra, energies, key=None):
+        """
+        Group consecutive spectra until the summed net counts meet the target.
+
+        Parameters
+        ----------
+        spectra : iterable of tuple[str, curie.Spectrum]
+            Filenames and spectra, in measurement order.
+        energies : list[float]
+            Lines monitored when ``self.energies`` is None.
+        key : callable, optional
+            ``key(file)`` of spectra that may be summed together (e.g., the detector
+            slot); a change of key closes the current group.
+
+        Yields
+        ------
+        list[str]
+            Filenames of each group (a single file if it met the target alone).
+        """
+        energies = self.energies if self.energies is not None else energies
+        group, net, var, last = [], 0.0, 0.0, None
+        for file, sp in spectra:
+            this = ((key(file) if key is not None else None), len(sp.hist))
+            if group and this != last:
+                yield group
+                group, net, var = [], 0.0, 0.0
+            last = this
+
+            n, v = self.net_counts(sp, energies)
+            group.append(file)
+            # Net counts and their variances add up over the summed spectra
+            net, var = net + n, var + v
+            if self.enough(net, var) or len(group) >= self.max_spectra:
+                yield group
+                group, net, var = [], 0.0, 0.0
+        if group:
+            yield group
+
+
+def sum_spectra(spectra: list):
+    """
+    Add CURIE spectra channel by channel.
+
+    Returns
+    -------
+    curie.Spectrum
+        Spectrum with the summed counts, live and real times, and the start time,
+        filename and calibration of the first spectrum.
+    """
+    import curie as ci
+
+    first = spectra[0]
+    sp = ci.Spectrum()
+    sp.filename = first.filename
+    sp.cb = first.cb
+    sp.hist = np.sum([np.asarray(s.hist, dtype=np.int64) for s in spectra], axis=0)
+    sp.start_time = first.start_time
+    sp.live_time = float(sum(s.live_time for s in spectra))
+    sp.real_time = float(sum(s.real_time for s in spectra))
+    sp._snip_bg()
+    return sp
+
+
+def effective_decay_time(decay_times, live_times, half_lives) -> np.ndarray:
+    """
+    Decay time at which a summed spectrum measures each line's activity.
+
+    A line with decay constant λ collects counts in proportion to
+    ``sum_k exp(-λ t_k) (1 - exp(-λ L_k))`` over the summed spectra (decay times
+    ``t_k``, live times ``L_k``). The effective time ``t`` solves
+    ``exp(-λ t) (1 - exp(-λ L)) = sum_k exp(-λ t_k) (1 - exp(-λ L_k))`` with
+    ``L = sum_k L_k``, so the usual single-spectrum activity and EoB formulas hold
+    for the sum. For unknown (or infinite) half-lives the live-time weighted mean
+    decay time is returned.
+
+    Parameters
+    ----------
+    decay_times : array_like
+        Decay time since EoB of each summed spectrum (s).
+    live_times : array_like
+        Live time of each summed spectrum (s).
+    half_lives : array_like
+        Half-life of each line (s).
+
+    Returns
+    -------
+    numpy.ndarray
+        Effective decay time of each line (s).
+    """
+    t = np.asarray(decay_times, dtype=float)[:, None]
+    L = np.asarray(live_times, dtype=float)[:, None]
+    lam = np.log(2) / np.asarray(half_lives, dtype=float)[None, :]
+
+    t0 = t.min()
+    with np.errstate(all="ignore"):
+        # Relative to the first decay time to avoid underflow for short-lived lines
+        w = np.exp(-lam * (t - t0)) * -np.expm1(-lam * L)
+        t_eff = t0 - np.log(w.sum(axis=0) / -np.expm1(-lam[0] * L.sum())) / lam[0]
+    mean = float((L * t).sum() / L.sum())
+    return np.where(np.isfinite(t_eff) & (lam[0] > 0), t_eff, mean)
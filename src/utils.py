@@ -1,17 +1,13 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from datetime import datetime
-
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
 from pathlib import Path
 from numpy.linalg import cond
+from nuclab.plotting import draw_fit
+from nuclab.decay import bateman_activities
 
 
-def fit_decay(t_vals, a_vals, decay_function, unc_a_vals, xlabel, ylabel, plot_label, initial_guess=None, plot_filename="data-fit.png", xlim=None, ylim=None):
+def fit_decay(t_vals, a_vals, decay_function, unc_a_vals, xlabel, ylabel, plot_label, initial_guess=None, plot_filename="data-fit.png", xlim=None, ylim=None, show=None, return_covariance=False):
     """
     Fits the provided data to a given decay function and plots the fitted curve.
 
@@ -21,13 +17,21 @@ def fit_decay(t_vals, a_vals, decay_function, unc_a_vals, xlabel, ylabel, plot_l
     - decay_function (function): The decay function to fit, with parameters to be optimized.
     - initial_guess (list, optional): Initial guesses for decay function parameters. Defaults to [10, 5, 1].
     - plot_filename (str, optional): Filename to save the plot. Defaults to "data-fit.png".
+    - show (bool, optional): Whether to display the plot. Defaults to None: shown if
+      ``plot_filename`` is given, otherwise no figure is created at all. Pass False
+      from scripts and library code that only save the plot (headless runs).
+    - return_covariance (bool, optional): If True, also return the full covariance matrix
+      of the parameters. Defaults to False.
 
     Returns:
     - params (array): Optimized parameters for the decay function.
-    - covariance (array): Covariance matrix of the estimated parameters.
+    - param_errors (array): 1σ standard errors of the parameters.
+    - covariance (array): Covariance matrix of the parameters (only if ``return_covariance``).
     """
 
     # Fit the decay function to the provided data using non-linear least squares optimization
+    from scipy.optimize import curve_fit
+
     params, covariance = curve_fit(f=decay_function, xdata=t_vals, ydata=a_vals, sigma=unc_a_vals, absolute_sigma=True, p0=initial_guess)
 
     # Calculate standard deviations (uncertainties) from the covariance matrix
@@ -50,32 +54,45 @@ def fit_decay(t_vals, a_vals, decay_function, unc_a_vals, xlabel, ylabel, plot_l
     except Exception as e:
         print("⚠️ Could not compute Jacobian condition number:", e)
 
-    # Generate time values for plotting the fitted curve
-    t_fit = np.linspace(1, max(t_vals), 200)  # 200 evenly spaced time points
-    y_fit = decay_function(t_fit, *params)  # Compute fitted decay values
-
-    # Plot
-    plt.figure(figsize=(8, 5), dpi=120)
-    plt.scatter(t_vals, a_vals, color="dodgerblue")
-    plt.errorbar(t_vals, a_vals, yerr=unc_a_vals, label="Experimental", fmt="none", color="dodgerblue", alpha=0.8, ecolor="dodgerblue")
-    plt.plot(t_fit, y_fit, label="Polynomial Fit", color="navy", linestyle="--", linewidth=2)
-
-    # Formatting
-    plt.xlabel(xlabel, fontsize=12)
-    plt.ylabel(ylabel, fontsize=12)
-    plt.xlim(xlim)
-    plt.ylim(ylim)
-    #plt.title(f"{ylabel} vs {xlabel}: {plot_label}", fontsize=14)
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.6)
-
-    # Save and show plot
-    plt.savefig(plot_filename, bbox_inches="tight", dpi=150)
-    plt.show()
+    if show is None:
+        show = plot_filename is not None
+    if plot_filename is not None or show:
+        plot_fit(t_vals, a_vals, unc_a_vals, decay_function, params, xlabel, ylabel,
+                 plot_filename=plot_filename, xlim=xlim, ylim=ylim, show=show)
 
+    if return_covariance:
+        return params, param_errors, covariance
     return params, param_errors
 
 
+def plot_fit(t_vals, a_vals, unc_a_vals, fit_function, params, xlabel, ylabel, plot_filename=None, xlim=None, ylim=None, show=True):
+    """
+    Plot measured data with error bars together with a fitted curve.
+
+    Parameters:
+    - t_vals, a_vals, unc_a_vals (array-like): Measured x values, y values and y uncertainties.
+    - fit_function (function): Fitted function, called as ``fit_function(x, *params)``.
+    - params (array-like): Optimized parameters of ``fit_function``.
+    - xlabel, ylabel (str): Axis labels.
+    - plot_filename (str, optional): Filename to save the plot. If None, the plot is not saved.
+    - xlim, ylim (tuple, optional): Axis limits.
+    - show (bool, optional): Whether to display the plot. Defaults to True.
+
+    The figure is closed afterwards, so repeated calls do not accumulate open figures.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5), dpi=120)
+    draw_fit(ax, t_vals, a_vals, unc_a_vals, fit_function, params, xlabel, ylabel, xlim=xlim, ylim=ylim)
+
+    # Save and show plot
+    if plot_filename is not None:
+        fig.savefig(plot_filename, bbox_inches="tight", dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
 def calculate_eob_activity(N, sigma, I, half_life, t):
     """
     Calculate the activity produced in a charged particle induced reaction.
@@ -98,6 +115,49 @@ def calculate_eob_activity(N, sigma, I, half_life, t):
 
     return A_t
 
+def beam_history_saturation(times, intensities, half_lives, t_end=None):
+    """
+    Decay-weighted integral of a time-varying beam over an irradiation.
+
+    The beam is taken as constant between samples. For each isotope, the EoB
+    activity obeys the recursive exponential filter
+        A_k+1 = A_k * exp(-λ Δt_k) + N σ I_k (1 - exp(-λ Δt_k)),
+    which unrolls to A_EoB = N σ F with
+        F = Σ_k I_k (1 - exp(-λ Δt_k)) exp(-λ (t_end - t_k+1)).
+    F is evaluated in one pass over the samples for all isotopes at once; every
+    exponent is non-positive, so long histories cannot overflow. For a constant
+    beam, F = I (1 - exp(-λ t)) as in ``calculate_eob_activity``.
+
+    Parameters:
+    - times (array-like): Sample times from the start of irradiation (s), increasing.
+    - intensities (array-like): Projectile intensity at each sample (particles/s),
+      held until the next sample.
+    - half_lives (float or array-like): Half-life of each product nuclide (s).
+    - t_end (float, optional): End of bombardment (s). Defaults to one sample
+      spacing after the last sample.
+
+    Returns:
+    - F (np.array): Effective saturated intensity per half-life (particles/s);
+      multiply by N σ to obtain the EoB activity (Bq).
+    """
+    times = np.asarray(times, dtype=float)
+    intensities = np.asarray(intensities, dtype=float)
+    lambda_ = np.log(2) / np.atleast_1d(np.asarray(half_lives, dtype=float))
+
+    if times.shape != intensities.shape or times.ndim != 1 or times.size == 0:
+        raise ValueError("times and intensities must be 1-D arrays of the same, non-zero length.")
+    if t_end is None:
+        t_end = times[-1] + (times[-1] - times[-2] if times.size > 1 else 0.0)
+
+    edges = np.append(times, t_end)
+    dt = np.diff(edges)
+    if np.any(dt < 0):
+        raise ValueError("times must be increasing and not later than t_end.")
+
+    # (isotopes x samples): build-up within each interval, then decay until EoB
+    weights = -np.expm1(-lambda_[:, None] * dt) * np.exp(-lambda_[:, None] * (t_end - edges[1:]))
+    return weights @ intensities
+
 def calculate_N0(A_t, sigma, I, half_life, t):
     """
     Calulate atomic areal density (atoms/cm2).
@@ -145,9 +205,6 @@ def linear_interpolation(x_vals, y_vals, query, mode='y'):
     else:
         raise ValueError("Mode must be 'y' or 'x'")
 
-import numpy as np
-import matplotlib.pyplot as plt
-
 def calculate_parent_daughter_activities(A1_0, t_half1, t_half2, time):
     """
     Calculate the activities of the parent and daughter isotopes over time.
@@ -161,18 +218,20 @@ def calculate_parent_daughter_activities(A1_0, t_half1, t_half2, time):
     Returns:
     A1 (numpy array): Activity of the parent isotope over time
     A2 (numpy array): Activity of the daughter isotope over time
+
+    Evaluated with ``nuclab.decay.bateman_activities``, so equal half-lives are handled.
+
+    Note: before the Bateman solver, the daughter activity was computed as
+    ``A1_0 * l1*l2/(l2 - l1) * (exp(-l1 t) - exp(-l2 t))``, which carries an extra
+    factor ``l1`` (1/s) and is not an activity. The correct expression,
+    ``A1_0 * l2/(l2 - l1) * (exp(-l1 t) - exp(-l2 t))``, is larger by ``1/l1``
+    (e.g., 155Dy -> 155Tb, A1_0 = 1 MBq, after 1 h: 0.10 Bq before, 5229 Bq now).
+    Daughter activities computed with earlier versions should be re-checked.
     """
-    # Convert half-lives to decay constants
-    lambda1 = np.log(2) / t_half1
-    lambda2 = np.log(2) / t_half2
-    
-    # Parent activity
-    A1 = A1_0 * np.exp(-lambda1 * time)
-    
-    # Daughter activity
-    A2 = A1_0 * (lambda1 * lambda2 / (lambda2 - lambda1)) * (np.exp(-lambda1 * time) - np.exp(-lambda2 * time))
+    shape = np.shape(time)
+    A = bateman_activities([[t_half1, t_half2]], [[A1_0, 0.0]], np.ravel(time))[0]
     
-    return A1, A2
+    return A[0].reshape(shape)[()], A[1].reshape(shape)[()]
 
 def calculate_activity(initial_activity, decay_time, half_life):
 